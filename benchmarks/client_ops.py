@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Benchmarks the client operations of every manager against the stub server"""
+# ---------------------------------------------------------------------------
+import io
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import argparse
+import threading
+import subprocess
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kankamanager'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.stub_server import StubKanka
+from src.kankamanager.generator import CampaignGenerator, scaled, uniform
+# ---------------------------------------------------------------------------
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def timed(results: dict, label: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    results[label] = time.perf_counter() - start
+    print(f'{label:<40} {results[label]:8.3f}s')
+    return result
+
+
+def _id(entity) -> int:
+    return entity.get('id') if isinstance(entity, dict) else entity.id
+
+
+def run(client, generator: CampaignGenerator, args) -> dict:
+    """
+    Times get_all, iter_all, get, bulk create/delete and stamp for every manager, then pull and push
+
+    Args:
+        client (KankaClient): the client pointed at the stub server
+        generator (CampaignGenerator): the generator of the served campaign
+        args (Namespace): the benchmark arguments
+
+    Returns:
+        dict: the seconds taken by each operation
+    """
+    # pylint: disable=import-outside-toplevel
+    from src.kankamanager.utilities import stamp
+    from src.kankamanager.cli.pull import pull
+    from src.kankamanager.cli.push import push
+
+    results = dict()
+    for entity in generator.counts:
+        manager = client.entities[entity]
+        setattr(manager, manager.CACHE, list())
+        fetched = timed(results, f'{entity}.get_all', manager.get_all)
+        setattr(manager, manager.CACHE, list())
+        timed(results, f'{entity}.iter_all', lambda: list(manager.iter_all()))
+        setattr(manager, manager.CACHE, fetched)
+
+        ids = [_id(_entity) for _entity in fetched][:args.bulk]
+        timed(results, f'{entity}.get', lambda: [manager.get(id) for id in ids])
+
+        data = [generator.entity(entity) for _ in range(args.bulk)]
+        for _data in data:
+            _data.pop('id', None)
+        created = timed(results, f'{entity}.create', lambda: [manager.create(_data) for _data in data])
+        timed(results, f'{entity}.delete', lambda: [manager.delete(_id(_created)) for _created in created])
+
+        for output in ('yaml', 'json', 'ndjson', 'csv', 'table'):
+            options = SimpleNamespace(output=output, fields=[])
+            timed(results, f'{entity}.stamp.{output}', stamp, fetched, options, io.StringIO())
+
+    timed(results, 'pull', pull, client, SimpleNamespace(types=None, sharded=False, resume=False, assets=False))
+    timed(results, 'push', push, client, SimpleNamespace(types=None, resume=False))
+    timed(results, 'pull.sharded', pull, client, SimpleNamespace(types=None, sharded=True, resume=False, assets=False))
+    timed(results, 'push.sharded', push, client, SimpleNamespace(types=None, resume=False))
+
+    return results
+
+
+def compare(results: dict, arguments: dict, baseline: str, threshold: float) -> list:
+    """
+    Lists the operations slower than the baseline by more than the threshold
+
+    Args:
+        results (dict): the seconds taken by each operation
+        arguments (dict): the benchmark arguments
+        baseline (str): the baseline results file
+        threshold (float): the tolerated slowdown ratio
+
+    Returns:
+        list: the regressed operations
+    """
+    with open(baseline, 'r') as baseline_file:
+        previous = json.load(baseline_file)
+
+    for name in ('count', 'scale', 'bulk', 'page_size', 'latency', 'throttle_every', 'gzip'):
+        if previous.get('arguments', {}).get(name) != arguments.get(name):
+            print(f'WARNING the baseline was run with a different --{name.replace("_", "-")}')
+    previous = previous.get('results')
+
+    regressions = list()
+    for label, seconds in results.items():
+        if label in previous and seconds > previous[label] * (1 + threshold):
+            regressions.append(label)
+            print(f'REGRESSION {label:<29} {previous[label]:8.3f}s -> {seconds:8.3f}s')
+
+    return regressions
+
+
+def revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip()
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark client operations against a stub Kanka server')
+    parser.add_argument('-n', '--count', type=int, default=500, help='entities per type')
+    parser.add_argument('-s', '--scale', type=int, default=None, help='characters of a realistically shaped campaign, instead of --count')
+    parser.add_argument('-b', '--bulk', type=int, default=20, help='entities fetched, created and deleted one by one')
+    parser.add_argument('--page-size', type=int, default=None, help='entities per page (default: everything on one page)')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--throttle-every', type=int, default=0, help='answer every n-th request with a 429')
+    parser.add_argument('--gzip', action='store_true', default=False, help='gzip the responses and the create/update bodies')
+    parser.add_argument('-o', '--output', default=None, help='results file (default: benchmarks/results/<time>.json)')
+    parser.add_argument('--baseline', default=None, help='results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='tolerated slowdown against the baseline')
+    parser.add_argument('--record', default=None, help='also record the requests to this cassette (see replay.py)')
+    args = parser.parse_args()
+
+    counts = scaled(args.scale) if args.scale else uniform(args.count)
+    server = StubKanka(('127.0.0.1', 0), args.page_size or max(counts.values()) * 2, args.latency, args.throttle_every,
+                       compress=args.gzip)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # The managers build their urls from BASE_URL when imported
+    os.environ['KANKA_BASE_URL'] = server.url
+    from kankamanager.kankaclient.client import KankaClient  # pylint: disable=import-outside-toplevel
+
+    generator = CampaignGenerator(counts, name='Benchmark')
+    server.add(generator.fixture())
+
+    with tempfile.TemporaryDirectory() as campaign_dir:
+        config = {'token': 'benchmark', 'campaign': 'Benchmark', 'campaign_dir': campaign_dir, 'throttle': False,
+                  'compress': args.gzip}
+        client = KankaClient(config, cassette=args.record, record=bool(args.record))
+        print(f'{sum(counts.values())} entities, latency {args.latency}s, 429 every {args.throttle_every or "-"}')
+        results = run(client, generator, args)
+
+    server.shutdown()
+    print(f'{"requests":<40} {server.requests:8d}')
+    print(f'{"throttled":<40} {server.throttled:8d}')
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as output_file:
+        json.dump({
+            'revision': revision(), 'python': platform.python_version(), 'arguments': vars(args),
+            'requests': server.requests, 'throttled': server.throttled, 'results': results
+        }, output_file, indent=4)
+    print(f'Results written to: {output}')
+
+    if args.baseline and compare(results, vars(args), args.baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Generates a synthetic campaign as a stub server fixture or a campaign_dir"""
+# ---------------------------------------------------------------------------
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kankamanager'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.kankamanager.generator import CampaignGenerator, scaled, uniform
+# ---------------------------------------------------------------------------
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic Kanka campaign')
+    parser.add_argument('-s', '--scale', type=int, default=1000, help='characters of a realistically shaped campaign')
+    parser.add_argument('-n', '--count', type=int, default=None, help='entities per type, instead of --scale')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--name', default='Generated', help='campaign name')
+    parser.add_argument('-f', '--fixture', default=None, help='write a stub server fixture (gzip compressed JSON)')
+    parser.add_argument('-d', '--campaign-dir', default=None, help='write a pulled campaign_dir')
+    parser.add_argument('--sharded', action='store_true', default=False, help='write the campaign_dir one file per entity')
+    args = parser.parse_args()
+
+    if not args.fixture and not args.campaign_dir:
+        parser.error('one of --fixture or --campaign-dir is required')
+
+    start = time.perf_counter()
+    generator = CampaignGenerator(uniform(args.count) if args.count else scaled(args.scale), seed=args.seed, name=args.name)
+    entities = generator.generate()
+    print(f'Generated {sum(len(generated) for generated in entities.values())} entities in {time.perf_counter() - start:.2f}s')
+
+    if args.fixture:
+        with gzip.open(args.fixture, 'wt', encoding='utf-8') as fixture:
+            json.dump(generator.fixture(), fixture, separators=(',', ':'))
+        print(f'Fixture written to: {args.fixture}')
+    if args.campaign_dir:
+        generator.write(args.campaign_dir, sharded=args.sharded)
+        print(f'Campaign written to: {args.campaign_dir}')
+
+
+if __name__ == '__main__':
+    main()
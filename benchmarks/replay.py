@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Benchmarks the managers against a recorded cassette, without any server"""
+# ---------------------------------------------------------------------------
+import os
+import sys
+import gzip
+import json
+import time
+import tempfile
+import argparse
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kankamanager'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# ---------------------------------------------------------------------------
+
+
+def timed(label: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f'{label:<32} {time.perf_counter() - start:8.3f}s')
+    return result
+
+
+def base_url(path: str) -> str:
+    """Returns the BASE_URL the cassette was recorded against"""
+    with gzip.open(path, 'rt', encoding='utf-8') as cassette:
+        url = json.load(cassette).get('interactions')[0].get('request').get('url')
+    return url[:url.index('/campaigns') + len('/campaigns')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a cassette recorded with client_ops.py --record')
+    parser.add_argument('cassette', help='the cassette file')
+    parser.add_argument('-c', '--campaign', default='Benchmark', help='the recorded campaign name')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every replayed request')
+    parser.add_argument('--rate-limit', type=int, default=0, help='replayed requests allowed per minute')
+    args = parser.parse_args()
+
+    # The managers build their urls from BASE_URL when imported
+    os.environ['KANKA_BASE_URL'] = base_url(args.cassette)
+    # pylint: disable=import-outside-toplevel
+    from kankamanager.kankaclient.cassette import use_cassette
+    from kankamanager.kankaclient.client import KankaClient
+    from src.kankamanager.cli.pull import pull
+
+    use_cassette(args.cassette, latency=args.latency, rate_limit=args.rate_limit)
+    with tempfile.TemporaryDirectory() as campaign_dir:
+        client = KankaClient({'token': '', 'campaign': args.campaign, 'campaign_dir': campaign_dir, 'throttle': False})
+        for entity, manager in client.entities.items():
+            if entity != 'campaign':
+                timed(f'{entity}.get_all', manager.get_all)
+                setattr(manager, manager.CACHE, list())
+        timed('pull', pull, client, SimpleNamespace(types=None, sharded=False, resume=False, assets=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Benchmarks campaign reloads: YAML (read_data) vs JSON vs binary snapshot"""
+# ---------------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kankamanager'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dacite import from_dict
+from src.kankamanager.utilities import read_data, write_data
+from kankamanager.kankaclient.campaigns import Campaign
+from kankamanager.kankaclient.characters import CharacterAPI, Character
+from kankamanager.kankaclient.snapshot import write_snapshot, read_snapshot, load_snapshot
+# ---------------------------------------------------------------------------
+
+CAMPAIGN = {
+    'id': 1, 'name': 'Benchmark', 'locale': None, 'entry_parsed': '', 'image': None, 'image_full': None,
+    'visibility': 'private', 'visibility_id': 1, 'created_at': None, 'updated_at': None, 'settings': None,
+    'ui_settings': None, 'default_images': None, 'follower': 0, 'boosted': False, 'superboosted': False,
+    'members': None
+}
+
+
+def generate_characters(count: int) -> list:
+    return [{
+        'id': i, 'name': f'Character {i}', 'type': 'Non-Player Character', 'tags': [i % 30, i % 45],
+        'is_private': i % 7 == 0, 'tooltip': None, 'header_image': None, 'image_uuid': None,
+        'created_at': '2022-08-01T00:00:00.000000Z', 'created_by': 1, 'updated_at': None, 'updated_by': None,
+        'entry': f'<p>Character {i} was born in a small village.</p>', 'image': f'characters/{i:040d}.png',
+        'image_full': None, 'image_thumb': None, 'has_custom_image': False, 'is_template': False,
+        'entity_id': 100000 + i, 'location_id': 600000 + i % 250, 'title': 'Adventurer', 'age': str(20 + i % 60),
+        'sex': None, 'pronouns': 'They/Them', 'races': [238800 + i % 12], 'families': [], 'is_dead': i % 11 == 0,
+        'traits': []
+    } for i in range(count)]
+
+
+def make_client() -> SimpleNamespace:
+    campaign = from_dict(data_class=Campaign, data=CAMPAIGN)
+    characters = CharacterAPI(token='', campaign=campaign)
+    return SimpleNamespace(campaigns=SimpleNamespace(campaign=campaign), characters=characters,
+                           entities={'characters': characters})
+
+
+def timed(label: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f'{label:<32} {time.perf_counter() - start:8.3f}s')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark campaign reloads')
+    parser.add_argument('-n', '--count', type=int, default=50000, help='number of generated characters')
+    args = parser.parse_args()
+
+    data = generate_characters(args.count)
+    client = make_client()
+    client.characters.characters = [from_dict(data_class=Character, data=character) for character in data]
+
+    with tempfile.TemporaryDirectory() as directory:
+        yaml_file = os.path.join(directory, 'characters.yaml')
+        json_file = os.path.join(directory, 'characters.json')
+        snapshot_file = os.path.join(directory, 'campaign.snapshot')
+        write_data(yaml_file, data)
+        with open(json_file, 'w') as output_json:
+            json.dump(data, output_json)
+        write_snapshot(client, snapshot_file)
+        for file in (yaml_file, json_file, snapshot_file):
+            print(f'{os.path.basename(file):<32} {os.path.getsize(file) / 1024 / 1024:8.2f}MB')
+
+        def load_yaml():
+            return [from_dict(data_class=Character, data=character) for character in read_data(yaml_file)]
+
+        def load_json():
+            with open(json_file, 'r') as input_json:
+                return [from_dict(data_class=Character, data=character) for character in json.load(input_json)]
+
+        def load_binary():
+            restored = make_client()
+            load_snapshot(restored, read_snapshot(snapshot_file)[1])
+            return restored.characters.characters
+
+        print(f'{args.count} characters')
+        timed('read_data (YAML)', read_data, yaml_file)
+        timed('read (snapshot)', read_snapshot, snapshot_file)
+        timed('load + decode (YAML)', load_yaml)
+        timed('load + decode (JSON)', load_json)
+        restored = timed('load + decode (snapshot)', load_binary)
+        assert restored == client.characters.characters
+
+
+if __name__ == '__main__':
+    main()
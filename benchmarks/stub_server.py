@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Local stub of the Kanka API serving synthetic campaigns"""
+# ---------------------------------------------------------------------------
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dataclasses import fields
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kankamanager'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.kankamanager.generator import CampaignGenerator, data_classes, scaled, uniform, _default
+# ---------------------------------------------------------------------------
+
+PAGE_SIZE = 45
+
+
+class StubKanka(ThreadingHTTPServer):
+    """
+    Serves the /campaigns routes of the Kanka API from memory
+
+    Entities are stored per campaign and entity type. Listings are paginated
+    with links.next like Kanka, `latency` seconds are added to every request
+    and every `throttle_every`-th request is answered with a 429. With
+    `compress`, responses are gzip encoded for clients accepting it, like
+    Kanka's front servers do. Gzip request bodies are always accepted.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, page_size: int=PAGE_SIZE, latency: float=0.0, throttle_every: int=0,
+                 retry_after: float=0.05, compress: bool=False):
+        super().__init__(address, StubHandler)
+        self.compress = compress
+        self.campaigns = dict()
+        self.page_size = page_size
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.next_id = 0
+        # Created entities are completed with the fields Kanka fills in (the managers are imported on use)
+        self.data_classes = None
+
+
+    def complete(self, endpoint: str, data: dict) -> dict:
+        """Fills the fields of the endpoint's dataclass missing from a created entity"""
+        if self.data_classes is None:
+            self.data_classes = {endpoint: data_class for endpoint, data_class in data_classes().values()}
+        data_class = self.data_classes.get(endpoint)
+        if data_class is None:
+            return data
+        return dict({field.name: _default(field, data.get('id')) for field in fields(data_class)}, **data)
+
+
+    def add(self, fixture: dict):
+        """
+        Serves the provided campaign
+
+        Args:
+            fixture (dict): the campaign, its members and entities by endpoint (see CampaignGenerator.fixture)
+        """
+        entities = {
+            endpoint: {entity.get('id'): entity for entity in generated}
+            for endpoint, generated in fixture.get('entities').items()
+        }
+        with self.lock:
+            self.campaigns[fixture.get('campaign').get('id')] = dict(fixture, entities=entities)
+            self.next_id = max([self.next_id, *[id for generated in entities.values() for id in generated]])
+
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/campaigns'
+
+
+    def new_id(self) -> int:
+        with self.lock:
+            self.next_id += 1
+            return self.next_id
+
+
+    def count(self) -> bool:
+        """Counts a request, returns whether it must be throttled"""
+        with self.lock:
+            self.requests += 1
+            throttled = bool(self.throttle_every) and self.requests % self.throttle_every == 0
+            self.throttled += throttled
+            return throttled
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, do not let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def _send(self, status: int, data=None, headers: dict=None):
+        body = json.dumps(data).encode('utf-8') if data is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if body and self.server.compress and 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            body = gzip.compress(body, 6)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return json.loads(body or b'{}')
+
+    def _page(self, entities: list, query: dict) -> dict:
+        page = int(query.get('page', ['1'])[0])
+        size = self.server.page_size
+        data = entities[(page - 1) * size:page * size]
+        next = f'{self.server.url}{urlsplit(self.path).path[len("/campaigns"):]}?page={page + 1}' \
+            if page * size < len(entities) else None
+        return {'data': data, 'links': {'next': next}, 'meta': {'current_page': page, 'total': len(entities)}}
+
+    def _handle(self, method: str):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.count():
+            if method in ('POST', 'PUT', 'PATCH'):
+                self._body()
+            self._send(429, {'message': 'Too Many Attempts.'}, {'Retry-After': str(self.server.retry_after)})
+            return
+
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        match = re.fullmatch(r'/campaigns(?:/(\d+)(?:/(\w+)(?:/(\d+))?)?)?/?', url.path)
+        if not match:
+            self._send(404, {'message': 'Not Found'})
+            return
+
+        campaign_id, entity, id = match.groups()
+        campaigns = self.server.campaigns
+        if campaign_id is None:
+            self._send(200, self._page([campaign.get('campaign') for campaign in campaigns.values()], query))
+            return
+
+        campaign = campaigns.get(int(campaign_id))
+        if campaign is None:
+            self._send(404, {'message': 'Not Found'})
+            return
+        if entity is None:
+            self._send(200, {'data': campaign.get('campaign')})
+            return
+        if entity == 'users':
+            self._send(200, {'data': campaign.get('members', [])})
+            return
+
+        entities = campaign.get('entities').setdefault(entity, dict())
+        if id is None and method == 'GET':
+            self._send(200, self._page(list(entities.values()), query))
+        elif id is None and method == 'POST':
+            data = dict(self._body())
+            data['id'] = self.server.new_id()
+            data = self.server.complete(entity, data)
+            entities[data['id']] = data
+            self._send(201, {'data': data})
+        elif int(id) not in entities:
+            self._send(404, {'message': 'Not Found'})
+        elif method == 'GET':
+            self._send(200, {'data': entities[int(id)]})
+        elif method in ('PUT', 'PATCH'):
+            entities[int(id)].update(self._body())
+            self._send(200, {'data': entities[int(id)]})
+        elif method == 'DELETE':
+            del entities[int(id)]
+            self._send(204)
+        else:
+            self._send(405, {'message': 'Method Not Allowed'})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def load_fixture(path: str) -> dict:
+    """
+    Loads a campaign fixture written by generate_campaign.py
+
+    Args:
+        path (str): the gzip compressed JSON fixture
+
+    Returns:
+        dict: the campaign fixture
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as fixture:
+        return json.load(fixture)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve synthetic Kanka campaigns')
+    parser.add_argument('-n', '--count', type=int, default=500, help='entities per type')
+    parser.add_argument('-s', '--scale', type=int, default=None, help='characters of a realistically shaped campaign, instead of --count')
+    parser.add_argument('-f', '--fixture', default=None, help='serve a fixture written by generate_campaign.py instead')
+    parser.add_argument('-p', '--port', type=int, default=8766, help='listening port')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help='entities per page')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--throttle-every', type=int, default=0, help='answer every n-th request with a 429')
+    parser.add_argument('--gzip', action='store_true', default=False, help='gzip the responses of clients accepting it')
+    args = parser.parse_args()
+
+    if args.fixture:
+        fixture = load_fixture(args.fixture)
+    else:
+        counts = scaled(args.scale) if args.scale else uniform(args.count)
+        fixture = CampaignGenerator(counts, name='Benchmark').fixture()
+
+    with StubKanka(('127.0.0.1', args.port), args.page_size, args.latency, args.throttle_every,
+                   compress=args.gzip) as server:
+        server.add(fixture)
+        print(f'KANKA_BASE_URL={server.url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Benchmarks campaign_dir YAML I/O, pure-Python vs LibYAML"""
+# ---------------------------------------------------------------------------
+import os
+import sys
+import time
+import tempfile
+import argparse
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kankamanager'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.kankamanager.utilities import SpaceDumper, read_data, write_data
+# ---------------------------------------------------------------------------
+
+
+def generate_characters(count: int) -> list:
+    characters = list()
+    for i in range(count):
+        characters.append({
+            'name': f'Character {i}',
+            'entry': f'<p>Character {i} was born in a small village.</p>',
+            'image': f'characters/{i:040d}.png',
+            'is_private': i % 7 == 0,
+            'title': 'Adventurer',
+            'age': str(20 + i % 60),
+            'pronouns': 'They/Them',
+            'type': 'Non-Player Character',
+            'location_id': 600000 + i % 250,
+            'races': [238800 + i % 12],
+            'tags': [i % 30, i % 45],
+            'is_dead': i % 11 == 0,
+        })
+    return characters
+
+
+def timed(label: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f'{label:<32} {time.perf_counter() - start:8.3f}s')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark campaign_dir YAML I/O')
+    parser.add_argument('-n', '--count', type=int, default=50000, help='number of generated characters')
+    args = parser.parse_args()
+
+    characters = generate_characters(args.count)
+    with tempfile.TemporaryDirectory() as directory:
+        file = os.path.join(directory, 'characters.yaml')
+        print(f'{args.count} characters, LibYAML available: {hasattr(yaml, "CSafeLoader")}')
+
+        def python_dump():
+            with open(file, 'w') as output_yaml:
+                yaml.dump(characters, output_yaml, Dumper=SpaceDumper, sort_keys=False)
+
+        def python_load():
+            with open(file, 'r') as input_yaml:
+                return yaml.safe_load(input_yaml)
+
+        timed('dump (SpaceDumper)', python_dump)
+        reference = open(file).read()
+        timed('load (yaml.safe_load)', python_load)
+        timed('dump (write_data)', write_data, file, characters)
+        assert open(file).read() == reference, 'write_data output differs from SpaceDumper'
+        loaded = timed('load (read_data)', read_data, file)
+        assert loaded == characters
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,7 @@ requirements = [
     'dacite==1.6.0',
     'requests==2.27.1',
     'Pyyaml==6.0',
+    'msgpack==1.0.4',
     'coverage==6.4.3',
     'pylint==2.12.2',
     'pytest==6.2.5',
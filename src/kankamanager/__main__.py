@@ -8,44 +8,124 @@
 """ Details about the module and for what purpose it was built for"""
 # ---------------------------------------------------------------------------
 import os
+import sys
 import logging
+import importlib
 from src.kankamanager.arguments import get_parser
-from cli.config import config, read_config
-from cli.get import get
-from cli.delete import delete
-from src.kankamanager.utilities import get_logger
-from kankaclient.constants import CONFIG
-from kankaclient.client import KankaClient
+from src.kankamanager.logger import get_logger
+from kankaclient.constants import CONFIG, DAEMON, PROXY, MULTI_CAMPAIGN_COMMANDS
 # ---------------------------------------------------------------------------
 
 LOGGER = get_logger()
 
 
+def config_path(args, cwd=None):
+    cwd = cwd or os.getcwd()
+    return os.path.normpath(os.path.join(cwd, args.config)) if args.config else os.path.join(cwd, "kanka.conf")
+
+
+def target(args, cwd=None):
+    """The config and snapshot a client is built from, resolved against the caller's directory"""
+    snapshot = os.path.normpath(os.path.join(cwd or os.getcwd(), args.snapshot)) if args.snapshot else None
+    return config_path(args, cwd), snapshot
+
+
 def init(args):
-    config_path = os.path.join(os.getcwd(), "kanka.conf")
-    if args.config:
-        config_path = os.path.normpath(args.config)
+    from kankamanager.kankaclient.metrics import METRICS  # pylint: disable=import-outside-toplevel
+
+    with METRICS.span('init'):
+        # Heavy imports (requests, dacite, yaml...) are deferred until a client is needed
+        from cli.config import read_config  # pylint: disable=import-outside-toplevel
+        from kankaclient.client import KankaClient  # pylint: disable=import-outside-toplevel
+
+        return KankaClient(read_config(config_path(args)), snapshot=args.snapshot, cassette=args.cassette, record=args.record)
+
 
-    return KankaClient(read_config(config_path))
+def campaigns(args):
+    from cli.config import read_config  # pylint: disable=import-outside-toplevel
+    from kankaclient.client import MultiCampaignClient  # pylint: disable=import-outside-toplevel
 
+    if args.command not in MULTI_CAMPAIGN_COMMANDS:
+        LOGGER.error('--campaign and --all-campaigns only run %s', ', '.join(MULTI_CAMPAIGN_COMMANDS))
+        return False
 
+    client = MultiCampaignClient(read_config(config_path(args)), campaigns=None if args.all_campaigns else args.campaigns, verbose=args.verbose)
+    try:
+        results = client.map(command(args.command), args)
+        for name, success in results.items():
+            LOGGER.info('%s %s: %s', args.command, name, 'done' if success else 'failed')
+        # A campaign that raised is left out of the results, its error is logged by map
+        return all(results.values()) and not client.errors
+    finally:
+        if args.stats:
+            stats(args)
+
+
+# Commands are imported by name when run
 commands = {
-    "config": config,
-    #TODO"create": create,
-    "delete": delete,
-    "get": get,
-    #TODO"push": push,
-    #TODO"pull": pull,
+    "config": "cli.config:config",
+    "create": "cli.create:create",
+    "delete": "cli.delete:delete",
+    "export": "cli.export:export",
+    "import": "cli.importer:import_campaign",
+    "get": "cli.get:get",
+    "push": "cli.push:push",
+    "pull": "cli.pull:pull",
+    "snapshot": "cli.snapshot:snapshot",
     #TODO"update": update,
 }
 
 
+def command(name):
+    module, function = commands.get(name).split(':')
+    return getattr(importlib.import_module(module), function)
+
+
+def stats(args):
+    from kankamanager.kankaclient.metrics import METRICS  # pylint: disable=import-outside-toplevel
+
+    sys.stderr.write(METRICS.prometheus() if args.stats == 'prometheus' else METRICS.render())
+
+
+def run(client, args):
+    try:
+        return command(args.command)(client, args)
+    finally:
+        if args.stats:
+            stats(args)
+
+
+def daemon(args):
+    from src.kankamanager.daemon import default_socket, serve, stop  # pylint: disable=import-outside-toplevel
+
+    path = args.socket or default_socket()
+    if args.stop:
+        if not stop(path):
+            LOGGER.error('No daemon running at %s', path)
+    else:
+        # Commands for another config or snapshot are refused, the warm client could not serve them
+        served = target(args)
+        serve(init(args), path, run, accepts=lambda _args, cwd: target(_args, cwd) == served)
+
+
+def proxy(args):
+    from src.kankamanager.proxy import serve  # pylint: disable=import-outside-toplevel
+
+    serve(args.host, args.port, args.ttl)
+
+
 def execute(args):
     if args.command == CONFIG:
-        config(args)
+        command(CONFIG)(args)
+    elif args.command == DAEMON:
+        daemon(args)
+    elif args.command == PROXY:
+        proxy(args)
+    elif args.campaigns or args.all_campaigns:
+        return campaigns(args)
     else:
         client = init(args)
-        commands.get(args.command)(client, args)
+        return run(client, args)
 
 
 def main():
@@ -53,11 +133,24 @@ def main():
     if args.verbose:
         LOGGER.setLevel(logging.DEBUG)
 
-    if args.command == CONFIG:
-        config(args)
+    # Hand the command to a running daemon, which already holds a warm client
+    local = args.no_daemon or args.stats or args.cassette or args.profile or args.campaigns or args.all_campaigns
+    if args.command not in (CONFIG, DAEMON, PROXY) and not local:
+        from src.kankamanager.daemon import default_socket, forward  # pylint: disable=import-outside-toplevel
+        status = forward(sys.argv[1:], args.socket or default_socket())
+        if status is not None:
+            sys.exit(status)
+
+    if args.profile:
+        from src.kankamanager.profiler import profile  # pylint: disable=import-outside-toplevel
+        with profile(args.profile):
+            result = execute(args)
     else:
-        client = init(args)
-        commands.get(args.command)(client, args)
+        result = execute(args)
+
+    # Commands report a failure by returning False, as they do through the daemon
+    if result is False:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
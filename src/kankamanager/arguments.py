@@ -6,18 +6,33 @@
 import argparse
 from kankaclient.constants import (
     OUTPUT_OPTIONS,
-    ENTITY_FORMAT
+    BULK_CHUNK_SIZE,
+    ENTITY_FORMAT,
+    PROXY_HOST,
+    PROXY_PORT,
+    PROXY_TTL,
+    PROFILE_PREFIX,
+    STATS_OPTIONS
 )
 # ---------------------------------------------------------------------------
 
 
-def get_parser():
+def get_parser(argv: list=None):
     parser = argparse.ArgumentParser(
         prog='KankaManager', description='A simple command-line client for managing Kanka campaigns.', add_help=help
     )
 
     parser.add_argument('-v', '--verbose', action='store_true', default=False, help='enable verbose logging')
     parser.add_argument('-c', '--config', action='store', default=None, help='path to Kanka config')
+    parser.add_argument('-s', '--snapshot', action='store', default=None, help='start from a campaign snapshot instead of the network')
+    parser.add_argument('--stats', nargs='?', const='table', default=None, choices=STATS_OPTIONS, help='print per-endpoint request metrics at exit (table or prometheus)')
+    parser.add_argument('--cassette', action='store', default=None, help='replay the Kanka requests from a cassette file')
+    parser.add_argument('--record', action='store_true', default=False, help='record the Kanka requests to the --cassette file')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_PREFIX, default=None, metavar='PREFIX', help='profile the command, writing PREFIX.prof and PREFIX.folded')
+    parser.add_argument('--campaign', action='append', default=None, dest='campaigns', help='run pull or push over this campaign, by name or id, instead of the configured one (repeatable, run concurrently)')
+    parser.add_argument('--all-campaigns', action='store_true', default=False, help='run pull or push over every campaign concurrently')
+    parser.add_argument('--socket', action='store', default=None, help='daemon socket path')
+    parser.add_argument('--no-daemon', action='store_true', default=False, help='do not forward the command to a running daemon')
 
     subparsers = parser.add_subparsers(title='subcommands', description='valid subcommands', help='additional help', dest='command')
 
@@ -27,12 +42,14 @@ def get_parser():
     parser_get.add_argument('-f', '--field', action='store', type=str, default=[], dest='fields', nargs='*', help='TODO')
     parser_get.add_argument('--clean', action='store_true', default=False, help='TODO')
     parser_get.add_argument('-o', '--output', action='store', type=str, choices=OUTPUT_OPTIONS, help='TODO')
+    parser_get.add_argument('--max-width', action='store', type=int, default=None, help='truncate table values longer than this (default: print in full)')
 
     parser_create = subparsers.add_parser('create', help='TODO')
     parser_create.add_argument('entity', action='store', type=str, help='TODO')
     parser_create.add_argument('-n', '--name', action='store', type=str, help='TODO')
     parser_create.add_argument('-f', '--file', action='store', type=str, help='TODO')
     parser_create.add_argument('-p', '--parameters', action='store', type=str, default=[], nargs='*', help='TODO')
+    parser_create.add_argument('--chunk-size', action='store', type=int, default=BULK_CHUNK_SIZE, help=f'entities per concurrent chunk when creating from a file (default: {BULK_CHUNK_SIZE})')
 
     parser_update = subparsers.add_parser('update', help='TODO')
     parser_update.add_argument('entity', action='store', type=str, help='TODO')
@@ -41,18 +58,46 @@ def get_parser():
     parser_delete.add_argument('entity', action='store', type=str, help='TODO')
     parser_delete.add_argument('-n', '--name', action='store', dest='entities', type=str, nargs='+', help='TODO')
 
-    parser_pull = subparsers.add_parser('pull', help='TODO')
+    parser_pull = subparsers.add_parser('pull', help='pull entities from Kanka into the campaign directory')
+    parser_pull.add_argument('-e', '--entity', action='store', type=str, default=[], dest='types', nargs='*', help='entity types to pull (default: all)')
+    parser_pull.add_argument('--sharded', action='store_true', default=False, help='store one file per entity')
+    parser_pull.add_argument('--resume', action='store_true', default=False, help='continue a failed pull from its last checkpoint')
+    parser_pull.add_argument('--assets', action='store_true', default=False, help='download the entity images into the campaign directory')
 
-    parser_push = subparsers.add_parser('push', help='TODO')
+    parser_push = subparsers.add_parser('push', help='push entities from the campaign directory to Kanka')
+    parser_push.add_argument('-e', '--entity', action='store', type=str, default=[], dest='types', nargs='*', help='entity types to push (default: all)')
+    parser_push.add_argument('--resume', action='store_true', default=False, help='continue a failed push from its last checkpoint')
+
+    parser_import = subparsers.add_parser('import', help='create the entities of a campaign directory in dependency order')
+    parser_import.add_argument('directory', action='store', type=str, help='the campaign directory to import, e.g. from a pull of another campaign')
+    parser_import.add_argument('-e', '--entity', action='store', type=str, default=[], dest='types', nargs='*', help='entity types to import (default: all)')
+
+    parser_snapshot = subparsers.add_parser('snapshot', help='write a binary snapshot of the campaign entities')
+    parser_snapshot.add_argument('-f', '--file', action='store', type=str, default=None, help='snapshot path (default: <campaign_dir>/campaign.snapshot)')
+
+    parser_export = subparsers.add_parser('export', help='export the campaign entities as Parquet tables')
+    parser_export.add_argument('-e', '--entity', action='store', type=str, default=[], dest='types', nargs='*', help='entity types to export (default: all)')
+    parser_export.add_argument('-d', '--directory', action='store', type=str, default=None, help='output directory (default: <campaign_dir>/parquet)')
+    parser_export.add_argument('--summary', action='store_true', default=False, help='print entity, type, tag and dead/alive counts')
+
+    parser_daemon = subparsers.add_parser('daemon', help='serve commands from a warm client over a Unix socket')
+    parser_daemon.add_argument('--stop', action='store_true', default=False, help='stop the running daemon')
+
+    parser_proxy = subparsers.add_parser('proxy', help='serve the Kanka API routes through a shared local cache')
+    parser_proxy.add_argument('--host', action='store', type=str, default=PROXY_HOST, help=f'listening address (default: {PROXY_HOST})')
+    parser_proxy.add_argument('--port', action='store', type=int, default=PROXY_PORT, help=f'listening port (default: {PROXY_PORT})')
+    parser_proxy.add_argument('--ttl', action='store', type=float, default=PROXY_TTL, help=f'seconds a response stays cached (default: {PROXY_TTL})')
 
     parser_config = subparsers.add_parser('config', help='TODO')
     parser_config.add_argument('--file', help='TODO')
     parser_config.add_argument('--show', action='store_true', default=None, help='TODO')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if hasattr(args, 'entity'):
         setattr(args, 'entity', ENTITY_FORMAT.get(args.entity, 'None'))
+    if hasattr(args, 'types'):
+        setattr(args, 'types', [ENTITY_FORMAT.get(_type, _type) for _type in args.types])
     if hasattr(args, 'parameters'):
         parameters = {}
         for _p in args.parameters:
@@ -61,6 +106,4 @@ def get_parser():
                 parameters[_p[0]] = _p[1]
         setattr(args, 'parameters', parameters)
 
-    print()
-
     return args
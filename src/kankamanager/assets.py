@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Content-addressed store of the entities' images under the campaign_dir"""
+# ---------------------------------------------------------------------------
+import os
+import hashlib
+import tempfile
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+import yaml
+from src.kankamanager.utilities import get_logger, read_data, Dumper
+from kankaclient.constants import ASSETS_DIR, ASSET_INDEX, ASSET_FIELDS, ASSET_TIMEOUT, ASSET_CHUNK_SIZE, MAX_WORKERS
+from kankamanager.kankaclient.base import SESSION
+# ---------------------------------------------------------------------------
+
+LOGGER = get_logger()
+
+
+def asset_urls(entities: list) -> list:
+    """
+    Lists the image urls of the provided entities, without duplicates
+
+    Args:
+        entities (list): the entities (dicts)
+
+    Returns:
+        list: the image urls, in entity order
+    """
+    urls = dict()
+    for entity in entities:
+        for field in ASSET_FIELDS:
+            url = entity.get(field)
+            if isinstance(url, str) and url.startswith(('http://', 'https://')):
+                urls[url] = None
+
+    return list(urls)
+
+
+class AssetStore(object):
+    """
+    Stores the images of a campaign once per content
+
+    The layout is <campaign_dir>/assets/<hash[:2]>/<hash><ext>, the hash being
+    the SHA-256 of the content, so urls serving the same image share one file.
+    The index maps every downloaded url to its file, hash, size, modification
+    time and the response's ETag and Last-Modified. An indexed url whose file
+    still has its hash is revalidated with a conditional GET and only
+    downloaded again when the server serves another image.
+    """
+
+    def __init__(self, campaign_dir: str):
+        self.directory = os.path.join(campaign_dir, ASSETS_DIR)
+        self.index_path = os.path.join(self.directory, ASSET_INDEX)
+        self.index = read_data(self.index_path) or dict()
+        self.lock = threading.Lock()
+        # Whether an index entry changed without a download, e.g. a touched file
+        self.dirty = False
+
+
+    def _save_index(self):
+        with open(self.index_path, 'w') as index:
+            index.write(yaml.dump(self.index, Dumper=Dumper, sort_keys=True))
+
+
+    def path(self, url: str) -> str:
+        """
+        Returns the local file of a downloaded image
+
+        Args:
+            url (str): the image url
+
+        Returns:
+            str: the image path, None when the url was not downloaded
+        """
+        entry = self.index.get(url)
+        return os.path.join(self.directory, entry.get('file')) if entry else None
+
+
+    def current(self, url: str) -> bool:
+        """
+        Checks whether an image was downloaded and its file still has the indexed hash
+
+        The file is only hashed again when its size or modification time
+        differs from the index.
+
+        Args:
+            url (str): the image url
+
+        Returns:
+            bool: whether the stored file is intact
+        """
+        path = self.path(url)
+        if path is None or not os.path.isfile(path):
+            return False
+
+        entry = self.index[url]
+        stat = os.stat(path)
+        if stat.st_size != entry.get('size'):
+            return False
+        if stat.st_mtime_ns == entry.get('mtime'):
+            return True
+
+        content = hashlib.sha256()
+        with open(path, 'rb') as image:
+            for chunk in iter(lambda: image.read(ASSET_CHUNK_SIZE), b''):
+                content.update(chunk)
+        if content.hexdigest() != entry.get('hash'):
+            return False
+
+        entry['mtime'] = stat.st_mtime_ns
+        self.dirty = True
+        return True
+
+
+    def _download(self, url: str, entry: dict=None) -> dict:
+        headers = dict()
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry.get('etag')
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry.get('last_modified')
+
+        with SESSION.get(url, headers=headers, stream=True, timeout=ASSET_TIMEOUT) as response:
+            if entry is not None and response.status_code == 304:
+                return entry
+            response.raise_for_status()
+
+            content = hashlib.sha256()
+            size = 0
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.part')
+            try:
+                with os.fdopen(descriptor, 'wb') as part:
+                    for chunk in response.iter_content(ASSET_CHUNK_SIZE):
+                        content.update(chunk)
+                        part.write(chunk)
+                        size += len(chunk)
+
+                digest = content.hexdigest()
+                file = f'{digest[:2]}/{digest}{os.path.splitext(urlsplit(url).path)[1].lower()}'
+                path = os.path.join(self.directory, file)
+                with self.lock:
+                    # Identical content stored from another url is replaced too, in case that file was damaged
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(temporary, path)
+                    mtime = os.stat(path).st_mtime_ns
+            except BaseException:
+                if os.path.isfile(temporary):
+                    os.remove(temporary)
+                raise
+
+            validators = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+
+        return dict({'file': file, 'hash': digest, 'size': size, 'mtime': mtime}, **{k: v for k, v in validators.items() if v})
+
+
+    def _fetch(self, url: str, entry: dict=None) -> dict:
+        try:
+            return self._download(url, entry)
+        except Exception as ex:
+            LOGGER.error('Failed to download %s', url)
+            LOGGER.debug(ex)
+            return None
+
+
+    def sync(self, urls: list, max_workers: int=MAX_WORKERS) -> tuple:
+        """
+        Downloads the provided images concurrently, revalidating the ones already stored
+
+        Args:
+            urls (list): the image urls
+            max_workers (int, optional): the downloads run at once. Defaults to MAX_WORKERS.
+
+        Returns:
+            tuple: the downloaded urls and the urls that failed
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return [], []
+
+        # Damaged or missing files are downloaded again, intact ones only when the image changed
+        stored = {url: self.index.get(url) if self.current(url) else None for url in urls}
+        os.makedirs(self.directory, exist_ok=True)
+        downloaded, failed = list(), list()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for url, entry in zip(urls, executor.map(self._fetch, urls, [stored.get(url) for url in urls])):
+                if entry is None:
+                    failed.append(url)
+                elif entry is not stored.get(url):
+                    self.index[url] = entry
+                    downloaded.append(url)
+
+        if downloaded or self.dirty:
+            self._save_index()
+            self.dirty = False
+        LOGGER.debug('%s: %s of %s images downloaded, %s failed', self.directory, len(downloaded), len(urls), len(failed))
+
+        return downloaded, failed
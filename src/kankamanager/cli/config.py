@@ -5,8 +5,7 @@
 # ---------------------------------------------------------------------------
 import os
 import sys
-import yaml
-from src.kankamanager.utilities import (
+from src.kankamanager.logger import (
     get_logger
 )
 from kankaclient.constants import CONFIG_FIELDS, CONFIG_FILE
@@ -28,6 +27,8 @@ def config(args):
         create_config(config_path)
 
 def read_config(path: str) -> dict:
+    import yaml  # pylint: disable=import-outside-toplevel
+
     config = dict()
     if path:
         try:
@@ -37,6 +38,7 @@ def read_config(path: str) -> dict:
                 config["campaign_dir"] = data.get("campaign_dir", None)
                 config["token"] = data.get("token", None)
                 config["throttle"] = data.get("throttle", True)
+                config["compress"] = bool(data.get("compress", False))
         except FileNotFoundError as ex:
             LOGGER.error('Failed to read config, file not found: %s', path)
             LOGGER.debug(ex)
@@ -62,14 +64,12 @@ def show_config(path):
         LOGGER.error('Failed to show config, file not found: %s', path)
         LOGGER.debug(ex)
         sys.exit(1)
-    except yaml.YAMLError as ex:
-        LOGGER.error('Failed to process config: %s', path)
-        LOGGER.debug(ex)
-        sys.exit(1)
     sys.exit(0)
 
 
 def create_config(path):
+    import yaml  # pylint: disable=import-outside-toplevel
+
     LOGGER.debug("Attempting to write to configuration file: %s", path)
     try:
         with open(path, "r") as config_file:
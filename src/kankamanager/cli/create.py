@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Creates entities in Kanka, in concurrent chunks when read from a file"""
+# ---------------------------------------------------------------------------
+from src.kankamanager.utilities import get_logger, read_data
+from kankaclient.bulk import BulkCreator
+
+LOGGER = get_logger()
+
+
+def create(client, args):
+    if args.file:
+        data = read_data(args.file)
+        items = data if isinstance(data, list) else [data] if data else []
+    else:
+        items = [dict(args.parameters, name=args.name)]
+
+    # Entities read back from a pull keep their old ids, which Kanka assigns anew
+    items = [{field: value for field, value in item.items() if field != 'id'} for item in items]
+
+    creator = BulkCreator(client, chunk_size=args.chunk_size)
+    created = creator.create(args.entity, items)
+    LOGGER.debug('Created %s of %s %s', len(created), len(items), args.entity)
+
+    return not creator.failed
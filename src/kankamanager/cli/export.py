@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Exports the campaign entities as Parquet tables"""
+# ---------------------------------------------------------------------------
+import os
+from src.kankamanager.utilities import get_logger, dump_data
+from kankaclient.constants import PARQUET_DIR
+
+LOGGER = get_logger()
+
+
+def export(client, args):
+    try:
+        from kankaclient.columnar import to_tables, write_parquet, summary
+    except ImportError as ex:
+        LOGGER.error('The export command requires pyarrow (pip install pyarrow)')
+        LOGGER.debug(ex)
+        return False
+
+    directory = args.directory or os.path.join(client.campaign_dir, PARQUET_DIR)
+    try:
+        tables = to_tables(client, args.types)
+        files = write_parquet(tables, directory)
+    except Exception as ex:
+        LOGGER.error('Failed to export campaign to %s', directory)
+        LOGGER.debug(ex)
+        return False
+
+    LOGGER.debug('Exported %s', files)
+    if args.summary:
+        print(dump_data(summary(tables)))
+    print(f'Campaign exported to: {directory}')
+    return True
@@ -4,13 +4,31 @@
 """ Details about the module and for what purpose it was built for"""
 # ---------------------------------------------------------------------------
 from src.kankamanager.utilities import stamp
+from kankaclient.constants import TABLE_FIELDS
+from kankamanager.kankaclient.metrics import METRICS
+
+
+def projection(args) -> list:
+    """
+    Returns the fields the requested output needs, None for the whole entity
+
+    Args:
+        args (Namespace): the command arguments
+
+    Returns:
+        list: the fields to decode
+    """
+    if args.output == 'table':
+        return TABLE_FIELDS + args.fields
+    return args.fields or None
 
 
 def get(client, args):
     if args.name is None:
-        result = client.get_all(args.entity)
+        result = client.iter_all(args.entity, fields=projection(args))
     else:
         result = [client.get(args.entity, args.name)]
 
     #TODO: Finish output format/process
-    stamp(result, args)
+    with METRICS.span('render'):
+        stamp(result, args)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Imports a campaign directory into the Kanka campaign in dependency order"""
+# ---------------------------------------------------------------------------
+import os
+from src.kankamanager.utilities import get_logger, read_data
+from src.kankamanager.store import ShardedStore
+from kankaclient.scheduler import ImportScheduler, SchedulerError
+
+LOGGER = get_logger()
+
+
+def read_campaign(directory, entities) -> dict:
+    batches = dict()
+    for entity in entities:
+        if ShardedStore.exists(directory, entity):
+            batches[entity] = ShardedStore(directory, entity).read()
+        elif os.path.isfile(os.path.join(directory, f'{entity}.yaml')):
+            batches[entity] = read_data(os.path.join(directory, f'{entity}.yaml')) or []
+
+    return batches
+
+
+def import_campaign(client, args):
+    entities = args.types or [entity for entity in client.entities if entity != 'campaign']
+    batches = read_campaign(args.directory, entities)
+
+    scheduler = ImportScheduler(client, batches)
+    try:
+        ids = scheduler.run()
+    except SchedulerError as ex:
+        LOGGER.error(ex)
+        return False
+
+    LOGGER.debug('Imported %s entities, %s failed, %s skipped', len(ids), len(scheduler.failed), len(scheduler.skipped))
+    print(f'Imported {len(ids)} of {len(scheduler.nodes)} entities from: {args.directory}')
+    return not (scheduler.failed or scheduler.skipped)
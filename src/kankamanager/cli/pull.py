@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Pulls campaign entities from Kanka into the campaign directory"""
+# ---------------------------------------------------------------------------
+import os
+from src.kankamanager.utilities import get_logger, clean, write_data
+from src.kankamanager.store import ShardedStore
+from src.kankamanager.journal import Journal
+from src.kankamanager.assets import AssetStore, asset_urls
+from kankamanager.kankaclient.metrics import METRICS
+
+LOGGER = get_logger()
+
+
+def fetch(client, entity, journal):
+    data, url, started = journal.pages(entity)
+    if started and url is None:
+        return data
+
+    # Every page is checkpointed, a resumed pull continues from the next one
+    for entities, url in client.entities[entity].iter_pages(url):
+        page = [clean(_entity) for _entity in entities]
+        journal.page(entity, page, url)
+        data.extend(page)
+
+    return data
+
+
+def pull(client, args):
+    entities = args.types or [entity for entity in client.entities if entity != 'campaign']
+    os.makedirs(client.campaign_dir, exist_ok=True)
+    journal = Journal(client.campaign_dir, 'pull', resume=args.resume)
+    assets = AssetStore(client.campaign_dir) if args.assets else None
+
+    success = True
+    for entity in entities:
+        if journal.finished(entity):
+            continue
+        try:
+            data = fetch(client, entity, journal)
+        except Exception as ex:
+            LOGGER.error('Failed to pull %s', entity)
+            LOGGER.debug(ex)
+            success = False
+            continue
+
+        # A type is only checkpointed as done once its files are written
+        with METRICS.span('render'):
+            if args.sharded or ShardedStore.exists(client.campaign_dir, entity):
+                try:
+                    written = ShardedStore(client.campaign_dir, entity).write(data)
+                except OSError as ex:
+                    LOGGER.error('Failed to write %s', entity)
+                    LOGGER.debug(ex)
+                    success = False
+                    continue
+                LOGGER.debug('Pulled %s %s, %s changed', len(data), entity, len(written))
+            else:
+                if not write_data(os.path.join(client.campaign_dir, f'{entity}.yaml'), data):
+                    success = False
+                    continue
+                LOGGER.debug('Pulled %s %s', len(data), entity)
+
+        # Images are synced before the type is checkpointed, a resumed pull retries the failed ones
+        if assets is not None:
+            _, failed = assets.sync(asset_urls(data))
+            if failed:
+                LOGGER.error('Failed to download %s %s images', len(failed), entity)
+                success = False
+                continue
+        journal.finish(entity)
+
+    journal.close(success)
+    return success
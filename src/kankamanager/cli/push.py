@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Pushes campaign entities from the campaign directory to Kanka"""
+# ---------------------------------------------------------------------------
+import os
+from src.kankamanager.utilities import get_logger, clean, iter_data, read_data
+from src.kankamanager.store import ShardedStore
+from src.kankamanager.journal import Journal
+
+LOGGER = get_logger()
+
+
+def push_entity(client, entity, data):
+    if data.get('id'):
+        return client.update(entity, data)
+    return client.create(entity, data)
+
+
+def push_sharded(client, entity):
+    store = ShardedStore(client.campaign_dir, entity)
+
+    pushed = list()
+    try:
+        for data in store.read(store.changed()):
+            push_entity(client, entity, data)
+            pushed.append(data.get('id'))
+    finally:
+        store.mark(pushed)
+
+    for file in store.untracked():
+        created = push_entity(client, entity, read_data(os.path.join(store.directory, file)))
+        store.track(file, clean(created))
+        pushed.append(file)
+
+    LOGGER.debug('Pushed %s changed %s', len(pushed), entity)
+
+
+def push_file(client, entity, journal):
+    # Sharded pushes checkpoint in their manifest, single files in the journal
+    sent = journal.sent(entity)
+    count = 0
+    for index, data in enumerate(iter_data(os.path.join(client.campaign_dir, f'{entity}.yaml'))):
+        key = data.get('id') or f'#{index}'
+        if key in sent:
+            continue
+        push_entity(client, entity, data)
+        journal.pushed(entity, key)
+        count += 1
+
+    LOGGER.debug('Pushed %s %s', count, entity)
+
+
+def push(client, args):
+    entities = args.types or [entity for entity in client.entities if entity != 'campaign']
+    journal = Journal(client.campaign_dir, 'push', resume=args.resume)
+
+    success = True
+    for entity in entities:
+        if journal.finished(entity):
+            continue
+        try:
+            if ShardedStore.exists(client.campaign_dir, entity):
+                push_sharded(client, entity)
+            else:
+                push_file(client, entity, journal)
+        except Exception as ex:
+            LOGGER.error('Failed to push %s', entity)
+            LOGGER.debug(ex)
+            success = False
+            continue
+        journal.finish(entity)
+
+    journal.close(success)
+    return success
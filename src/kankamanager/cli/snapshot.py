@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Writes a binary snapshot of the campaign entities"""
+# ---------------------------------------------------------------------------
+import os
+from src.kankamanager.utilities import get_logger
+from kankaclient.constants import SNAPSHOT
+from kankaclient.snapshot import write_snapshot
+
+LOGGER = get_logger()
+
+
+def snapshot(client, args):
+    path = args.file or os.path.join(client.campaign_dir, SNAPSHOT)
+    try:
+        counts = write_snapshot(client, path)
+    except Exception as ex:
+        LOGGER.error('Failed to write snapshot: %s', path)
+        LOGGER.debug(ex)
+        return False
+
+    LOGGER.debug('Snapshot written to %s: %s', path, counts)
+    print(f'Snapshot written to: {path}')
+    return True
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Background daemon keeping a warm KankaClient behind a Unix socket"""
+# ---------------------------------------------------------------------------
+import os
+import io
+import sys
+import json
+import time
+import socket
+import struct
+import logging
+import tempfile
+import contextlib
+from src.kankamanager.logger import get_logger
+from kankaclient.constants import LOG_FORMAT, LOG_DATE_FORMAT, DAEMON_CACHE_TTL, DAEMON_WRITE_COMMANDS
+# ---------------------------------------------------------------------------
+
+LOGGER = get_logger()
+
+# Response frames: a channel byte, the payload length, then the payload
+STDOUT = b'o'
+STDERR = b'e'
+STATUS = b's'
+HEADER = struct.Struct('>cI')
+
+
+class Channel(io.RawIOBase):
+    """Writes everything written to it as frames of one channel of the response"""
+
+    def __init__(self, wfile, channel: bytes):
+        super().__init__()
+        self.wfile = wfile
+        self.channel = channel
+
+
+    def writable(self) -> bool:
+        return True
+
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        if data:
+            self.wfile.write(HEADER.pack(self.channel, len(data)) + data)
+        return len(data)
+
+def default_socket() -> str:
+    """
+    Returns the default daemon socket path
+
+    Returns:
+        str: the socket path
+    """
+    return os.path.join(tempfile.gettempdir(), f'kankamanager-{os.getuid()}.sock')
+
+
+def forward(argv: list, path: str) -> int:
+    """
+    Forwards a command to the running daemon and copies its output to stdout and stderr
+
+    Args:
+        argv (list): the command-line arguments
+        path (str): the daemon socket path
+
+    Returns:
+        int: the exit status of the command, None when no daemon handled it
+    """
+    if not os.path.exists(path):
+        return None
+
+    status = None
+    streams = {STDOUT: sys.stdout, STDERR: sys.stderr}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path)
+            connection.sendall(json.dumps({'argv': argv, 'cwd': os.getcwd()}).encode('utf-8') + b'\n')
+            with connection.makefile('rb') as response:
+                while True:
+                    header = response.read(HEADER.size)
+                    if len(header) < HEADER.size:
+                        break
+                    channel, length = HEADER.unpack(header)
+                    payload = response.read(length)
+                    if channel == STATUS:
+                        status = int(payload)
+                    else:
+                        stream = streams.get(channel)
+                        stream.buffer.write(payload)
+                        stream.flush()
+    except (ConnectionRefusedError, FileNotFoundError) as ex:
+        LOGGER.debug('Daemon not reachable at %s: %s', path, ex)
+        return None
+
+    if status is None:
+        LOGGER.error('The daemon at %s closed the connection before the command completed', path)
+        return 1
+    return status
+
+
+def stop(path: str) -> bool:
+    """
+    Asks the running daemon to stop
+
+    Args:
+        path (str): the daemon socket path
+
+    Returns:
+        bool: whether a daemon was stopped
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path)
+            connection.sendall(json.dumps({'stop': True}).encode('utf-8') + b'\n')
+            connection.recv(1)
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+
+    return True
+
+
+def serve(client, path: str, execute, accepts=None):
+    """
+    Serves commands on the socket until stopped, one at a time, with the warm client
+
+    The client's caches are cleared after every write command and once they
+    are older than DAEMON_CACHE_TTL. Each command's output and log records are
+    relayed to the caller, followed by its exit status.
+
+    Args:
+        client (KankaClient): the client kept warm between commands
+        path (str): the daemon socket path
+        execute (function): runs a command, execute(client, args), False meaning it failed
+        accepts (function, optional): accepts(args, cwd), whether the warm client can run the command
+    """
+    import socketserver  # pylint: disable=import-outside-toplevel
+    from src.kankamanager.arguments import get_parser  # pylint: disable=import-outside-toplevel
+
+    cleared = [time.monotonic()]
+
+    def run(args, cwd) -> int:
+        if accepts is not None and not accepts(args, cwd):
+            LOGGER.error('The daemon serves another configuration or snapshot, run with --no-daemon or restart the daemon')
+            return 2
+        if time.monotonic() - cleared[0] > DAEMON_CACHE_TTL:
+            client.clear_caches()
+            cleared[0] = time.monotonic()
+
+        try:
+            return 1 if execute(client, args) is False else 0
+        finally:
+            if args.command in DAEMON_WRITE_COMMANDS:
+                client.clear_caches()
+                cleared[0] = time.monotonic()
+
+    class Handler(socketserver.StreamRequestHandler):
+
+        def handle(self):
+            request = json.loads(self.rfile.readline() or b'{}')
+            if request.get('stop'):
+                self.server.stopping = True
+                return
+
+            output = io.TextIOWrapper(io.BufferedWriter(Channel(self.wfile, STDOUT)), encoding='utf-8')
+            errors = io.TextIOWrapper(io.BufferedWriter(Channel(self.wfile, STDERR)), encoding='utf-8', write_through=True)
+            # The command's log records go back to the caller, as they would in a local run
+            handler = logging.StreamHandler(errors)
+            handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+            logging.getLogger().addHandler(handler)
+            status = 1
+            try:
+                with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+                    status = run(get_parser(request.get('argv')), request.get('cwd'))
+            except SystemExit as ex:
+                status = ex.code if isinstance(ex.code, int) else 0 if ex.code is None else 1
+            except Exception as ex:
+                LOGGER.error('Daemon command failed: %s', request.get('argv'))
+                LOGGER.debug(ex)
+            finally:
+                logging.getLogger().removeHandler(handler)
+                output.flush()
+                errors.flush()
+                self.wfile.write(HEADER.pack(STATUS, len(str(status))) + str(status).encode('utf-8'))
+
+    if os.path.exists(path):
+        os.remove(path)
+
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        server.stopping = False
+        LOGGER.debug('Daemon listening on %s', path)
+        try:
+            while not server.stopping:
+                server.handle_request()
+        finally:
+            os.remove(path)
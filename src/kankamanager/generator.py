@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Synthetic campaign generator for load testing"""
+# ---------------------------------------------------------------------------
+import os
+import random
+import typing
+import importlib
+from dataclasses import fields
+# ---------------------------------------------------------------------------
+
+# Entities generated per character at scale 1 (references are generated first)
+RATIOS = {
+    'tags': 0.05,
+    'races': 0.02,
+    'locations': 0.5,
+    'families': 0.05,
+    'organizations': 0.03,
+    'calendars': 0.002,
+    'abilities': 0.1,
+    'items': 0.4,
+    'characters': 1.0,
+    'quests': 0.1,
+    'events': 0.1,
+    'journals': 0.1,
+    'conversations': 0.02,
+    'dice': 0.05,
+    'maps': 0.01,
+    'timelines': 0.005,
+}
+
+WORDS = [
+    'amber', 'ash', 'bright', 'cinder', 'crown', 'dawn', 'dusk', 'ember', 'fall', 'fen', 'frost', 'gale',
+    'glen', 'hollow', 'iron', 'keep', 'mire', 'moon', 'oak', 'reach', 'river', 'shade', 'spire', 'stone',
+    'storm', 'thorn', 'vale', 'wave', 'wild', 'wind'
+]
+PRONOUNS = ['She/Her', 'He/Him', 'They/Them']
+
+
+def scaled(characters: int) -> dict:
+    """
+    Returns realistic entity counts for a campaign of the provided size
+
+    Args:
+        characters (int): the number of characters
+
+    Returns:
+        dict: the number of entities of each type
+    """
+    return {entity: max(1, int(characters * ratio)) for entity, ratio in RATIOS.items()}
+
+
+def uniform(count: int) -> dict:
+    """
+    Returns the same entity count for every type
+
+    Args:
+        count (int): the number of entities of each type
+
+    Returns:
+        dict: the number of entities of each type
+    """
+    return {entity: count for entity in RATIOS}
+
+
+def data_classes() -> dict:
+    """
+    Returns the (endpoint, dataclass) of every client manager, None for untyped managers
+
+    Returns:
+        dict: the endpoint and dataclass of each entity type
+    """
+    # Imported on use, the managers build their urls from BASE_URL when imported
+    from kankamanager.kankaclient.client import MANAGERS  # pylint: disable=import-outside-toplevel
+
+    result = dict()
+    for entity, (module, name) in MANAGERS.items():
+        manager = getattr(importlib.import_module(module), name)
+        result[entity] = (manager.ENDPOINT, manager.DATA_CLASS)
+
+    return result
+
+
+def _default(field, index: int):
+    """Returns a type-correct default for a dataclass field"""
+    annotation = field.type
+    if typing.get_origin(annotation) is typing.Union:
+        if type(None) in typing.get_args(annotation):
+            return None
+        annotation = typing.get_args(annotation)[0]
+
+    if annotation is bool:
+        return False
+    if annotation is int:
+        return index
+    if annotation is str:
+        return ''
+    if annotation is list or typing.get_origin(annotation) is list:
+        return []
+    return None
+
+
+class CampaignGenerator(object):
+    """
+    Generates a synthetic campaign matching the entity dataclasses
+
+    Ids are unique across entity types and every reference (tags, races,
+    families, parent locations, characters of dice rolls and quest elements)
+    points at a generated entity. The same seed generates the same campaign.
+    """
+
+    def __init__(self, counts: dict, seed: int=0, campaign_id: int=1, name: str='Generated'):
+        """
+        Campaign Generator Constructor
+
+        Args:
+            counts (dict): the number of entities of each type, see scaled
+            seed (int, optional): the random seed. Defaults to 0.
+            campaign_id (int, optional): the campaign id. Defaults to 1.
+            name (str, optional): the campaign name. Defaults to 'Generated'.
+        """
+        self.counts = counts
+        self.random = random.Random(seed)
+        self.campaign_id = campaign_id
+        self.name = name
+        self.classes = data_classes()
+        self.next_id = 0
+        self.entities = dict()
+        self.ids = dict()
+
+
+    def _id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+
+    def _ids(self, entity: str) -> list:
+        return self.ids.get(entity, [])
+
+
+    def _pick(self, entity: str, low: int=0, high: int=1) -> list:
+        ids = self._ids(entity)
+        return self.random.sample(ids, min(len(ids), self.random.randint(low, high)))
+
+
+    def _one(self, entity: str):
+        ids = self._ids(entity)
+        return self.random.choice(ids) if ids else None
+
+
+    def _name(self) -> str:
+        return ' '.join(self.random.choice(WORDS).capitalize() for _ in range(2))
+
+
+    def _entry(self, paragraphs: int=3) -> str:
+        return ''.join(
+            '<p>' + ' '.join(self.random.choice(WORDS) for _ in range(self.random.randint(20, 80))) + '.</p>'
+            for _ in range(self.random.randint(1, paragraphs))
+        )
+
+
+    def entity(self, entity: str) -> dict:
+        """
+        Generates one entity of the provided type, referencing the entities generated so far
+
+        Args:
+            entity (str): the entity type
+
+        Returns:
+            dict: the generated entity
+        """
+        from kankamanager.kankaclient.base import Entity  # pylint: disable=import-outside-toplevel
+
+        data_class = self.classes.get(entity)[1]
+        id = self._id()
+        data = {field.name: _default(field, id) for field in fields(data_class or Entity)}
+        data.update({
+            'id': id,
+            'name': f'{self._name()} {id}',
+            'entity_id': 100000 + id,
+            'is_private': self.random.random() < 0.1,
+            'tags': self._pick('tags', 0, 3),
+            'created_at': '2022-08-01T00:00:00.000000Z',
+            'created_by': 1,
+        })
+        if 'entry' in data:
+            data['entry'] = self._entry()
+        if 'type' in data:
+            data['type'] = self.random.choice(WORDS).capitalize()
+        if 'image_full' in data and self.random.random() < 0.3:
+            data['image_full'] = f'https://kanka-user-assets.s3.eu-central-1.amazonaws.com/{entity}/{id:012d}.png'
+            data['image_thumb'] = data['image_full'].replace('.png', '_thumb.png')
+            data['has_custom_image'] = True
+
+        getattr(self, f'_{entity}', lambda data: None)(data)
+        if data_class is None:
+            return data
+
+        # Typed entities keep exactly their dataclass fields
+        names = {field.name for field in fields(data_class)}
+        return {field: value for field, value in data.items() if field in names}
+
+
+    def _tags(self, data: dict):
+        data['colour'] = self.random.choice(['red', 'blue', 'green', 'yellow', 'purple', None])
+        data['tag_id'] = self._one('tags') if self.random.random() < 0.3 else None
+
+
+    def _races(self, data: dict):
+        data['race_id'] = self._one('races') if self.random.random() < 0.2 else None
+
+
+    def _locations(self, data: dict):
+        # Most locations sit inside an earlier one, giving a deep nested world
+        parent = self._one('locations') if self.random.random() < 0.8 else None
+        data['parent_location_id'] = parent
+        data['location_id'] = parent
+
+
+    def _families(self, data: dict):
+        data['location_id'] = self._one('locations')
+
+
+    def _organizations(self, data: dict):
+        data['location_id'] = self._one('locations')
+
+
+    def _characters(self, data: dict):
+        data.update({
+            'title': self.random.choice(['Adventurer', 'Merchant', 'Knight', 'Bard', None]),
+            'age': str(self.random.randint(16, 300)),
+            'sex': self.random.choice(['Female', 'Male', None]),
+            'pronouns': self.random.choice(PRONOUNS),
+            'location_id': self._one('locations'),
+            'races': self._pick('races', 1, 2),
+            'families': self._pick('families', 0, 2),
+            'is_dead': self.random.random() < 0.1,
+            'traits': [
+                {'name': self.random.choice(WORDS).capitalize(), 'entry': self._name(), 'section': 'personality'}
+                for _ in range(self.random.randint(0, 4))
+            ],
+        })
+
+
+    def _items(self, data: dict):
+        data.update({
+            'location_id': self._one('locations'),
+            'price': f'{self.random.randint(1, 500)} gp',
+            'size': self.random.choice(['Tiny', 'Small', 'Medium', 'Large']),
+        })
+
+
+    def _abilities(self, data: dict):
+        data['charges'] = self.random.choice([None, 1, 3])
+
+
+    def _calendars(self, data: dict):
+        months = [
+            {'name': self._name(), 'length': self.random.randint(28, 40), 'type': 'standard'}
+            for _ in range(self.random.randint(10, 20))
+        ]
+        data.update({
+            'date': f'{self.random.randint(1, 2000)}-{self.random.randint(1, len(months))}-1',
+            'months': months,
+            'years': [{'name': self._name(), 'year': year} for year in range(self.random.randint(0, 10))],
+            'seasons': [{'name': name, 'month': index * len(months) // 4 + 1, 'day': 1}
+                        for index, name in enumerate(['Spring', 'Summer', 'Autumn', 'Winter'])],
+            'moons': [
+                {'name': self._name(), 'fullmoon': self.random.randint(20, 40), 'offset': self.random.randint(0, 10),
+                 'colour': self.random.choice(['white', 'red', 'blue'])}
+                for _ in range(self.random.randint(1, 4))
+            ],
+            'suffix': 'AE',
+            'has_leap_year': False,
+        })
+
+
+    def _quests(self, data: dict):
+        data.update({
+            'date': f'{self.random.randint(1, 2000)}-1-1',
+            'quest_id': self._one('quests') if self.random.random() < 0.2 else None,
+            'elements': [
+                {'entity_id': 100000 + self._one('characters'), 'role': self.random.choice(['Giver', 'Target', 'Ally']),
+                 'description': self._entry(1)}
+                for _ in range(self.random.randint(2, 10)) if self._ids('characters')
+            ],
+        })
+
+
+    def _events(self, data: dict):
+        data['date'] = f'{self.random.randint(1, 2000)}-1-1'
+
+
+    def _conversations(self, data: dict):
+        data.update({
+            'target': 'members', 'target_id': 1, 'is_closed': 0,
+            'participants': self.random.randint(2, 6), 'messages': self.random.randint(0, 200),
+        })
+
+
+    def _dice(self, data: dict):
+        data.update({
+            'character_id': self._one('characters'),
+            'system': self.random.choice(['d20', 'd100']),
+            'rolls': [{'roll': self.random.randint(1, 20)} for _ in range(self.random.randint(0, 5))],
+        })
+
+
+    def campaign(self) -> dict:
+        """
+        Returns the generated campaign record
+
+        Returns:
+            dict: the campaign
+        """
+        from kankamanager.kankaclient.campaigns import Campaign  # pylint: disable=import-outside-toplevel
+
+        data = {field.name: _default(field, self.campaign_id) for field in fields(Campaign)}
+        data.update({'id': self.campaign_id, 'name': self.name, 'entry_parsed': self._entry(), 'visibility': 'private'})
+        return data
+
+
+    def generate(self) -> dict:
+        """
+        Generates the entities of every type, references before the entities using them
+
+        Returns:
+            dict: the generated entities of each type
+        """
+        for entity in sorted(self.counts, key=lambda entity: list(RATIOS).index(entity) if entity in RATIOS else len(RATIOS)):
+            self.entities[entity] = list()
+            self.ids[entity] = list()
+            for _ in range(self.counts.get(entity)):
+                data = self.entity(entity)
+                self.entities[entity].append(data)
+                self.ids[entity].append(data.get('id'))
+
+        return self.entities
+
+
+    def fixture(self) -> dict:
+        """
+        Returns the generated campaign in the stub server layout
+
+        Returns:
+            dict: the campaign, its members and entities by endpoint
+        """
+        entities = self.entities or self.generate()
+        return {
+            'campaign': self.campaign(),
+            'members': [{'id': 1, 'name': 'Owner', 'avatar': None}],
+            'entities': {self.classes.get(entity)[0]: generated for entity, generated in entities.items()},
+        }
+
+
+    def write(self, campaign_dir: str, sharded: bool=False) -> list:
+        """
+        Writes the generated entities as a pulled campaign_dir
+
+        Args:
+            campaign_dir (str): the campaign directory
+            sharded (bool, optional): one file per entity instead of one per type. Defaults to False.
+
+        Returns:
+            list: the written entity types
+        """
+        # pylint: disable=import-outside-toplevel
+        from src.kankamanager.utilities import clean, write_data
+        from src.kankamanager.store import ShardedStore
+
+        entities = self.entities or self.generate()
+        os.makedirs(campaign_dir, exist_ok=True)
+        for entity, generated in entities.items():
+            data = [clean(_entity) for _entity in generated]
+            if sharded:
+                ShardedStore(campaign_dir, entity).write(data)
+            else:
+                write_data(os.path.join(campaign_dir, f'{entity}.yaml'), data)
+
+        return list(entities)
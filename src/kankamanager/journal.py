@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Checkpoint journal of the pull and push jobs, to resume them after a failure"""
+# ---------------------------------------------------------------------------
+import os
+import json
+import threading
+from src.kankamanager.utilities import get_logger
+from kankaclient.constants import JOURNAL_DIR
+# ---------------------------------------------------------------------------
+
+LOGGER = get_logger()
+
+
+class Journal(object):
+    """
+    Append-only journal of a job's progress, one JSON record per line
+
+    A pull records every fetched page with the url of the next one, a push
+    every entity it sent, and both record each entity type they complete. The
+    journal is removed once the job succeeds; a failed job leaves it behind for
+    --resume, which replays it instead of redoing the finished work.
+
+    Journaling the pages is a deliberate tradeoff: a pull writes the fetched
+    entities to disk twice (journal, then the campaign_dir files) so a resume
+    never fetches them again, Kanka's rate limit being far costlier than the
+    disk. The pages are only kept in memory when read back by --resume.
+    """
+
+    def __init__(self, campaign_dir: str, job: str, resume: bool=False):
+        """
+        Journal Constructor
+
+        Args:
+            campaign_dir (str): the campaign directory
+            job (str): the job name, e.g. pull or push
+            resume (bool, optional): continue the journal of a failed run instead of starting over. Defaults to False.
+        """
+        self.path = os.path.join(campaign_dir, JOURNAL_DIR, f'{job}.ndjson')
+        self.lock = threading.Lock()
+        self.offset = 0
+        self.records = self._read() if resume else list()
+        if resume and self.records:
+            LOGGER.debug('Resuming %s from %s checkpoints', job, len(self.records))
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if resume and os.path.isfile(self.path):
+            # Drop a record cut short by the interrupted run, the next one would be appended to its line
+            os.truncate(self.path, self.offset)
+        self.file = open(self.path, 'a' if resume else 'w')
+
+
+    def _read(self) -> list:
+        records = list()
+        if not os.path.isfile(self.path):
+            return records
+
+        with open(self.path, 'rb') as journal:
+            for line in journal:
+                # The last record of an interrupted run may be cut short
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                self.offset += len(line)
+
+        return records
+
+
+    def _append(self, record: dict):
+        with self.lock:
+            # The caller holds the page data already, the records only need it when read back
+            self.records.append({field: value for field, value in record.items() if field != 'data'})
+            self.file.write(json.dumps(record, separators=(',', ':')) + '\n')
+            self.file.flush()
+
+
+    def page(self, entity: str, data: list, next: str):
+        """Records a fetched page of entities and the url of the next page"""
+        self._append({'record': 'page', 'entity': entity, 'data': data, 'next': next})
+
+
+    def pushed(self, entity: str, key):
+        """Records an entity sent to Kanka, keyed by its id or position"""
+        self._append({'record': 'push', 'entity': entity, 'key': key})
+
+
+    def finish(self, entity: str):
+        """Records a completed entity type"""
+        self._append({'record': 'done', 'entity': entity})
+
+
+    def finished(self, entity: str) -> bool:
+        """
+        Checks whether an entity type was completed
+
+        Args:
+            entity (str): the entity type
+
+        Returns:
+            bool: whether the entity type is done
+        """
+        return any(record.get('record') == 'done' and record.get('entity') == entity for record in self.records)
+
+
+    def pages(self, entity: str) -> tuple:
+        """
+        Returns the checkpointed pages of an entity type
+
+        Args:
+            entity (str): the entity type
+
+        Returns:
+            tuple: the fetched entities, the url of the next page and whether a page was recorded
+        """
+        data = list()
+        next = None
+        started = False
+        for record in self.records:
+            if record.get('record') == 'page' and record.get('entity') == entity:
+                data.extend(record.get('data'))
+                next = record.get('next')
+                started = True
+
+        return data, next, started
+
+
+    def sent(self, entity: str) -> set:
+        """
+        Returns the keys of the entities of a type already sent to Kanka
+
+        Args:
+            entity (str): the entity type
+
+        Returns:
+            set: the sent keys
+        """
+        return {record.get('key') for record in self.records if record.get('record') == 'push' and record.get('entity') == entity}
+
+
+    def close(self, success: bool):
+        """
+        Closes the journal, removing it when the job succeeded
+
+        Args:
+            success (bool): whether the job succeeded
+        """
+        self.file.close()
+        if success:
+            os.remove(self.path)
+        else:
+            LOGGER.error('Progress saved to %s, run again with --resume to continue', self.path)
@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -35,6 +33,9 @@ class AbilityAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'abilities'
+    CACHE = 'abilities'
+    DATA_CLASS = Ability
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -43,10 +44,8 @@ class AbilityAPI(BaseManager):
         self.campaign_id = campaign.id
         self.abilities = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/abilities'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/abilities/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/abilities'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/abilities/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -65,7 +64,7 @@ class AbilityAPI(BaseManager):
         if self.abilities:
             return self.abilities
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -79,7 +78,7 @@ class AbilityAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.abilities = [
-                from_dict(data_class=Ability, data=ability) for ability in json.loads(response.text).get("data")
+                self._decode(ability) for ability in json.loads(response.text).get("data")
             ]
 
         return self.abilities
@@ -131,7 +130,7 @@ class AbilityAPI(BaseManager):
         Returns:
             ability: the requested ability
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -146,7 +145,7 @@ class AbilityAPI(BaseManager):
         ability = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Ability, data=ability)
+        return self._decode(ability)
 
 
     def create(self, ability: dict) -> Ability:
@@ -163,7 +162,7 @@ class AbilityAPI(BaseManager):
             ability: the created ability
         """
         response = self._request(
-            url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(ability)
+            url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(ability)
         )
 
         if not response.ok:
@@ -179,7 +178,7 @@ class AbilityAPI(BaseManager):
         ability = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Ability, data=ability)
+        return self._decode(ability)
 
 
     def update(self, ability: dict) -> dict:
@@ -195,7 +194,7 @@ class AbilityAPI(BaseManager):
         Returns:
             ability: the updated ability
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % ability.get('id'), request=PUT, data=json.dumps(ability))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % ability.get('id'), request=PUT, data=json.dumps(ability))
 
         if not response.ok:
             self.logger.error('Failed to update ability %s in campaign %s', ability.get('name', 'None'), self.campaign.get('name'))
@@ -220,7 +219,7 @@ class AbilityAPI(BaseManager):
         Returns:
             bool: whether the ability is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete ability %s in campaign %s', id, self.campaign.get('name'))
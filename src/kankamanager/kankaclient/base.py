@@ -5,24 +5,170 @@ Base Manager
 # pylint: disable=bare-except,super-init-not-called,no-else-break
 from __future__ import absolute_import
 
+import gzip
 import logging
+import json
 import time
+import threading
 import requests
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import Future
 from typing import Callable, Any, Optional
-from dataclasses import dataclass, asdict
+from urllib.parse import urlsplit
+from dataclasses import dataclass, asdict, fields as dataclass_fields
 
-from kankamanager.kankaclient.constants import MAX_ATTEMPTS, GET, PATCH, POST, DELETE, PUT, DEFAULT_REMOVE
+from dacite import from_dict
+
+from kankamanager.kankaclient.metrics import METRICS, endpoint
+
+from kankamanager.kankaclient.constants import (
+    BASE_URL, MAX_ATTEMPTS, GET, PATCH, POST, DELETE, PUT, DEFAULT_REMOVE, LAZY_FIELDS, THROTTLE_INTERVAL, RETRY_DELAY,
+    COMPRESS_MIN_BYTES
+)
+
+
+def wire_bytes(response) -> int:
+    """
+    Returns the bytes a response took on the wire, before decompression
+
+    Args:
+        response (Response): the request response
+
+    Returns:
+        int: the received body bytes
+    """
+    raw = getattr(response, 'raw', None)
+    if raw is not None and hasattr(raw, 'tell'):
+        try:
+            return raw.tell()
+        except (OSError, ValueError):
+            pass
+    return len(response.content or b'')
+
+
+def retry_after(headers) -> float:
+    """
+    Returns the seconds to back off after a 429, from its Retry-After header
+
+    Args:
+        headers (dict): the response headers
+
+    Returns:
+        float: the delay in seconds (a number or an HTTP date), RETRY_DELAY when missing or invalid
+    """
+    value = (headers.get('Retry-After') or '').strip()
+    if not value:
+        return RETRY_DELAY
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return RETRY_DELAY
+        # HTTP dates are GMT, even when the zone is left out
+        delay = (date if date.tzinfo else date.replace(tzinfo=timezone.utc)).timestamp() - time.time()
+
+    return max(delay, 0.0) if delay == delay and delay != float('inf') else RETRY_DELAY
+
+
+class RateLimiter(object):
+    """Spaces requests at least `interval` seconds apart across every manager and thread"""
+
+    def __init__(self, interval: float=THROTTLE_INTERVAL):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next = 0.0
+
+
+    def wait(self):
+        """Blocks until the next request slot"""
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next - now
+            self.next = max(now, self.next) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+class SingleFlight(object):
+    """Runs one call per key at a time, concurrent callers of a key share its result"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = dict()
+
+
+    def do(self, key, function: Callable, *args, **kwargs) -> Any:
+        """
+        Calls the function, or waits for the in-flight call of the same key
+
+        Args:
+            key (hashable): the call key
+            function (function): the call
+
+        Returns:
+            result: the result of the (shared) call
+        """
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(function(*args, **kwargs))
+        except BaseException as ex:
+            future.set_exception(ex)
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+
+        return future.result()
+
+
+# One connection pool, one rate budget and one set of in-flight GETs shared by every manager.
+# The session advertises every encoding urllib3 decodes (gzip, deflate, br with brotli installed)
+# and decompresses the responses as they stream in.
+SESSION = requests.Session()
+LIMITER = RateLimiter()
+FLIGHT = SingleFlight()
+# Replaces the HTTP calls of the managers created afterwards (e.g. a cassette), see use_transport
+TRANSPORT = None
+# Hosts that refused a gzip request body, sent plain bodies from then on
+PLAIN_BODY_HOSTS = set()
+# Hosts that read gzip request bodies, whose 400/422 are then taken as real validation errors
+GZIP_BODY_HOSTS = set()
+# Serializes the first gzip body sent to a host, until it is known to read them or not
+BODY_PROBE_LOCK = threading.Lock()
+
+
+def use_transport(transport):
+    """
+    Routes the requests of the managers created from now on through a transport
+
+    Args:
+        transport (object): wraps the HTTP calls, transport.wrap(method, send). None restores HTTP.
+    """
+    global TRANSPORT  # pylint: disable=global-statement
+    TRANSPORT = transport
 
 _requests = {
-    GET: requests.get,
-    PATCH: requests.patch,
-    POST: requests.post,
-    DELETE: requests.delete,
-    PUT: requests.put
+    GET: SESSION.get,
+    PATCH: SESSION.patch,
+    POST: SESSION.post,
+    DELETE: SESSION.delete,
+    PUT: SESSION.put
 }
 
 from dataclasses import dataclass
 
+
 @dataclass
 class Entity:
 
@@ -40,6 +186,17 @@ class Entity:
     updated_by: Optional[Any]
 
 
+    def __getattr__(self, name: str):
+        # Only reached for missing attributes, i.e. the lazy fields a lazy manager left out
+        loader = self.__dict__.get('_lazy_loader') if name in LAZY_FIELDS else None
+        if loader is None:
+            raise AttributeError(name)
+
+        value = loader(name)
+        object.__setattr__(self, name, value)
+        return value
+
+
     def _asdict(self):
         """
         Returns the entity as a dictonary
@@ -68,6 +225,12 @@ class Entity:
 
 class BaseManager(object):
     """Base Manager"""
+
+    # The campaign endpoint, the attribute holding the cached entities and the entity dataclass
+    ENDPOINT = None
+    CACHE = None
+    DATA_CLASS = None
+
     def __init__(self, token: str, throttle: bool=False, verbose: bool=False):
         """
         Base Manager Constructor
@@ -84,6 +247,16 @@ class BaseManager(object):
 
         self.headers = {'Authorization': f'Bearer {token}', 'Content-type': 'application/json'}
         self.throttle = throttle
+        self.limiter = LIMITER
+        self.flight = FLIGHT
+        self.metrics = METRICS
+        self.transport = TRANSPORT
+        # Defer the heavy entry fields of decoded entities until they are accessed. Kanka
+        # has no batch read, so the first access costs one by-id request per entity:
+        # dumping N lazy entities whole (asdict, _clean, pull) sends N requests
+        self.lazy = False
+        # Gzip the create/update bodies, for servers accepting Content-Encoding: gzip
+        self.compress = False
 
 
     class KankaException(Exception):
@@ -109,6 +282,12 @@ class BaseManager(object):
         raise self.KankaException(reason, code, message)
 
 
+    def clear_cache(self):
+        """Drops the cached entities, the next get_all fetches them again"""
+        if self.CACHE:
+            setattr(self, self.CACHE, list())
+
+
     def _throttle(self, request: Callable, **kwargs: str) -> dict:
         """
         Wraps the provided request and 
@@ -122,20 +301,37 @@ class BaseManager(object):
         attempt = 0
         max_attemps = MAX_ATTEMPTS
         response = None
+        label = endpoint(kwargs.get('url', ''))
         while attempt < max_attemps:
 
             if self.throttle:
-                time.sleep(1)
-
-            response = request(**kwargs)
+                start = time.perf_counter()
+                self.limiter.wait()
+                self.metrics.observe('limiter_seconds', label, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            with self.metrics.span('fetch'):
+                response = request(**kwargs)
+            self.metrics.observe('request_seconds', label, time.perf_counter() - start)
+            self.metrics.count('requests', label)
+            self.metrics.count('response_bytes', label, len(response.content or b''))
+            self.metrics.count('wire_bytes', label, wire_bytes(response))
 
             # Check if response has been throttled by Kanka API
             if response.status_code != 429:
                 break
 
-            self.logger.debug(f'{response}: Too many requests, trying again')
-            time.sleep(5)
+            # Kanka tells how long to back off, fall back to the default delay otherwise
+            delay = retry_after(response.headers)
+            self.logger.debug(f'{response}: Too many requests, trying again in {delay}s')
+            self.metrics.count('throttled', label)
+            time.sleep(delay)
+            self.metrics.observe('throttle_seconds', label, delay)
             attempt += 1
+            self.metrics.count('retries', label)
+
+        if not response.ok:
+            self.metrics.count('errors', label)
 
         return response
 
@@ -156,6 +352,233 @@ class BaseManager(object):
         if headers is None:
             headers = self.headers
 
-        response = self._throttle(_requests.get(request), url=url, headers=headers, **kwargs)
+        send = _requests.get(request)
+        if self.transport is not None:
+            send = self.transport.wrap(request, send)
+
+        if request != GET:
+            if self._compressible(url, kwargs.get('data')):
+                return self._send_compressed(send, url, headers, **kwargs)
+            return self._throttle(send, url=url, headers=headers, **kwargs)
+
+        # Concurrent identical GETs share one request and its response
+        key = (request, url, headers.get('Authorization'), json.dumps(kwargs, sort_keys=True, default=str))
+        response = self.flight.do(key, self._throttle, send, url=url, headers=headers, **kwargs)
 
         return response
+
+
+    def _compressible(self, url: str, data) -> bool:
+        # Cassettes record and match the plain bodies
+        return (
+            self.compress and self.transport is None and isinstance(data, str) and len(data) >= COMPRESS_MIN_BYTES
+            and urlsplit(url).netloc not in PLAIN_BODY_HOSTS
+        )
+
+
+    def _send_compressed(self, send: Callable, url: str, headers: dict, data: str, **kwargs):
+        """
+        Sends a gzip compressed request body
+
+        A 415 means the server does not read gzip bodies. A server ignoring the
+        Content-Encoding sees an unreadable body instead and answers 400 or 422,
+        which are also Kanka's validation errors. The first gzip body sent to a
+        host probes it, one request at a time: a 400 or 422 is sent again with a
+        plain body, and the host gets plain bodies from then on when that one
+        is accepted. A success, or the plain body failing the same way, marks
+        the host as reading gzip bodies, whose 400/422 are returned as is.
+
+        Returns:
+            response: the request response
+        """
+        host = urlsplit(url).netloc
+        if host in GZIP_BODY_HOSTS:
+            return self._send_gzip(send, url, headers, data, **kwargs)
+
+        with BODY_PROBE_LOCK:
+            if host in PLAIN_BODY_HOSTS:
+                return self._throttle(send, url=url, headers=headers, data=data, **kwargs)
+            if host in GZIP_BODY_HOSTS:
+                return self._send_gzip(send, url, headers, data, **kwargs)
+
+            response = self._send_gzip(send, url, headers, data, **kwargs)
+            if response.ok:
+                GZIP_BODY_HOSTS.add(host)
+            if response.status_code not in (400, 422):
+                return response
+
+            plain = self._throttle(send, url=url, headers=headers, data=data, **kwargs)
+            if plain.ok:
+                self.logger.debug('%s ignored a gzip body, sending plain bodies', host)
+                PLAIN_BODY_HOSTS.add(host)
+            elif plain.status_code == response.status_code:
+                GZIP_BODY_HOSTS.add(host)
+            return plain
+
+
+    def _send_gzip(self, send: Callable, url: str, headers: dict, data: str, **kwargs):
+        """
+        Sends a gzip compressed request body, and a plain one when the server
+        answers 415
+
+        Returns:
+            response: the request response
+        """
+        body = gzip.compress(data.encode('utf-8'))
+        response = self._throttle(send, url=url, headers=dict(headers, **{'Content-Encoding': 'gzip'}), data=body, **kwargs)
+        self.metrics.count('body_bytes', endpoint(url), len(data))
+        self.metrics.count('body_wire_bytes', endpoint(url), len(body))
+        if response.status_code != 415:
+            return response
+
+        host = urlsplit(url).netloc
+        self.logger.debug('%s refused a gzip body, sending plain bodies', host)
+        PLAIN_BODY_HOSTS.add(host)
+        GZIP_BODY_HOSTS.discard(host)
+        return self._throttle(send, url=url, headers=headers, data=data, **kwargs)
+
+
+    def _decode(self, data: dict, fields: list=None):
+        """
+        Decodes a raw entity into the manager's dataclass
+
+        With a projection only the requested fields are kept (as a dict) and the
+        rest of the entity, including the large entry HTML, is never decoded.
+
+        Args:
+            data (dict): the raw entity
+            fields (list, optional): the fields to keep. Defaults to the whole entity.
+
+        Returns:
+            entity: the decoded entity
+        """
+        if fields:
+            return {field: data.get(field) for field in fields}
+        if self.DATA_CLASS is None:
+            return data
+        if not self.lazy or not issubclass(self.DATA_CLASS, Entity):
+            start = time.perf_counter()
+            with self.metrics.span('decode'):
+                entity = from_dict(data_class=self.DATA_CLASS, data=data)
+            self.metrics.observe('decode_seconds', self.ENDPOINT or 'campaigns', time.perf_counter() - start)
+            return entity
+
+        start = time.perf_counter()
+        lazy = [field.name for field in dataclass_fields(self.DATA_CLASS) if field.name in LAZY_FIELDS]
+        with self.metrics.span('decode'):
+            entity = from_dict(data_class=self.DATA_CLASS, data={k: v for k, v in data.items() if k not in lazy})
+        self.metrics.observe('decode_seconds', self.ENDPOINT or 'campaigns', time.perf_counter() - start)
+        for field in lazy:
+            object.__delattr__(entity, field)
+        object.__setattr__(entity, '_lazy_loader', self._lazy_loader(entity.id))
+
+        return entity
+
+
+    def _lazy_loader(self, id: int) -> Callable:
+        """
+        Returns the loader of the lazy fields of an entity, fetching the entity
+        by id once for all of its lazy fields
+
+        Args:
+            id (int): the entity id
+
+        Returns:
+            function: the field loader
+        """
+        loaded = dict()
+
+        def load(field: str) -> Any:
+            if not loaded:
+                response = self._request(url=BASE_URL + f'/{self.campaign.id}/{self.ENDPOINT}/{id}', request=GET)
+
+                if not response.ok:
+                    self.logger.error('Failed to load %s of %s %s', field, self.ENDPOINT, id)
+                    raise self.KankaException(response.text, response.status_code, message=response.reason)
+
+                data = json.loads(response.text).get('data')
+                loaded.update({field: data.get(field) for field in LAZY_FIELDS})
+
+            return loaded.pop(field, None)
+
+        return load
+
+
+    def _page(self, url: str) -> dict:
+        response = self._request(url=url, request=GET)
+
+        if not response.ok:
+            self.logger.error('Failed to retrieve %s', url)
+            raise self.KankaException(response.text, response.status_code, message=response.reason)
+
+        return json.loads(response.text)
+
+
+    def _paginate(self, url: str):
+        """
+        Streams the entities of a paginated endpoint, one page request at a time
+
+        Args:
+            url (str): the endpoint url
+
+        Raises:
+            KankaException: Kanka Api Interface Exception
+
+        Yields:
+            dict: the next entity
+        """
+        while url:
+            page = self._page(url)
+            yield from page.get('data') or []
+            url = (page.get('links') or {}).get('next')
+
+
+    def iter_pages(self, url: str=None):
+        """
+        Streams the decoded entities page by page, with the url of the next page
+
+        Args:
+            url (str, optional): the page to start from, e.g. a checkpointed next page. Defaults to the first page.
+
+        Raises:
+            KankaException: Kanka Api Interface Exception
+
+        Yields:
+            tuple: the entities of the page and the next page url, None after the last page
+        """
+        cached = getattr(self, self.CACHE) if self.CACHE else None
+        if cached and url is None:
+            yield list(cached), None
+            return
+
+        url = url or BASE_URL + f'/{self.campaign.id}/{self.ENDPOINT}'
+        while url:
+            page = self._page(url)
+            url = (page.get('links') or {}).get('next')
+            yield [self._decode(data) for data in page.get('data') or []], url
+
+
+    def iter_all(self, fields: list=None):
+        """
+        Streams the available entities from Kanka as the pages arrive, without
+        holding the complete result (the cache is used when already filled)
+
+        Args:
+            fields (list, optional): only decode and keep these fields. Defaults to the whole entity.
+
+        Raises:
+            KankaException: Kanka Api Interface Exception
+
+        Yields:
+            entity: the next entity
+        """
+        cached = getattr(self, self.CACHE) if self.CACHE else None
+        if cached or self.ENDPOINT is None:
+            for entity in cached or self.get_all():
+                if fields and not isinstance(entity, dict):
+                    entity = {field: getattr(entity, field, None) for field in fields}
+                yield self._decode(entity, fields) if fields else entity
+            return
+
+        for data in self._paginate(BASE_URL + f'/{self.campaign.id}/{self.ENDPOINT}'):
+            yield self._decode(data, fields)
@@ -0,0 +1,266 @@
+"""
+Kanka Bulk Create
+
+Creates many entities at once. Kanka has no batch create route, so the
+entities are split in chunks created concurrently, one POST each, every request
+going through the managers' rate limiter and 429 handling. References given by
+name (e.g. a character's races or location_id) are resolved to the ids of the
+campaign's entities, including the ones created earlier in the same run.
+
+"""
+from __future__ import absolute_import
+
+import logging
+import threading
+from itertools import chain
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from kankamanager.kankaclient.constants import BULK_CHUNK_SIZE, MAX_WORKERS
+
+# The entity type referenced by each reference field
+REFERENCES = {
+    'tags': 'tags',
+    'tag_id': 'tags',
+    'races': 'races',
+    'race_id': 'races',
+    'families': 'families',
+    'location_id': 'locations',
+    'parent_location_id': 'locations',
+    'item_id': 'items',
+    'quest_id': 'quests',
+    'character_id': 'characters',
+}
+
+
+def _value(entity, field: str):
+    return entity.get(field) if isinstance(entity, dict) else getattr(entity, field, None)
+
+
+def dependencies(entity: str, items: list) -> set:
+    """
+    Returns the other entity types the provided entities reference
+
+    Args:
+        entity (str): the entity type
+        items (list): the entities
+
+    Returns:
+        set: the referenced entity types
+    """
+    return {
+        REFERENCES.get(field) for item in items for field in item
+        if field in REFERENCES and item.get(field) not in (None, [])
+    } - {entity}
+
+
+class BulkCreator(object):
+    """
+    Creates lists of entities in concurrent chunks, resolving references by name
+
+    Entities failing to create are logged and kept in failed, the others are
+    still created.
+    """
+
+    def __init__(self, client, chunk_size: int=BULK_CHUNK_SIZE, max_workers: int=MAX_WORKERS):
+        """
+        Bulk Creator Constructor
+
+        Args:
+            client (KankaClient): the client of the campaign
+            chunk_size (int, optional): the entities created one after the other by a worker. Defaults to BULK_CHUNK_SIZE.
+            max_workers (int, optional): the chunks created at once. Defaults to MAX_WORKERS.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.names = dict()
+        self.fetched = set()
+        self.failed = list()
+
+
+    def known(self, entity: str) -> dict:
+        """
+        Returns the ids of the campaign's entities of a type by name, fetched on first use
+
+        Args:
+            entity (str): the entity type
+
+        Returns:
+            dict: the entity ids by name
+        """
+        with self.lock:
+            if entity in self.fetched:
+                return self.names.get(entity)
+
+        fetched = self.client.iter_all(entity, fields=['id', 'name'])
+        fetched = {_value(_entity, 'name'): _value(_entity, 'id') for _entity in fetched}
+        with self.lock:
+            names = self.names.setdefault(entity, dict())
+            for name, id in fetched.items():
+                names.setdefault(name, id)
+            self.fetched.add(entity)
+            return names
+
+
+    def register(self, entity: str, created):
+        """Makes a created entity referenceable by name"""
+        with self.lock:
+            self.names.setdefault(entity, dict())[_value(created, 'name')] = _value(created, 'id')
+
+
+    def reference(self, entity: str, value):
+        """
+        Returns the id of a referenced entity, ids are kept as they are
+
+        Args:
+            entity (str): the referenced entity type
+            value (str or int): the name or id of the referenced entity
+
+        Raises:
+            KankaException: the referenced entity does not exist
+
+        Returns:
+            int: the entity id
+        """
+        if not isinstance(value, str):
+            return value
+
+        id = self.known(entity).get(value)
+        if id is None:
+            manager = self.client.entities[entity]
+            raise manager.KankaException(reason=f'{entity} not found: {value}', code=404, message='Not Found')
+        return id
+
+
+    def resolve(self, data: dict) -> dict:
+        """
+        Replaces the references given by name with the entity ids
+
+        Args:
+            data (dict): the entity
+
+        Returns:
+            dict: the entity referencing ids only
+        """
+        resolved = dict(data)
+        for field, entity in REFERENCES.items():
+            value = resolved.get(field)
+            if isinstance(value, list):
+                resolved[field] = [self.reference(entity, item) for item in value]
+            elif value is not None:
+                resolved[field] = self.reference(entity, value)
+
+        return resolved
+
+
+    def _create_chunk(self, entity: str, chunk: list) -> list:
+        manager = self.client.entities[entity]
+        created = list()
+        for data in chunk:
+            try:
+                result = manager.create(self.resolve(data))
+            except Exception as ex:  # pylint: disable=broad-except
+                self.logger.error('Failed to create %s %s', entity, data.get('name'))
+                self.logger.debug(ex)
+                with self.lock:
+                    self.failed.append((entity, data, ex))
+                continue
+
+            self.register(entity, result)
+            created.append(result)
+
+        return created
+
+
+    @staticmethod
+    def waves(entity: str, items: list) -> list:
+        """
+        Splits entities of one type so that each only references, by name, same type entities of the earlier waves
+
+        Args:
+            entity (str): the entity type
+            items (list): the entities
+
+        Returns:
+            list: the entities of each wave
+        """
+        names = {item.get('name') for item in items if item.get('name') is not None}
+        fields = [field for field, referenced in REFERENCES.items() if referenced == entity]
+        needs = list()
+        # The entities waiting on each name, to place them in linear time
+        dependents = defaultdict(list)
+        for index, item in enumerate(items):
+            values = chain.from_iterable(item.get(field) if isinstance(item.get(field), list) else [item.get(field)] for field in fields)
+            needs.append({value for value in values if isinstance(value, str) and value in names and value != item.get('name')})
+            for name in needs[index]:
+                dependents[name].append(index)
+
+        waves = list()
+        placed = set()
+        missing = [len(need) for need in needs]
+        wave = [index for index in range(len(items)) if not missing[index]]
+        pending = set(range(len(items)))
+        while pending:
+            # Reference cycles within the type fall back to a single wave
+            wave = wave or sorted(pending)
+            waves.append([items[index] for index in wave])
+            pending.difference_update(wave)
+            ready = list()
+            for name in {items[index].get('name') for index in wave} - placed:
+                placed.add(name)
+                for index in dependents.get(name, ()):
+                    missing[index] -= 1
+                    if not missing[index] and index in pending:
+                        ready.append(index)
+            wave = sorted(ready)
+
+        return waves
+
+
+    def create(self, entity: str, items: list) -> list:
+        """
+        Creates the provided entities of one type, chunks running concurrently
+
+        Entities referencing others of the same type by name (e.g. a location's
+        parent_location_id) are created in a later wave than those.
+
+        Args:
+            entity (str): the entity type
+            items (list): the entities to create
+
+        Returns:
+            list: the created entities
+        """
+        created = list()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for wave in self.waves(entity, items):
+                chunks = [wave[index:index + self.chunk_size] for index in range(0, len(wave), self.chunk_size)]
+                created.extend(chain.from_iterable(executor.map(lambda chunk: self._create_chunk(entity, chunk), chunks)))
+
+        self.logger.debug('Created %s of %s %s', len(created), len(items), entity)
+        return created
+
+
+    def run(self, batches: dict) -> dict:
+        """
+        Creates the entities of several types, the referenced types first
+
+        Args:
+            batches (dict): the entities to create of each type
+
+        Returns:
+            dict: the created entities of each type
+        """
+        pending = {entity: dependencies(entity, items) for entity, items in batches.items()}
+        created = dict()
+        while pending:
+            # Reference cycles between types fall back to the provided order
+            ready = [entity for entity, needs in pending.items() if not needs & set(pending)] or [next(iter(pending))]
+            for entity in ready:
+                created[entity] = self.create(entity, batches.get(entity))
+                del pending[entity]
+
+        return created
@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -44,6 +42,9 @@ class CalendarAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'calendars'
+    CACHE = 'calendars'
+    DATA_CLASS = Calendar
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -52,10 +53,8 @@ class CalendarAPI(BaseManager):
         self.campaign_id = campaign.id
         self.calendars = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/calendars'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/calendars/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/calendars'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/calendars/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -74,7 +73,7 @@ class CalendarAPI(BaseManager):
         if self.calendars:
             return self.calendars
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -88,7 +87,7 @@ class CalendarAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.calendars = [
-                from_dict(data_class=Calendar, data=calendar) for calendar in json.loads(response.text).get("data")
+                self._decode(calendar) for calendar in json.loads(response.text).get("data")
             ]
 
         return self.calendars
@@ -140,7 +139,7 @@ class CalendarAPI(BaseManager):
         Returns:
             calendar: the requested calendar
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -155,7 +154,7 @@ class CalendarAPI(BaseManager):
         calendar = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Calendar, data=calendar)
+        return self._decode(calendar)
 
 
     def create(self, calendar: dict) -> Calendar:
@@ -172,7 +171,7 @@ class CalendarAPI(BaseManager):
             calendar: the created calendar
         """
         response = self._request(
-            url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(calendar)
+            url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(calendar)
         )
 
         if not response.ok:
@@ -188,7 +187,7 @@ class CalendarAPI(BaseManager):
         calendar = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Calendar, data=calendar)
+        return self._decode(calendar)
 
 
     def update(self, calendar: Calendar or dict) -> dict:
@@ -204,11 +203,11 @@ class CalendarAPI(BaseManager):
         Returns:
             calendar: the updated calendar
         """
-        if isinstance(calendar, calendar):
+        if isinstance(calendar, Calendar):
             calendar = calendar._asdict()
 
         response = self._request(
-            url=GET_UPDATE_DELETE_SINGLE % calendar.get("id"),
+            url=self.GET_UPDATE_DELETE_SINGLE % calendar.get("id"),
             request=PUT,
             data=json.dumps(calendar),
         )
@@ -242,7 +241,7 @@ class CalendarAPI(BaseManager):
         Returns:
             bool: whether the calendar is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete calendar %s in campaign %s', id, self.campaign.get('name'))
@@ -50,6 +50,8 @@ class CampaignAPI(BaseManager):
     GET_ALL = BASE_URL
     GET_SINGLE: str
     GET_MEMBERS: str
+    CACHE = 'campaigns'
+    DATA_CLASS = Campaign
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -58,18 +60,23 @@ class CampaignAPI(BaseManager):
         self.members = list()
         self.member_map = dict()
 
-        self.campaign = self.get(campaign)
-        campaign_id = self.campaign.id
-
-        global GET_SINGLE
-        global GET_MEMBERS
-        GET_SINGLE = BASE_URL + f'/{campaign_id}'
-        GET_MEMBERS = BASE_URL + f'/{campaign_id}/users'
+        # A resolved campaign (e.g. from a snapshot) skips the lookup, None only lists the campaigns
+        self.campaign = campaign if isinstance(campaign, Campaign) or campaign is None else self.get(campaign)
+        if self.campaign is not None:
+            self.GET_SINGLE = BASE_URL + f'/{self.campaign.id}'
+            self.GET_MEMBERS = BASE_URL + f'/{self.campaign.id}/users'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
 
 
+    def clear_cache(self):
+        """Drops the cached campaign listing and members, the resolved campaign is kept"""
+        super().clear_cache()
+        self.members = list()
+        self.member_map = dict()
+
+
     def get_all(self) -> list:
         """
         Retrieves the available campaigns from Kanka
@@ -92,7 +99,7 @@ class CampaignAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.campaigns = [
-                from_dict(data_class=Campaign, data=campaign) for campaign in json.loads(response.text).get("data")
+                self._decode(campaign) for campaign in json.loads(response.text).get("data")
             ]
 
         return self.campaigns
@@ -140,7 +147,7 @@ class CampaignAPI(BaseManager):
         Returns:
             campaign: the requested campaign
         """
-        response = self._request(url=GET_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_ALL + f'/{id}', request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -154,7 +161,7 @@ class CampaignAPI(BaseManager):
         campaign = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Campaign, data=campaign)
+        return self._decode(campaign)
 
 
     def get_members(self) -> list:
@@ -170,7 +177,7 @@ class CampaignAPI(BaseManager):
         if self.members:
             return self.members
 
-        response = self._request(url=GET_MEMBERS, request=GET)
+        response = self._request(url=self.GET_MEMBERS, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve members from campaign: ', self.campaign.name)
@@ -0,0 +1,220 @@
+"""
+Kanka Cassette
+
+Record/replay transport for the managers' HTTP requests. Recording keeps the
+responses of the real requests and writes them to a gzip compressed JSON
+cassette; replaying serves them back without the network, optionally with a
+simulated latency and Kanka's per-minute rate limit.
+
+"""
+from __future__ import absolute_import
+
+import gzip
+import json
+import time
+import atexit
+import threading
+from collections import deque
+from typing import Callable
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from kankamanager.kankaclient import base
+from kankamanager.kankaclient.constants import CASSETTE_FORMAT, CASSETTE_VERSION
+
+# Response headers kept in the cassette
+HEADERS = ['Content-Type', 'Retry-After', 'X-RateLimit-Limit', 'X-RateLimit-Remaining']
+
+
+class CassetteError(Exception):
+    """Raised when a replayed request was not recorded"""
+
+
+def _body(data):
+    """Returns a request body as text, gzip compressed bodies decompressed"""
+    if isinstance(data, bytes):
+        if data[:2] == b'\x1f\x8b':
+            data = gzip.decompress(data)
+        data = data.decode('utf-8')
+    return data
+
+
+def _key(method: str, url: str, data=None, ignore: list=None) -> str:
+    data = _body(data)
+    if ignore and data is not None:
+        if '*' in ignore:
+            data = None
+        else:
+            try:
+                body = json.loads(data)
+            except ValueError:
+                body = None
+            if isinstance(body, dict):
+                data = json.dumps({field: value for field, value in body.items() if field not in ignore}, sort_keys=True)
+    return json.dumps([method, url, data])
+
+
+def _response(url: str, status_code: int, reason: str, headers: dict, body: str) -> Response:
+    """Builds a requests Response out of a recorded response"""
+    response = Response()
+    response.url = url
+    response.status_code = status_code
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = 'utf-8'
+    response._content = body.encode('utf-8')  # pylint: disable=protected-access
+    return response
+
+
+class Cassette(object):
+    """
+    Records or replays the managers' requests
+
+    Interactions are matched on method, url and body. Body fields that change
+    from run to run (e.g. generated names) can be left out of the match with
+    `ignore`, '*' ignoring the whole body. A request made several times is
+    answered with its recorded responses in order, the last one being repeated.
+    Request headers (and so the API token) are never recorded.
+    """
+
+    def __init__(self, path: str, record: bool=False, latency: float=0.0, rate_limit: int=0, ignore: list=None):
+        """
+        Cassette Constructor
+
+        Args:
+            path (str): the cassette file
+            record (bool, optional): record real requests instead of replaying. Defaults to False.
+            latency (float, optional): seconds added to every replayed request. Defaults to 0.
+            rate_limit (int, optional): replayed requests allowed per minute, 0 for no limit. Defaults to 0.
+            ignore (list, optional): JSON body fields left out of the match, '*' for the whole body. Defaults to None.
+        """
+        self.path = path
+        self.record = record
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.ignore = ignore
+        self.lock = threading.Lock()
+        self.interactions = list()
+        self.replays = dict()
+        self.window = deque()
+
+        if not record:
+            self.load()
+
+
+    def load(self):
+        """Loads the recorded interactions"""
+        with gzip.open(self.path, 'rt', encoding='utf-8') as cassette:
+            data = json.load(cassette)
+
+        if data.get('format') != CASSETTE_FORMAT or data.get('version') != CASSETTE_VERSION:
+            raise CassetteError(f'Unsupported cassette: {self.path}')
+
+        self.interactions = data.get('interactions')
+        self.replays = dict()
+        for interaction in self.interactions:
+            request = interaction.get('request')
+            key = _key(request.get('method'), request.get('url'), request.get('data'), self.ignore)
+            self.replays.setdefault(key, deque()).append(interaction.get('response'))
+
+
+    def save(self):
+        """Writes the recorded interactions"""
+        with self.lock:
+            data = {'format': CASSETTE_FORMAT, 'version': CASSETTE_VERSION, 'interactions': list(self.interactions)}
+        with gzip.open(self.path, 'wt', encoding='utf-8') as cassette:
+            json.dump(data, cassette, separators=(',', ':'))
+
+
+    def wrap(self, method: str, send: Callable) -> Callable:
+        """
+        Wraps the HTTP call of a request method
+
+        Args:
+            method (str): the request method
+            send (function): the real HTTP call, send(url=..., headers=..., **kwargs)
+
+        Returns:
+            function: the recording or replaying call
+        """
+        def call(url: str, headers: dict=None, **kwargs) -> Response:
+            if self.record:
+                return self._record(method, send, url, headers, **kwargs)
+            return self._replay(method, url, kwargs.get('data'))
+
+        return call
+
+
+    def _record(self, method: str, send: Callable, url: str, headers: dict, **kwargs) -> Response:
+        response = send(url=url, headers=headers, **kwargs)
+        data = kwargs.get('data')
+        with self.lock:
+            self.interactions.append({
+                'request': {'method': method, 'url': url, 'data': _body(data)},
+                'response': {
+                    'status_code': response.status_code,
+                    'reason': response.reason,
+                    'headers': {name: response.headers[name] for name in HEADERS if name in response.headers},
+                    'body': response.text,
+                },
+            })
+
+        return response
+
+
+    def _throttled(self) -> float:
+        """Returns the seconds to wait when the simulated rate limit is exceeded, else 0"""
+        if not self.rate_limit:
+            return 0.0
+
+        now = time.monotonic()
+        while self.window and now - self.window[0] >= 60:
+            self.window.popleft()
+        if len(self.window) >= self.rate_limit:
+            return 60 - (now - self.window[0])
+
+        self.window.append(now)
+        return 0.0
+
+
+    def _replay(self, method: str, url: str, data=None) -> Response:
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self.lock:
+            retry_after = self._throttled()
+            if retry_after:
+                headers = {'Content-Type': 'application/json', 'Retry-After': f'{retry_after:.3f}'}
+                return _response(url, 429, 'Too Many Requests', headers, '{"message": "Too Many Attempts."}')
+
+            responses = self.replays.get(_key(method, url, data, self.ignore))
+            if not responses:
+                raise CassetteError(f'Request not recorded: {method} {url}')
+            recorded = responses.popleft() if len(responses) > 1 else responses[0]
+
+        return _response(url, recorded.get('status_code'), recorded.get('reason'), recorded.get('headers'), recorded.get('body'))
+
+
+def use_cassette(path: str, record: bool=False, **kwargs) -> Cassette:
+    """
+    Routes the requests of the managers created from now on through a cassette,
+    keeping the installed one when it is the same. Recordings are written at exit.
+
+    Args:
+        path (str): the cassette file
+        record (bool, optional): record real requests instead of replaying. Defaults to False.
+
+    Returns:
+        Cassette: the installed cassette
+    """
+    current = base.TRANSPORT
+    if isinstance(current, Cassette) and current.path == path and current.record == record and current.ignore == kwargs.get('ignore'):
+        return current
+
+    cassette = Cassette(path, record=record, **kwargs)
+    if record:
+        atexit.register(cassette.save)
+    base.use_transport(cassette)
+
+    return cassette
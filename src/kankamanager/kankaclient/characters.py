@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -42,6 +40,9 @@ class CharacterAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'characters'
+    CACHE = 'characters'
+    DATA_CLASS = Character
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -49,10 +50,8 @@ class CharacterAPI(BaseManager):
         self.campaign = campaign
         self.characters = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f"/{self.campaign.id}/characters"
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f"/{self.campaign.id}/characters/%s"
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f"/{self.campaign.id}/characters"
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f"/{self.campaign.id}/characters/%s"
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -71,7 +70,7 @@ class CharacterAPI(BaseManager):
         if self.characters:
             return self.characters
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -85,7 +84,7 @@ class CharacterAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.characters = [
-                from_dict(data_class=Character, data=character) for character in json.loads(response.text).get("data")
+                self._decode(character) for character in json.loads(response.text).get("data")
             ]
 
         return self.characters
@@ -137,7 +136,7 @@ class CharacterAPI(BaseManager):
         Returns:
             character: the requested character
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -152,7 +151,7 @@ class CharacterAPI(BaseManager):
         character = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Character, data=character)
+        return self._decode(character)
 
 
     def create(self, character: dict) -> Character:
@@ -169,7 +168,7 @@ class CharacterAPI(BaseManager):
             character: the created character
         """
         response = self._request(
-            url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(character)
+            url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(character)
         )
 
         if not response.ok:
@@ -185,7 +184,7 @@ class CharacterAPI(BaseManager):
         character = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Character, data=character)
+        return self._decode(character)
 
 
     def update(self, character: Character or dict) -> dict:
@@ -205,7 +204,7 @@ class CharacterAPI(BaseManager):
             character = character._asdict()
 
         response = self._request(
-            url=GET_UPDATE_DELETE_SINGLE % character.get("id"),
+            url=self.GET_UPDATE_DELETE_SINGLE % character.get("id"),
             request=PUT,
             data=json.dumps(character),
         )
@@ -239,7 +238,7 @@ class CharacterAPI(BaseManager):
         Returns:
             bool: whether the character is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error(
@@ -5,81 +5,135 @@ Kanka Client
 # pylint: disable=bare-except
 from __future__ import absolute_import
 
+import os
+import re
 import logging
+import importlib
+from itertools import chain
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 
-from kankamanager.kankaclient.abilities import AbilityAPI
 from kankamanager.kankaclient.base import BaseManager, Entity
-from kankamanager.kankaclient.calendars import CalendarAPI
 from kankamanager.kankaclient.campaigns import CampaignAPI
-from kankamanager.kankaclient.characters import CharacterAPI
-from kankamanager.kankaclient.conversations import ConversationAPI
-from kankamanager.kankaclient.dice import DiceRollAPI
-from kankamanager.kankaclient.events import EventAPI
-from kankamanager.kankaclient.families import FamilyAPI
-from kankamanager.kankaclient.items import ItemAPI
-from kankamanager.kankaclient.journals import JournalAPI
-from kankamanager.kankaclient.locations import LocationAPI
-from kankamanager.kankaclient.maps import MapAPI
-from kankamanager.kankaclient.organizations import OrganizationAPI
-from kankamanager.kankaclient.quests import QuestAPI
-from kankamanager.kankaclient.races import RaceAPI
-from kankamanager.kankaclient.tags import TagAPI
-from kankamanager.kankaclient.timelines import TimelineAPI
+from kankamanager.kankaclient.metrics import METRICS
+from kankamanager.kankaclient.constants import MAX_WORKERS
+
+# The entity managers, imported by name on first use
+MANAGERS = {
+    'abilities': ('kankamanager.kankaclient.abilities', 'AbilityAPI'),
+    'calendars': ('kankamanager.kankaclient.calendars', 'CalendarAPI'),
+    'characters': ('kankamanager.kankaclient.characters', 'CharacterAPI'),
+    'conversations': ('kankamanager.kankaclient.conversations', 'ConversationAPI'),
+    'dice': ('kankamanager.kankaclient.dice', 'DiceRollAPI'),
+    'events': ('kankamanager.kankaclient.events', 'EventAPI'),
+    'families': ('kankamanager.kankaclient.families', 'FamilyAPI'),
+    'items': ('kankamanager.kankaclient.items', 'ItemAPI'),
+    'journals': ('kankamanager.kankaclient.journals', 'JournalAPI'),
+    'locations': ('kankamanager.kankaclient.locations', 'LocationAPI'),
+    'maps': ('kankamanager.kankaclient.maps', 'MapAPI'),
+    'organizations': ('kankamanager.kankaclient.organizations', 'OrganizationAPI'),
+    'quests': ('kankamanager.kankaclient.quests', 'QuestAPI'),
+    'races': ('kankamanager.kankaclient.races', 'RaceAPI'),
+    'tags': ('kankamanager.kankaclient.tags', 'TagAPI'),
+    'timelines': ('kankamanager.kankaclient.timelines', 'TimelineAPI'),
+}
+
+
+class Managers(Mapping):
+    """The client's entity managers, each imported and created on first use"""
+
+    def __init__(self, campaigns: CampaignAPI, token: str, verbose: bool=False, throttle: bool=False, lazy: bool=False,
+                 compress: bool=False):
+        self.managers = {'campaign': campaigns}
+        self.campaign = campaigns.campaign
+        self.token = token
+        self.verbose = verbose
+        self.throttle = throttle
+        self.lazy = lazy
+        self.compress = compress
+
+
+    def __getitem__(self, entity: str) -> BaseManager:
+        if entity not in self.managers:
+            if entity not in MANAGERS:
+                raise KeyError(entity)
+            module, name = MANAGERS.get(entity)
+            manager = getattr(importlib.import_module(module), name)(
+                token=self.token, campaign=self.campaign, verbose=self.verbose, throttle=self.throttle
+            )
+            manager.lazy = self.lazy
+            manager.compress = self.compress
+            self.managers[entity] = manager
+
+        return self.managers.get(entity)
+
+
+    def __iter__(self):
+        return iter(['campaign', *MANAGERS])
+
+
+    def __len__(self) -> int:
+        return len(MANAGERS) + 1
 
 
 class KankaClient(BaseManager):
     """Kanka Client"""
 
-    entities: dict
+    entities: Managers
+
+    def __init__(self, config, verbose: str=False, snapshot: str=None, lazy: bool=False, cassette: str=None,
+                 record: bool=False):
+        # A cassette replaces the network for every manager (KANKA_CASSETTE lets test runs replay offline,
+        # the live tests create entities with generated names, so replay them with KANKA_CASSETTE_IGNORE=name)
+        cassette = cassette or os.environ.get('KANKA_CASSETTE')
+        if cassette:
+            from kankamanager.kankaclient.cassette import use_cassette  # pylint: disable=import-outside-toplevel
+            ignore = [field for field in os.environ.get('KANKA_CASSETTE_IGNORE', '').split(',') if field]
+            use_cassette(cassette, record=record or os.environ.get('KANKA_CASSETTE_RECORD') == '1', ignore=ignore or None)
 
-    def __init__(self, config, verbose: str=False):
         super().__init__(token=config.get('token'), verbose=verbose)
         self.logger = logging.getLogger(self.__class__.__name__)
         self.campaign_dir = config.get('campaign_dir')
 
-        self.campaigns = CampaignAPI(token=config.get('token'), campaign=config.get('campaign'), verbose=verbose, throttle=config.get('throttle'))
-        self.abilities = AbilityAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.calendars = CalendarAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.characters = CharacterAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.conversations = ConversationAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.dice = DiceRollAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.events = EventAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.families = FamilyAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.items = ItemAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.journals = JournalAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.locations = LocationAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.maps = MapAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.organizations = OrganizationAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.quests = QuestAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.races = RaceAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.tags = TagAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-        self.timelines = TimelineAPI(token=config.get('token'), campaign=self.campaigns.campaign, verbose=verbose, throttle=config.get('throttle'))
-
-        self.entities = {
-            'campaign': self.campaigns,
-            'abilities': self.abilities,
-            'calendars': self.calendars,
-            'characters': self.characters,
-            'conversations': self.conversations,
-            'dice': self.dice,
-            'events': self.events,
-            'families': self.families,
-            'items': self.items,
-            'journals': self.journals,
-            'locations': self.locations,
-            'maps': self.maps,
-            'organizations': self.organizations,
-            'quests': self.quests,
-            'races': self.races,
-            'tags': self.tags,
-            'timelines': self.timelines
-        }
+        # Starting from a snapshot resolves the campaign and fills the caches without the network
+        campaign = config.get('campaign')
+        entities = None
+        if snapshot:
+            # pylint: disable=import-outside-toplevel
+            from dacite import from_dict
+            from kankamanager.kankaclient.campaigns import Campaign
+            from kankamanager.kankaclient.snapshot import read_snapshot
+            header, entities = read_snapshot(snapshot)
+            campaign = from_dict(data_class=Campaign, data=header.get('campaign'))
+
+        with METRICS.span('resolve'):
+            self.campaigns = CampaignAPI(token=config.get('token'), campaign=campaign, verbose=verbose, throttle=config.get('throttle'))
+        self.entities = Managers(self.campaigns, token=config.get('token'), verbose=verbose, throttle=config.get('throttle'), lazy=lazy,
+                                 compress=bool(config.get('compress')))
+
+        if entities:
+            from kankamanager.kankaclient.snapshot import load_snapshot  # pylint: disable=import-outside-toplevel
+            load_snapshot(self, entities)
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
 
         self.logger.debug('Kanka Client initialized')
 
+
+    def __getattr__(self, name: str):
+        # client.characters, client.tags... resolve to the lazily created managers
+        if name in MANAGERS and 'entities' in self.__dict__:
+            return self.entities[name]
+        raise AttributeError(name)
+
+
+    def clear_caches(self):
+        """Drops the cached entities of every manager created so far"""
+        for manager in self.entities.managers.values():
+            manager.clear_cache()
+
+
     # def smart_substitute(self, entity, entities):
     #     self.tags.get_all()
     #     tags = self.tags.tag_map
@@ -116,6 +170,20 @@ class KankaClient(BaseManager):
         return result
 
 
+    def iter_all(self, entity: str, fields: list=None):
+        """
+        Streams the requested entities page by page
+
+        Args:
+            entity (str): the entity to retrieve
+            fields (list, optional): only decode and keep these fields. Defaults to the whole entity.
+
+        Yields:
+            entity: the next entity
+        """
+        yield from self.entities.get(entity).iter_all(fields=fields)
+
+
     def create(self, entity: str, data: dict) -> dict:
         """
         TODO
@@ -158,3 +226,113 @@ class KankaClient(BaseManager):
         """
         result = self.entities.get(entity).delete(name_or_id)
         return result
+
+
+class MultiCampaignClient(object):
+    """
+    Clients of several campaigns, resolved from a single campaign listing
+
+    The clients share the managers' session and rate limiter, so running them
+    concurrently stays within Kanka's limits. Each campaign gets its own
+    campaign_dir, a sub directory named after the campaign.
+    """
+
+    def __init__(self, config, campaigns: list=None, verbose: bool=False, lazy: bool=False):
+        """
+        Multi Campaign Client Constructor
+
+        Args:
+            config (dict): the Kanka config, its campaign is ignored
+            campaigns (list, optional): the campaign names or ids. Defaults to every campaign.
+            verbose (bool, optional): enables verbose logging. Defaults to False.
+            lazy (bool, optional): defers the heavy entry fields, one request per entity on first access. Defaults to False.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if verbose:
+            self.logger.setLevel(logging.DEBUG)
+
+        with METRICS.span('resolve'):
+            listing = CampaignAPI(token=config.get('token'), campaign=None, verbose=verbose, throttle=config.get('throttle'))
+            available = listing.get_all()
+
+        selected = available
+        if campaigns:
+            selected = list()
+            for name_or_id in campaigns:
+                matches = [campaign for campaign in available if name_or_id in (campaign.name, campaign.id, str(campaign.id))]
+                if not matches:
+                    raise listing.KankaException(reason=f'Campaign not found: {name_or_id}', code=404, message='Not Found')
+                selected.extend(campaign for campaign in matches if campaign.id not in [known.id for known in selected])
+
+        # The clients and their campaign_dir are named after the campaign, a shared name would merge two campaigns
+        names = [campaign.name for campaign in selected]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise listing.KankaException(reason=f'Campaigns share a name, rename them in Kanka: {", ".join(duplicates)}', code=409, message='Conflict')
+
+        self.errors = dict()
+        self.clients = dict()
+        for campaign in selected:
+            campaign_config = dict(config, campaign=campaign)
+            if config.get('campaign_dir'):
+                campaign_config['campaign_dir'] = os.path.join(config.get('campaign_dir'), re.sub(r'[^\w.-]+', '_', campaign.name))
+            self.clients[campaign.name] = KankaClient(campaign_config, verbose=verbose, lazy=lazy)
+
+        self.logger.debug('Kanka Multi Campaign Client initialized with %s campaigns', len(self.clients))
+
+
+    def map(self, function, *args, max_workers: int=MAX_WORKERS) -> dict:
+        """
+        Runs function(client, *args) for every campaign concurrently
+
+        A campaign whose call raises is logged and left out of the results,
+        its exception is kept in errors.
+
+        Args:
+            function (function): the operation, e.g. pull or push
+            max_workers (int, optional): the campaigns run at once. Defaults to MAX_WORKERS.
+
+        Returns:
+            dict: the result of each campaign, keyed by campaign name
+        """
+        self.errors = dict()
+        results = dict()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {name: executor.submit(function, client, *args) for name, client in self.clients.items()}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as ex:
+                    self.logger.error('Failed to run %s on campaign %s', getattr(function, '__name__', function), name)
+                    self.logger.debug(ex)
+                    self.errors[name] = ex
+
+        return results
+
+
+    def get_all(self, entity: str, merged: bool=False) -> dict or list:
+        """
+        Retrieves the requested entities of every campaign
+
+        Args:
+            entity (str): the entity to retrieve
+            merged (bool, optional): one list of every campaign's entities. Defaults to False.
+
+        Returns:
+            dict or list: the entities keyed by campaign name, or merged
+        """
+        results = self.map(lambda client: client.get_all(entity))
+        return merge(results) if merged else results
+
+
+def merge(results: dict) -> list:
+    """
+    Merges per-campaign entity lists into one list, in campaign order
+
+    Args:
+        results (dict): the entities keyed by campaign name
+
+    Returns:
+        list: every entity
+    """
+    return list(chain.from_iterable(results.values()))
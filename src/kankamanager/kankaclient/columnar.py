@@ -0,0 +1,204 @@
+"""
+Kanka Columnar Export
+
+Converts the managers' entities into Arrow tables (one per entity type) with
+typed columns derived from the entity dataclass fields, and writes them as
+Parquet files for vectorized analytics.
+
+"""
+from __future__ import absolute_import
+
+import os
+import json
+import typing
+from dataclasses import fields
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+_types = {
+    int: pa.int64(),
+    bool: pa.bool_(),
+    str: pa.string(),
+    float: pa.float64(),
+}
+
+
+def _unwrap(annotation):
+    """
+    Returns the annotation without its Optional wrapper
+
+    Args:
+        annotation (type): the dataclass field annotation
+
+    Returns:
+        type: the wrapped annotation
+    """
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _encode(value):
+    """Encodes a loosely typed (Any) value as a string column value"""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+def _column(values: list, annotation) -> pa.Array:
+    """
+    Builds the Arrow column of a dataclass field
+
+    Args:
+        values (list): the field values
+        annotation (type): the dataclass field annotation
+
+    Returns:
+        pa.Array: the typed column
+    """
+    annotation = _unwrap(annotation)
+    if annotation in _types:
+        return pa.array(values, type=_types.get(annotation))
+    if annotation is list or typing.get_origin(annotation) is list:
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.array([None if value is None else [_encode(item) for item in value] for value in values],
+                            type=pa.list_(pa.string()))
+
+    return pa.array([_encode(value) for value in values], type=pa.string())
+
+
+def to_table(entities: list, data_class=None) -> pa.Table:
+    """
+    Converts entities into an Arrow table
+
+    Args:
+        entities (list): the entities (dataclasses or dicts)
+        data_class (type, optional): the entity dataclass, columns are inferred when None
+
+    Returns:
+        pa.Table: the entity table
+    """
+    if data_class is None:
+        return pa.Table.from_pylist(list(entities))
+
+    columns = dict()
+    for field in fields(data_class):
+        values = [getattr(entity, field.name) for entity in entities]
+        columns[field.name] = _column(values, field.type)
+
+    return pa.table(columns)
+
+
+def to_tables(client, entities: list=None) -> dict:
+    """
+    Converts the entities of the client's managers into Arrow tables
+
+    Args:
+        client (KankaClient): the client
+        entities (list, optional): the entity types to convert. Defaults to all.
+
+    Raises:
+        KankaException: Kanka Api Interface Exception
+
+    Returns:
+        dict: the table of each entity type
+    """
+    tables = dict()
+    for entity, manager in client.entities.items():
+        if entity == 'campaign' or (entities and entity not in entities):
+            continue
+        tables[entity] = to_table(manager.get_all(), manager.DATA_CLASS)
+
+    return tables
+
+
+def write_parquet(tables: dict, directory: str) -> list:
+    """
+    Writes each table to <directory>/<entity>.parquet
+
+    Args:
+        tables (dict): the table of each entity type
+        directory (str): the output directory
+
+    Returns:
+        list: the written file paths
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    files = list()
+    for entity, table in tables.items():
+        file = os.path.join(directory, f'{entity}.parquet')
+        pq.write_table(table, file)
+        files.append(file)
+
+    return files
+
+
+def read_parquet(directory: str) -> dict:
+    """
+    Reads the tables written by write_parquet
+
+    Args:
+        directory (str): the parquet directory
+
+    Returns:
+        dict: the table of each entity type
+    """
+    return {
+        file[:-len('.parquet')]: pq.read_table(os.path.join(directory, file))
+        for file in sorted(os.listdir(directory)) if file.endswith('.parquet')
+    }
+
+
+def count_by(table: pa.Table, column: str) -> dict:
+    """
+    Counts the rows of a table per value of a column (list columns count each element)
+
+    Args:
+        table (pa.Table): the entity table
+        column (str): the column to group by
+
+    Returns:
+        dict: the row count of each value
+    """
+    values = table.column(column)
+    if pa.types.is_list(values.type):
+        values = pc.list_flatten(values)
+
+    counts = pc.value_counts(values)
+    return dict(zip(counts.field('values').to_pylist(), counts.field('counts').to_pylist()))
+
+
+def summary(tables: dict) -> dict:
+    """
+    Computes the campaign report: entity counts, type counts, tag usage and dead vs. alive characters
+
+    Args:
+        tables (dict): the table of each entity type
+
+    Returns:
+        dict: the report
+    """
+    report = {
+        'entities': {entity: table.num_rows for entity, table in tables.items()},
+        'types': dict(),
+        'tags': dict(),
+    }
+    for entity, table in tables.items():
+        if 'type' in table.column_names:
+            report['types'][entity] = count_by(table, 'type')
+        if 'tags' in table.column_names and pa.types.is_list(table.column('tags').type):
+            report['tags'][entity] = count_by(table, 'tags')
+
+    characters = tables.get('characters')
+    if characters is not None and 'is_dead' in characters.column_names:
+        dead = pc.sum(pc.cast(characters.column('is_dead'), pa.int64())).as_py() or 0
+        report['dead'] = {'dead': dead, 'alive': characters.num_rows - dead}
+
+    return report
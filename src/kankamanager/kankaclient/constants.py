@@ -1,5 +1,6 @@
 """ Application Configuration """
 
+import os
 import logging
 ##################################################
 #
@@ -8,8 +9,53 @@ DEFAULT_LOG_LEVEL = logging.WARN
 LOG_FORMAT = "%(asctime)s  %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S.000000"
 
-BASE_URL = 'https://kanka.io/api/1.0/campaigns'
+UPSTREAM_URL = 'https://kanka.io/api/1.0/campaigns'
+# Point the managers at a local proxy (e.g. http://127.0.0.1:8765/campaigns)
+BASE_URL = os.environ.get('KANKA_BASE_URL', UPSTREAM_URL).rstrip('/')
 MAX_ATTEMPTS = 5
+# Seconds to back off after a 429 without a Retry-After header
+RETRY_DELAY = 5
+# Seconds between throttled requests
+THROTTLE_INTERVAL = 1.0
+MAX_WORKERS = 8
+# Smallest request body worth compressing, in bytes
+COMPRESS_MIN_BYTES = 1024
+# Entities a bulk create worker creates one after the other
+BULK_CHUNK_SIZE = 25
+# Histogram bucket bounds (seconds) of the client metrics
+METRIC_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+# Profile files prefix and seconds between the samples of the stack sampler
+PROFILE_PREFIX = 'kankamanager-profile'
+PROFILE_INTERVAL = 0.005
+
+# Seconds the daemon keeps its client's caches, and the commands after which it clears them
+DAEMON_CACHE_TTL = 60.0
+DAEMON_WRITE_COMMANDS = ['create', 'update', 'delete', 'push', 'import']
+
+PROXY_HOST = '127.0.0.1'
+PROXY_PORT = 8765
+# Seconds a proxied response stays cached
+PROXY_TTL = 60.0
+
+MANIFEST = 'manifest.yaml'
+# Checkpoints of the pull and push in progress, under the campaign_dir
+JOURNAL_DIR = '.journal'
+
+# Content-addressed image store under the campaign_dir, its url index and the entity fields holding image urls
+ASSETS_DIR = 'assets'
+ASSET_INDEX = 'index.yaml'
+ASSET_FIELDS = ['image_full', 'image_thumb', 'header_image']
+ASSET_TIMEOUT = 30
+ASSET_CHUNK_SIZE = 65536
+
+PARQUET_DIR = 'parquet'
+
+SNAPSHOT = 'campaign.snapshot'
+SNAPSHOT_FORMAT = 'kanka-snapshot'
+SNAPSHOT_VERSION = 1
+
+CASSETTE_FORMAT = 'kanka-cassette'
+CASSETTE_VERSION = 1
 
 GET = 'GET'
 POST = 'POST'
@@ -65,6 +111,20 @@ SUBSTITUTION_LIST = [
     'races'
 ]
 
+SEPARATOR = '# ============================================================================================\n'
+
+# Rows sampled to size the columns of a streamed table
+TABLE_SAMPLE = 100
+# Narrowest column a --max-width truncation may cut values to ('a...')
+MIN_TRUNCATED_WIDTH = 4
+
+TABLE_FIELDS = [
+    'name',
+    'id',
+    'type',
+    'tags'
+]
+
 DEFAULT_FIELDS = [
     'Name',
     'ID',
@@ -73,6 +133,11 @@ DEFAULT_FIELDS = [
 ]
 
 CONFIG = 'config'
+DAEMON = 'daemon'
+PROXY = 'proxy'
+# Commands run concurrently over several campaigns with --campaigns
+MULTI_CAMPAIGN_COMMANDS = ['pull', 'push']
+STATS_OPTIONS = ['table', 'prometheus']
 
 CONFIG_FIELDS = {
     'campaign': 'Campaign name: ',
@@ -94,8 +159,17 @@ token: {token}
 
 # Whether to throttle API requests (recommended for none boosted campaigns)
 throttle: {throttle}
+
+# Whether to gzip large create/update bodies (plain bodies are sent again if Kanka refuses them)
+# compress: true
 '''
 
+# Heavy fields left out of decoded entities until accessed (lazy managers)
+LAZY_FIELDS = [
+    'entry',
+    'entry_parsed'
+]
+
 DEFAULT_REMOVE = [
     'created_at',
     'created_by',
@@ -115,6 +189,8 @@ COMMANDS = [
 OUTPUT_OPTIONS = [
     'yaml',
     'json',
+    'ndjson',
+    'csv',
     'table'
 ]
 
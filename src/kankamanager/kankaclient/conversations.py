@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -37,6 +35,9 @@ class ConversationAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'conversations'
+    CACHE = 'conversations'
+    DATA_CLASS = Conversation
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -45,10 +46,8 @@ class ConversationAPI(BaseManager):
         self.campaign_id = campaign.id
         self.conversations = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/conversations'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/conversations/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/conversations'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/conversations/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -67,7 +66,7 @@ class ConversationAPI(BaseManager):
         if self.conversations:
             return self.conversations
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -81,7 +80,7 @@ class ConversationAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.conversations = [
-                from_dict(data_class=Conversation, data=conversation) for conversation in json.loads(response.text).get("data")
+                self._decode(conversation) for conversation in json.loads(response.text).get("data")
             ]
 
         return self.conversations
@@ -133,7 +132,7 @@ class ConversationAPI(BaseManager):
         Returns:
             conversation: the requested conversation
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -148,7 +147,7 @@ class ConversationAPI(BaseManager):
         conversation = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Conversation, data=conversation)
+        return self._decode(conversation)
 
 
     def create(self, conversation: dict) -> Conversation:
@@ -165,7 +164,7 @@ class ConversationAPI(BaseManager):
             conversation: the created conversation
         """
         response = self._request(
-            url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(conversation)
+            url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(conversation)
         )
 
         if not response.ok:
@@ -181,7 +180,7 @@ class ConversationAPI(BaseManager):
         conversation = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Conversation, data=conversation)
+        return self._decode(conversation)
 
 
     def update(self, conversation: dict) -> dict:
@@ -197,7 +196,7 @@ class ConversationAPI(BaseManager):
         Returns:
             conversation: the updated conversation
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % conversation.get('id'), request=PUT, data=json.dumps(conversation))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % conversation.get('id'), request=PUT, data=json.dumps(conversation))
 
         if not response.ok:
             self.logger.error('Failed to update conversation %s in campaign %s', conversation.get('name', 'None'), self.campaign.get('name'))
@@ -222,7 +221,7 @@ class ConversationAPI(BaseManager):
         Returns:
             bool: whether the conversation is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete conversation %s in campaign %s', id, self.campaign.name)
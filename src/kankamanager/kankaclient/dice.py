@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -34,6 +32,9 @@ class DiceRollAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'dice_rolls'
+    CACHE = 'dice_rolls'
+    DATA_CLASS = DiceRoll
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -42,10 +43,8 @@ class DiceRollAPI(BaseManager):
         self.campaign_id = campaign.id
         self.dice_rolls = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/dice_rolls'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/dice_rolls/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/dice_rolls'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/dice_rolls/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -64,7 +63,7 @@ class DiceRollAPI(BaseManager):
         if self.dice_rolls:
             return self.dice_rolls
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -78,7 +77,7 @@ class DiceRollAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.dice_rolls = [
-                from_dict(data_class=DiceRoll, data=dice_roll) for dice_roll in json.loads(response.text).get("data")
+                self._decode(dice_roll) for dice_roll in json.loads(response.text).get("data")
             ]
 
         return self.dice_rolls
@@ -130,7 +129,7 @@ class DiceRollAPI(BaseManager):
         Returns:
             dice_roll: the requested dice_roll
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -145,7 +144,7 @@ class DiceRollAPI(BaseManager):
         dice_roll = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=DiceRoll, data=dice_roll)
+        return self._decode(dice_roll)
 
 
     def create(self, dice_roll: dict) -> dict:
@@ -161,7 +160,7 @@ class DiceRollAPI(BaseManager):
         Returns:
             dice_roll: the created dice_roll
         """
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(dice_roll))
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(dice_roll))
 
         if not response.ok:
             self.logger.error('Failed to create dice_roll %s in campaign %s', dice_roll.get('name', None), self.campaign.name)
@@ -170,7 +169,7 @@ class DiceRollAPI(BaseManager):
         dice_roll = json.loads(response.text).get('data')
         self.logger.debug(response.json())
 
-        return from_dict(data_class=DiceRoll, data=dice_roll)
+        return self._decode(dice_roll)
 
 
     def update(self, dice_roll: dict) -> dict:
@@ -186,7 +185,7 @@ class DiceRollAPI(BaseManager):
         Returns:
             dice_roll: the updated dice_roll
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % dice_roll.get('id'), request=PUT, data=json.dumps(dice_roll))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % dice_roll.get('id'), request=PUT, data=json.dumps(dice_roll))
 
         if not response.ok:
             self.logger.error('Failed to update dice_roll %s in campaign %s', dice_roll.get('name', 'None'), self.campaign.get('name'))
@@ -211,7 +210,7 @@ class DiceRollAPI(BaseManager):
         Returns:
             bool: whether the dice_roll is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete dice_roll %s in campaign %s', id, self.campaign.get('name'))
@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -32,6 +30,9 @@ class EventAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'events'
+    CACHE = 'events'
+    DATA_CLASS = Event
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -40,10 +41,8 @@ class EventAPI(BaseManager):
         self.campaign_id = campaign.id
         self.events = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/events'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/events/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/events'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/events/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -62,7 +61,7 @@ class EventAPI(BaseManager):
         if self.events:
             return self.events
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -76,7 +75,7 @@ class EventAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.events = [
-                from_dict(data_class=Event, data=event) for event in json.loads(response.text).get("data")
+                self._decode(event) for event in json.loads(response.text).get("data")
             ]
 
         return self.events
@@ -128,7 +127,7 @@ class EventAPI(BaseManager):
         Returns:
             event: the requested event
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -143,7 +142,7 @@ class EventAPI(BaseManager):
         event = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Event, data=event)
+        return self._decode(event)
 
 
     def create(self, event: dict) -> Event:
@@ -160,7 +159,7 @@ class EventAPI(BaseManager):
             event: the created event
         """
         response = self._request(
-            url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(event)
+            url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(event)
         )
 
         if not response.ok:
@@ -176,7 +175,7 @@ class EventAPI(BaseManager):
         event = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Event, data=event)
+        return self._decode(event)
 
 
     def update(self, event: dict) -> dict:
@@ -192,7 +191,7 @@ class EventAPI(BaseManager):
         Returns:
             event: the updated event
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % event.get('id'), request=PUT, data=json.dumps(event))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % event.get('id'), request=PUT, data=json.dumps(event))
 
         if not response.ok:
             self.logger.error('Failed to update event %s in campaign %s', event.get('name', 'None'), self.campaign.get('name'))
@@ -217,7 +216,7 @@ class EventAPI(BaseManager):
         Returns:
             bool: whether the event is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete event %s in campaign %s', id, self.campaign.get('name'))
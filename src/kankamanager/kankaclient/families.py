@@ -16,6 +16,9 @@ class FamilyAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'families'
+    CACHE = 'families'
+    DATA_CLASS = None
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -24,10 +27,8 @@ class FamilyAPI(BaseManager):
         self.campaign_id = campaign.id
         self.families = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/families'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/families/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/families'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/families/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -46,17 +47,16 @@ class FamilyAPI(BaseManager):
         if self.families:
             return self.families
 
-        families = list()
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve families from campaign %s', self.campaign.get('name'))
             raise self.KankaException(response.text, response.status_code, message=response.reason)
 
-        families = json.loads(response.text).get('data')
+        self.families = json.loads(response.text).get('data')
         self.logger.debug(response.json())
 
-        return families
+        return self.families
 
 
     def get(self, name_or_id: str or int) -> dict:
@@ -101,7 +101,7 @@ class FamilyAPI(BaseManager):
         Returns:
             family: the requested family
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve family %s from campaign %s', id, self.campaign.get('name'))
@@ -126,7 +126,7 @@ class FamilyAPI(BaseManager):
         Returns:
             family: the created family
         """
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(family))
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(family))
 
         if not response.ok:
             self.logger.error('Failed to create family %s in campaign %s', family.get('name', 'None'), self.campaign.get('name'))
@@ -151,7 +151,7 @@ class FamilyAPI(BaseManager):
         Returns:
             family: the updated family
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % family.get('id'), request=PUT, data=json.dumps(family))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % family.get('id'), request=PUT, data=json.dumps(family))
 
         if not response.ok:
             self.logger.error('Failed to update family %s in campaign %s', family.get('name', 'None'), self.campaign.get('name'))
@@ -176,7 +176,7 @@ class FamilyAPI(BaseManager):
         Returns:
             bool: whether the family is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete family %s in campaign %s', id, self.campaign.get('name'))
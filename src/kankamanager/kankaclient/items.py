@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -37,6 +35,9 @@ class ItemAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'items'
+    CACHE = 'items'
+    DATA_CLASS = Item
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -45,10 +46,8 @@ class ItemAPI(BaseManager):
         self.campaign_id = campaign.id
         self.items = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/items'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/items/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/items'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/items/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -67,7 +66,7 @@ class ItemAPI(BaseManager):
         if self.items:
             return self.items
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -81,7 +80,7 @@ class ItemAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.items = [
-                from_dict(data_class=Item, data=item) for item in json.loads(response.text).get("data")
+                self._decode(item) for item in json.loads(response.text).get("data")
             ]
 
         return self.items
@@ -133,7 +132,7 @@ class ItemAPI(BaseManager):
         Returns:
             item: the requested item
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -148,7 +147,7 @@ class ItemAPI(BaseManager):
         item = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Item, data=item)
+        return self._decode(item)
 
 
     def create(self, item: dict) -> Item:
@@ -165,7 +164,7 @@ class ItemAPI(BaseManager):
             item: the created item
         """
         response = self._request(
-            url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(item)
+            url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(item)
         )
 
         if not response.ok:
@@ -181,7 +180,7 @@ class ItemAPI(BaseManager):
         item = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Item, data=item)
+        return self._decode(item)
 
 
     def update(self, item: dict) -> dict:
@@ -197,7 +196,7 @@ class ItemAPI(BaseManager):
         Returns:
             item: the updated item
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % item.get('id'), request=PUT, data=json.dumps(item))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % item.get('id'), request=PUT, data=json.dumps(item))
 
         if not response.ok:
             self.logger.error('Failed to update item %s in campaign %s', item.get('name', 'None'), self.campaign.get('name'))
@@ -222,7 +221,7 @@ class ItemAPI(BaseManager):
         Returns:
             bool: whether the item is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete item %s in campaign %s', id, self.campaign.get('name'))
@@ -16,6 +16,9 @@ class JournalAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'journals'
+    CACHE = 'journals'
+    DATA_CLASS = None
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -24,10 +27,8 @@ class JournalAPI(BaseManager):
         self.campaign_id = campaign.id
         self.journals = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/journals'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/journals/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/journals'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/journals/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -46,17 +47,16 @@ class JournalAPI(BaseManager):
         if self.journals:
             return self.journals
 
-        journals = list()
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve journals from campaign %s', self.campaign.get('name'))
             raise self.KankaException(response.text, response.status_code, message=response.reason)
 
-        journals = json.loads(response.text).get('data')
+        self.journals = json.loads(response.text).get('data')
         self.logger.debug(response.json())
 
-        return journals
+        return self.journals
 
 
     def get(self, name_or_id: str or int) -> dict:
@@ -101,7 +101,7 @@ class JournalAPI(BaseManager):
         Returns:
             journal: the requested journal
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve journal %s from campaign %s', id, self.campaign.get('name'))
@@ -126,7 +126,7 @@ class JournalAPI(BaseManager):
         Returns:
             journal: the created journal
         """
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(journal))
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(journal))
 
         if not response.ok:
             self.logger.error('Failed to create journal %s in campaign %s', journal.get('name', 'None'), self.campaign.get('name'))
@@ -151,7 +151,7 @@ class JournalAPI(BaseManager):
         Returns:
             journal: the updated journal
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % journal.get('id'), request=PUT, data=json.dumps(journal))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % journal.get('id'), request=PUT, data=json.dumps(journal))
 
         if not response.ok:
             self.logger.error('Failed to update journal %s in campaign %s', journal.get('name', 'None'), self.campaign.get('name'))
@@ -176,7 +176,7 @@ class JournalAPI(BaseManager):
         Returns:
             bool: whether the journal is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete journal %s in campaign %s', id, self.campaign.get('name'))
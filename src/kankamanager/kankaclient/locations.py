@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -33,11 +31,259 @@ class Location(Entity):
     is_map_private: Optional[int]
 
 
+class LocationCycleError(Exception):
+    """Raised when a location would be nested inside itself"""
+
+
+class LocationIndex(object):
+    """
+    Ancestor/descendant closure index over the location hierarchy
+
+    Every location is labelled with the entry/exit of an Euler tour of the
+    parent_location_id tree, so ancestry checks are O(1). The labels are spaced
+    by GAP: an added or moved location (with its subtree) is labelled in the gap
+    left under its new parent, the rest of the tour keeps its labels. The whole
+    tour is only renumbered when a gap runs out.
+    """
+
+    GAP = 1 << 32
+
+    def __init__(self, locations: list=None):
+        self.parents = dict()
+        self.children = dict()
+        self.enter = dict()
+        self.exit = dict()
+        self.end = 0
+
+        for location in locations or []:
+            id, parent = self._fields(location)
+            self.parents[id] = parent
+            self.children.setdefault(id, set())
+            if parent is not None:
+                self.children.setdefault(parent, set()).add(id)
+        self._renumber()
+
+
+    @staticmethod
+    def _fields(location: Location or dict) -> tuple:
+        """
+        Returns the (id, parent_location_id) pair of the provided location
+
+        Args:
+            location (Location or dict): the location
+
+        Returns:
+            tuple: the location id and its parent id
+        """
+        if isinstance(location, dict):
+            return location.get('id'), location.get('parent_location_id')
+        return location.id, location.parent_location_id
+
+
+    def creates_cycle(self, id: int, parent: Optional[int]) -> bool:
+        """
+        Checks whether nesting a location inside the provided parent would make a cycle
+
+        Args:
+            id (int): the location id
+            parent (int, optional): the new parent location id
+
+        Returns:
+            bool: whether the parent is the location itself or one of its descendants
+        """
+        seen = set()
+        while parent is not None and parent not in seen:
+            if parent == id:
+                return True
+            seen.add(parent)
+            parent = self.parents.get(parent)
+
+        return False
+
+
+    def add(self, location: Location or dict):
+        """
+        Adds the provided location to the index
+
+        Args:
+            location (Location or dict): the location to add
+
+        Raises:
+            LocationCycleError: the location would be nested inside itself
+        """
+        id, parent = self._fields(location)
+        if id in self.parents:
+            self.move(id, parent)
+            return
+        if self.creates_cycle(id, parent):
+            raise LocationCycleError(f'Location {id} cannot be nested inside {parent}')
+
+        self.parents[id] = parent
+        self.children.setdefault(id, set())
+        if parent is not None:
+            self.children.setdefault(parent, set()).add(id)
+        self._place(id)
+
+
+    def move(self, id: int, parent: Optional[int]):
+        """
+        Re-parents the provided location, relabelling only its subtree
+
+        Args:
+            id (int): the location id
+            parent (int, optional): the new parent location id
+
+        Raises:
+            LocationCycleError: the new parent is the location or one of its descendants
+        """
+        if id not in self.parents:
+            self.add({'id': id, 'parent_location_id': parent})
+            return
+
+        old_parent = self.parents.get(id)
+        if old_parent == parent:
+            return
+        if self.creates_cycle(id, parent):
+            raise LocationCycleError(f'Location {id} cannot be nested inside {parent}')
+        if old_parent is not None:
+            self.children.get(old_parent, set()).discard(id)
+        if parent is not None:
+            self.children.setdefault(parent, set()).add(id)
+        self.parents[id] = parent
+        self._place(id)
+
+
+    def remove(self, id: int):
+        """
+        Removes the provided location from the index, its children become roots
+
+        Args:
+            id (int): the location id
+        """
+        if id not in self.parents:
+            return
+
+        parent = self.parents.pop(id)
+        if parent is not None:
+            self.children.get(parent, set()).discard(id)
+        self.enter.pop(id, None)
+        self.exit.pop(id, None)
+        for child in sorted(self.children.pop(id, set())):
+            self.parents[child] = None
+            self._place(child)
+
+
+    def _tour(self, id: int):
+        """Yields the (location id, exited) events of the Euler tour of a subtree"""
+        # Iterative walk, deep worlds must not hit the recursion limit
+        seen = set()
+        stack = [(id, False)]
+        while stack:
+            id, done = stack.pop()
+            if done:
+                yield id, True
+                continue
+            if id in seen:
+                continue
+            seen.add(id)
+            yield id, False
+            stack.append((id, True))
+            for child in sorted(self.children.get(id, ()), reverse=True):
+                stack.append((child, False))
+
+
+    def _renumber(self):
+        """Relabels the whole hierarchy, GAP apart"""
+        self.enter = dict()
+        self.exit = dict()
+        self.end = 0
+
+        roots = [id for id, parent in self.parents.items() if parent not in self.parents]
+        for root in sorted(roots):
+            for id, done in self._tour(root):
+                self.end += self.GAP
+                (self.exit if done else self.enter)[id] = self.end
+
+
+    def _place(self, id: int):
+        """Labels the subtree of a location inside its parent's range, or after the tour for a root"""
+        events = list(self._tour(id))
+        parent = self.parents.get(id)
+        if parent in self.enter:
+            # After the parent's last labelled child, before the parent's exit
+            low = max((self.exit[child] for child in self.children.get(parent) if child != id and child in self.exit), default=self.enter[parent])
+            step = (self.exit[parent] - low) // (len(events) + 1)
+            if step == 0:
+                self._renumber()
+                return
+        else:
+            low, step = self.end, self.GAP
+            self.end += step * len(events)
+
+        for position, (node, done) in enumerate(events, 1):
+            (self.exit if done else self.enter)[node] = low + step * position
+
+
+    def is_inside(self, id: int, ancestor_id: int) -> bool:
+        """
+        Checks whether a location is nested (at any depth) inside another
+
+        Args:
+            id (int): the location id
+            ancestor_id (int): the possible ancestor location id
+
+        Returns:
+            bool: whether the location is inside the ancestor
+        """
+        if id not in self.enter or ancestor_id not in self.enter or id == ancestor_id:
+            return False
+
+        return self.enter[ancestor_id] < self.enter[id] and self.exit[id] < self.exit[ancestor_id]
+
+
+    def descendants(self, id: int) -> list:
+        """
+        Retrieves every location nested inside the provided location
+
+        Args:
+            id (int): the location id
+
+        Returns:
+            list: the descendant location ids in tour order
+        """
+        if id not in self.enter:
+            return list()
+
+        return [node for node, done in self._tour(id) if not done][1:]
+
+
+    def ancestors(self, id: int) -> list:
+        """
+        Retrieves the chain of locations containing the provided location
+
+        Args:
+            id (int): the location id
+
+        Returns:
+            list: the ancestor location ids, closest first
+        """
+        ancestors = list()
+        parent = self.parents.get(id)
+        while parent is not None and parent in self.parents and parent not in ancestors:
+            ancestors.append(parent)
+            parent = self.parents.get(parent)
+
+        return ancestors
+
+
 class LocationAPI(BaseManager):
     """Kanka Location API"""
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'locations'
+    CACHE = 'locations'
+    DATA_CLASS = Location
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -45,11 +291,10 @@ class LocationAPI(BaseManager):
         self.campaign = campaign
         self.campaign_id = campaign.id
         self.locations = list()
+        self.index = None
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/locations'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/locations/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/locations'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/locations/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -68,7 +313,7 @@ class LocationAPI(BaseManager):
         if self.locations:
             return self.locations
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -82,12 +327,34 @@ class LocationAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.locations = [
-                from_dict(data_class=Location, data=location) for location in json.loads(response.text).get("data")
+                self._decode(location) for location in json.loads(response.text).get("data")
             ]
 
         return self.locations
 
 
+    def clear_cache(self):
+        """Drops the cached locations and their hierarchy index"""
+        super().clear_cache()
+        self.index = None
+
+
+    def get_index(self) -> LocationIndex:
+        """
+        Retrieves the location hierarchy index, building it from the available locations
+
+        Raises:
+            KankaException: Kanka Api Interface Exception
+
+        Returns:
+            index: the location hierarchy index
+        """
+        if self.index is None:
+            self.index = LocationIndex(self.get_all())
+
+        return self.index
+
+
     def get(self, name_or_id: str or int) -> dict:
         """
         Retrives the desired location by name
@@ -135,7 +402,7 @@ class LocationAPI(BaseManager):
         Returns:
             location: the requested location
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -150,7 +417,7 @@ class LocationAPI(BaseManager):
         location = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Location, data=location)
+        return self._decode(location)
 
 
     def create(self, location: dict) -> dict:
@@ -166,7 +433,7 @@ class LocationAPI(BaseManager):
         Returns:
             location: the created location
         """
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(location))
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(location))
 
         if not response.ok:
             self.logger.error('Failed to create location %s in campaign %s', location.get('name', 'None'), self.campaign.get('name'))
@@ -175,6 +442,9 @@ class LocationAPI(BaseManager):
         location = json.loads(response.text).get('data')
         self.logger.debug(response.json())
 
+        if self.index is not None:
+            self.index.add(location)
+
         return location
 
 
@@ -191,7 +461,10 @@ class LocationAPI(BaseManager):
         Returns:
             location: the updated location
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % location.get('id'), request=PUT, data=json.dumps(location))
+        if self.index is not None and self.index.creates_cycle(location.get('id'), location.get('parent_location_id')):
+            raise self.KankaException(reason=f"Location {location.get('id')} cannot be nested inside itself", code=422, message='Unprocessable Entity')
+
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % location.get('id'), request=PUT, data=json.dumps(location))
 
         if not response.ok:
             self.logger.error('Failed to update location %s in campaign %s', location.get('name', 'None'), self.campaign.get('name'))
@@ -200,6 +473,9 @@ class LocationAPI(BaseManager):
         location = json.loads(response.text).get('data')
         self.logger.debug(response.json())
 
+        if self.index is not None:
+            self.index.move(location.get('id'), location.get('parent_location_id'))
+
         return location
 
 
@@ -216,11 +492,15 @@ class LocationAPI(BaseManager):
         Returns:
             bool: whether the location is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete location %s in campaign %s', id, self.campaign.get('name'))
             raise self.KankaException(response.text, response.status_code, message=response.reason)
 
         self.logger.debug(response)
+
+        if self.index is not None:
+            self.index.remove(id)
+
         return True
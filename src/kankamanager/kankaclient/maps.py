@@ -16,6 +16,9 @@ class MapAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'maps'
+    CACHE = 'maps'
+    DATA_CLASS = None
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -24,10 +27,8 @@ class MapAPI(BaseManager):
         self.campaign_id = campaign.id
         self.maps = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/maps'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/maps/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/maps'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/maps/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -46,17 +47,16 @@ class MapAPI(BaseManager):
         if self.maps:
             return self.maps
 
-        maps = list()
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve maps from campaign %s', self.campaign.get('name'))
             raise self.KankaException(response.text, response.status_code, message=response.reason)
 
-        maps = json.loads(response.text).get('data')
+        self.maps = json.loads(response.text).get('data')
         self.logger.debug(response.json())
 
-        return maps
+        return self.maps
 
 
     def get(self, name_or_id: str or int) -> dict:
@@ -101,7 +101,7 @@ class MapAPI(BaseManager):
         Returns:
             map: the requested map
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve map %s from campaign %s', id, self.campaign.get('name'))
@@ -126,7 +126,7 @@ class MapAPI(BaseManager):
         Returns:
             map: the created map
         """
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(map))
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(map))
 
         if not response.ok:
             self.logger.error('Failed to create map %s in campaign %s', map.get('name', 'None'), self.campaign.get('name'))
@@ -151,7 +151,7 @@ class MapAPI(BaseManager):
         Returns:
             map: the updated map
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % map.get('id'), request=PUT, data=json.dumps(map))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % map.get('id'), request=PUT, data=json.dumps(map))
 
         if not response.ok:
             self.logger.error('Failed to update map %s in campaign %s', map.get('name', 'None'), self.campaign.get('name'))
@@ -176,7 +176,7 @@ class MapAPI(BaseManager):
         Returns:
             bool: whether the map is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete map %s in campaign %s', id, self.campaign.get('name'))
@@ -0,0 +1,238 @@
+"""
+Kanka Client Metrics
+
+Counters and histograms recorded around the managers' requests and decoding,
+labelled by endpoint, with a plain text summary and a Prometheus text exporter.
+Hooks receive every event as it is recorded. Spans time the phases of a command
+(init, resolve, fetch, decode, render).
+
+"""
+from __future__ import absolute_import
+
+import re
+import time
+import threading
+import contextlib
+from typing import Callable
+
+from kankamanager.kankaclient.constants import BASE_URL, METRIC_BUCKETS
+
+
+def endpoint(url: str) -> str:
+    """
+    Returns the endpoint label of a request url, ids replaced by {id}
+
+    Args:
+        url (str): the request url
+
+    Returns:
+        str: the endpoint label, e.g. characters/{id}
+    """
+    path = url.split('?')[0]
+    if path.startswith(BASE_URL):
+        path = path[len(BASE_URL):]
+    segments = [segment for segment in path.split('/') if segment]
+    if not segments:
+        return 'campaigns'
+
+    # The first segment is the campaign id
+    segments = ['{id}' if re.fullmatch(r'\d+', segment) else segment for segment in segments[1:]]
+    return '/'.join(segments) or 'campaign'
+
+
+class Histogram(object):
+    """Cumulative bucket counts, sum and maximum of the observed values"""
+
+    def __init__(self, buckets: list=METRIC_BUCKETS):
+        self.buckets = list(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class Metrics(object):
+    """
+    Registry of the client metrics, safe to record from several threads
+
+    Counters: requests, retries, throttled, errors, response_bytes, wire_bytes, body_bytes, body_wire_bytes
+    Histograms: request_seconds, limiter_seconds, throttle_seconds, decode_seconds, phase_seconds
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = dict()
+        self.histograms = dict()
+        self.hooks = list()
+        # The open spans of each thread: [phase, start, time spent in nested spans]
+        self.phases = dict()
+
+
+    def add_hook(self, hook: Callable):
+        """
+        Registers a hook called as hook(name, endpoint, value) on every event
+
+        Args:
+            hook (function): the event hook
+        """
+        self.hooks.append(hook)
+
+
+    def count(self, name: str, endpoint: str, value: int=1):
+        """Increments a counter"""
+        with self.lock:
+            key = (name, endpoint)
+            self.counters[key] = self.counters.get(key, 0) + value
+        for hook in self.hooks:
+            hook(name, endpoint, value)
+
+
+    def observe(self, name: str, endpoint: str, value: float):
+        """Records a value in a histogram"""
+        with self.lock:
+            key = (name, endpoint)
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+        for hook in self.hooks:
+            hook(name, endpoint, value)
+
+
+    @contextlib.contextmanager
+    def span(self, phase: str):
+        """
+        Times a phase, recorded in phase_seconds without the time of the spans nested in it
+
+        Args:
+            phase (str): the phase name
+        """
+        stack = self.phases.setdefault(threading.get_ident(), list())
+        frame = [phase, time.perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            if stack:
+                stack[-1][2] += elapsed
+            self.observe('phase_seconds', phase, elapsed - frame[2])
+
+
+    def current(self, thread: int) -> list:
+        """
+        Returns the open phases of a thread, outermost first
+
+        Args:
+            thread (int): the thread identifier
+
+        Returns:
+            list: the phase names
+        """
+        return [frame[0] for frame in list(self.phases.get(thread, ()))]
+
+
+    def reset(self):
+        """Drops every recorded value"""
+        with self.lock:
+            self.counters = dict()
+            self.histograms = dict()
+
+
+    def summary(self) -> dict:
+        """
+        Summarizes the recorded values per endpoint
+
+        Returns:
+            dict: the counters and histogram totals of each endpoint
+        """
+        summary = dict()
+        with self.lock:
+            for (name, label), value in self.counters.items():
+                summary.setdefault(label, dict())[name] = value
+            for (name, label), histogram in self.histograms.items():
+                summary.setdefault(label, dict())[name] = {
+                    'count': histogram.count, 'sum': histogram.sum, 'max': histogram.max
+                }
+
+        return dict(sorted(summary.items()))
+
+
+    def render(self) -> str:
+        """
+        Renders the per-endpoint summary as a text table
+
+        Returns:
+            str: the summary table
+        """
+        header = ['endpoint', 'requests', 'retries', '429s', 'errors', 'bytes', 'wire', 'req avg ms', 'req max ms', 'wait s', 'decode ms']
+        rows = list()
+        for label, values in self.summary().items():
+            if set(values) == {'phase_seconds'}:
+                # Phase timings are reported by --profile
+                continue
+            request = values.get('request_seconds', {'count': 0, 'sum': 0.0, 'max': 0.0})
+            wait = sum(values.get(name, {}).get('sum', 0.0) for name in ('limiter_seconds', 'throttle_seconds'))
+            rows.append([
+                label,
+                values.get('requests', 0),
+                values.get('retries', 0),
+                values.get('throttled', 0),
+                values.get('errors', 0),
+                values.get('response_bytes', 0),
+                values.get('wire_bytes', 0),
+                f'{1000 * request["sum"] / request["count"]:.1f}' if request['count'] else '-',
+                f'{1000 * request["max"]:.1f}' if request['count'] else '-',
+                f'{wait:.2f}',
+                f'{1000 * values.get("decode_seconds", {}).get("sum", 0.0):.1f}',
+            ])
+
+        widths = [max(len(str(row[index])) for row in [header] + rows) for index in range(len(header))]
+        lines = ['  '.join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip() for row in [header] + rows]
+
+        return '\n'.join(lines) + '\n'
+
+
+    def prometheus(self, prefix: str='kanka') -> str:
+        """
+        Exports the metrics in the Prometheus text exposition format
+
+        Args:
+            prefix (str, optional): the metric name prefix. Defaults to 'kanka'.
+
+        Returns:
+            str: the exposition text
+        """
+        lines = list()
+        with self.lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f'# TYPE {prefix}_{name}_total counter')
+                for (_name, label), value in sorted(self.counters.items()):
+                    if _name == name:
+                        lines.append(f'{prefix}_{name}_total{{endpoint="{label}"}} {value}')
+
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f'# TYPE {prefix}_{name} histogram')
+                for (_name, label), histogram in sorted(self.histograms.items()):
+                    if _name != name:
+                        continue
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{prefix}_{name}_bucket{{endpoint="{label}",le="{bound}"}} {count}')
+                    lines.append(f'{prefix}_{name}_bucket{{endpoint="{label}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{prefix}_{name}_sum{{endpoint="{label}"}} {histogram.sum}')
+                    lines.append(f'{prefix}_{name}_count{{endpoint="{label}"}} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# The registry every manager records into
+METRICS = Metrics()
@@ -16,6 +16,9 @@ class NoteAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'notes'
+    CACHE = 'notes'
+    DATA_CLASS = None
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -24,10 +27,8 @@ class NoteAPI(BaseManager):
         self.campaign_id = campaign.id
         self.notes = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/notes'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/notes/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/notes'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/notes/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -46,17 +47,16 @@ class NoteAPI(BaseManager):
         if self.notes:
             return self.notes
 
-        notes = list()
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve notes from campaign %s', self.campaign.get('name'))
             raise self.KankaException(response.text, response.status_code, message=response.reason)
 
-        notes = json.loads(response.text).get('data')
+        self.notes = json.loads(response.text).get('data')
         self.logger.debug(response.json())
 
-        return notes
+        return self.notes
 
 
     def get(self, name_or_id: str or int) -> dict:
@@ -101,7 +101,7 @@ class NoteAPI(BaseManager):
         Returns:
             note: the requested note
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve note %s from campaign %s', id, self.campaign.get('name'))
@@ -126,7 +126,7 @@ class NoteAPI(BaseManager):
         Returns:
             note: the created note
         """
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(note))
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(note))
 
         if not response.ok:
             self.logger.error('Failed to create note %s in campaign %s', note.get('name', 'None'), self.campaign.get('name'))
@@ -151,7 +151,7 @@ class NoteAPI(BaseManager):
         Returns:
             note: the updated note
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % note.get('id'), request=PUT, data=json.dumps(note))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % note.get('id'), request=PUT, data=json.dumps(note))
 
         if not response.ok:
             self.logger.error('Failed to update note %s in campaign %s', note.get('name', 'None'), self.campaign.get('name'))
@@ -176,7 +176,7 @@ class NoteAPI(BaseManager):
         Returns:
             bool: whether the note is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete note %s in campaign %s', id, self.campaign.get('name'))
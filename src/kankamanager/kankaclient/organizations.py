@@ -16,6 +16,9 @@ class OrganizationAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'organizations'
+    CACHE = 'organizations'
+    DATA_CLASS = None
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -24,10 +27,8 @@ class OrganizationAPI(BaseManager):
         self.campaign_id = campaign.id
         self.organizations = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/organizations'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/organizations/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/organizations'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/organizations/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -46,17 +47,16 @@ class OrganizationAPI(BaseManager):
         if self.organizations:
             return self.organizations
 
-        organizations = list()
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve organizations from campaign %s', self.campaign.get('name'))
             raise self.KankaException(response.text, response.status_code, message=response.reason)
 
-        organizations = json.loads(response.text).get('data')
+        self.organizations = json.loads(response.text).get('data')
         self.logger.debug(response.json())
 
-        return organizations
+        return self.organizations
 
 
     def get(self, name_or_id: str or int) -> dict:
@@ -101,7 +101,7 @@ class OrganizationAPI(BaseManager):
         Returns:
             organization: the requested organization
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve organization %s from campaign %s', id, self.campaign.get('name'))
@@ -126,7 +126,7 @@ class OrganizationAPI(BaseManager):
         Returns:
             organization: the created organization
         """
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(organization))
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(organization))
 
         if not response.ok:
             self.logger.error('Failed to create organization %s in campaign %s', organization.get('name', 'None'), self.campaign.get('name'))
@@ -151,7 +151,7 @@ class OrganizationAPI(BaseManager):
         Returns:
             organization: the updated organization
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % organization.get('id'), request=PUT, data=json.dumps(organization))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % organization.get('id'), request=PUT, data=json.dumps(organization))
 
         if not response.ok:
             self.logger.error('Failed to update organization %s in campaign %s', organization.get('name', 'None'), self.campaign.get('name'))
@@ -176,7 +176,7 @@ class OrganizationAPI(BaseManager):
         Returns:
             bool: whether the organization is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete organization %s in campaign %s', id, self.campaign.get('name'))
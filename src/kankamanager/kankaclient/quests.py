@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -35,6 +33,9 @@ class QuestAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'quests'
+    CACHE = 'quests'
+    DATA_CLASS = Quest
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -43,10 +44,8 @@ class QuestAPI(BaseManager):
         self.campaign_id = campaign.id
         self.quests = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/quests'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/quests/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/quests'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/quests/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -65,7 +64,7 @@ class QuestAPI(BaseManager):
         if self.quests:
             return self.quests
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -79,7 +78,7 @@ class QuestAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.quests = [
-                from_dict(data_class=Quest, data=quest) for quest in json.loads(response.text).get("data")
+                self._decode(quest) for quest in json.loads(response.text).get("data")
             ]
 
         return self.quests
@@ -131,7 +130,7 @@ class QuestAPI(BaseManager):
         Returns:
             quest: the requested quest
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -146,7 +145,7 @@ class QuestAPI(BaseManager):
         quest = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Quest, data=quest)
+        return self._decode(quest)
 
 
     def create(self, quest: dict) -> Quest:
@@ -163,7 +162,7 @@ class QuestAPI(BaseManager):
             quest: the created quest
         """
         response = self._request(
-            url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(quest)
+            url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(quest)
         )
 
         if not response.ok:
@@ -179,7 +178,7 @@ class QuestAPI(BaseManager):
         quest = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Quest, data=quest)
+        return self._decode(quest)
 
 
     def update(self, quest: dict) -> dict:
@@ -195,7 +194,7 @@ class QuestAPI(BaseManager):
         Returns:
             quest: the updated quest
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % quest.get('id'), request=PUT, data=json.dumps(quest))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % quest.get('id'), request=PUT, data=json.dumps(quest))
 
         if not response.ok:
             self.logger.error('Failed to update quest %s in campaign %s', quest.get('name', 'None'), self.campaign.get('name'))
@@ -220,7 +219,7 @@ class QuestAPI(BaseManager):
         Returns:
             bool: whether the quest is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete quest %s in campaign %s', id, self.campaign.get('name'))
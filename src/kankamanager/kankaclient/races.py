@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -34,6 +32,9 @@ class RaceAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'races'
+    CACHE = 'races'
+    DATA_CLASS = Race
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -42,10 +43,8 @@ class RaceAPI(BaseManager):
         self.campaign_id = campaign.id
         self.races = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/races'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/races/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/races'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/races/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -64,7 +63,7 @@ class RaceAPI(BaseManager):
         if self.races:
             return self.races
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -78,7 +77,7 @@ class RaceAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.races = [
-                from_dict(data_class=Race, data=race) for race in json.loads(response.text).get("data")
+                self._decode(race) for race in json.loads(response.text).get("data")
             ]
 
         return self.races
@@ -130,7 +129,7 @@ class RaceAPI(BaseManager):
         Returns:
             race: the requested race
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -145,7 +144,7 @@ class RaceAPI(BaseManager):
         race = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Race, data=race)
+        return self._decode(race)
 
 
     def create(self, race: dict) -> dict:
@@ -161,7 +160,7 @@ class RaceAPI(BaseManager):
         Returns:
             race: the created race
         """
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(race))
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(race))
 
         if not response.ok:
             self.logger.error('Failed to create race %s in campaign %s', race.get('name', 'None'), self.campaign.get('name'))
@@ -186,7 +185,7 @@ class RaceAPI(BaseManager):
         Returns:
             race: the updated race
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % race.get('id'), request=PUT, data=json.dumps(race))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % race.get('id'), request=PUT, data=json.dumps(race))
 
         if not response.ok:
             self.logger.error('Failed to update race %s in campaign %s', race.get('name', 'None'), self.campaign.get('name'))
@@ -211,7 +210,7 @@ class RaceAPI(BaseManager):
         Returns:
             bool: whether the race is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete race %s in campaign %s', id, self.campaign.get('name'))
@@ -0,0 +1,183 @@
+"""
+Kanka Import Scheduler
+
+Imports a whole campaign (e.g. the campaign_dir of another campaign) in
+dependency order. The reference fields of the entities form a graph: tags and
+races come before the characters using them, parent locations before their
+children, characters before the dice rolls of their character_id. Every level
+of the graph is created concurrently, and the references to the entities'
+local ids are remapped to the ids Kanka assigns as the creations complete.
+
+"""
+from __future__ import absolute_import
+
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from kankamanager.kankaclient.bulk import REFERENCES, BulkCreator, _value
+from kankamanager.kankaclient.constants import MAX_WORKERS
+
+
+class SchedulerError(Exception):
+    """Raised when the entities reference each other in a cycle"""
+
+
+class ImportScheduler(object):
+    """
+    Creates the entities of several types level by level of their references
+
+    A reference matching the local id (or name) of an imported entity of the
+    referenced type is an edge of the graph, any other id is kept as it is and
+    any other name is resolved against the campaign like BulkCreator does. The
+    dependents of an entity failing to create are skipped.
+    """
+
+    def __init__(self, client, batches: dict, max_workers: int=MAX_WORKERS):
+        """
+        Import Scheduler Constructor
+
+        Args:
+            client (KankaClient): the client of the destination campaign
+            batches (dict): the entities to import of each type, with their local ids
+            max_workers (int, optional): the entities created at once. Defaults to MAX_WORKERS.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.client = client
+        self.max_workers = max_workers
+        self.creator = BulkCreator(client, max_workers=max_workers)
+        self.lock = threading.Lock()
+        # The imported entities and their references, keyed by (entity type, local id or index)
+        self.nodes = dict()
+        self.edges = dict()
+        self.ids = dict()
+        self.created = dict()
+        self.failed = list()
+        self.skipped = list()
+
+        lookup = dict()
+        for entity, items in batches.items():
+            for index, data in enumerate(items):
+                node = (entity, data.get('id', f'#{index}'))
+                self.nodes[node] = data
+                lookup[(entity, node[1])] = node
+                if data.get('name') is not None:
+                    lookup.setdefault((entity, data.get('name')), node)
+
+        for node, data in self.nodes.items():
+            self.edges[node] = {
+                lookup.get((REFERENCES.get(field), value))
+                for field in REFERENCES for value in self._values(data.get(field))
+                if (REFERENCES.get(field), value) in lookup
+            } - {node}
+
+
+    @staticmethod
+    def _values(value) -> list:
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+
+    def levels(self) -> list:
+        """
+        Groups the entities by dependency level, each only referencing the levels before it
+
+        Raises:
+            SchedulerError: the entities reference each other in a cycle
+
+        Returns:
+            list: the entity nodes of each level
+        """
+        # Kahn's algorithm: each placed node releases the nodes referencing it
+        missing = {node: len(self.edges.get(node)) for node in self.nodes}
+        dependents = defaultdict(list)
+        for node in self.nodes:
+            for reference in self.edges.get(node):
+                dependents[reference].append(node)
+
+        levels = list()
+        pending = set(self.nodes)
+        level = sorted((node for node in self.nodes if not missing[node]), key=str)
+        while level:
+            levels.append(level)
+            pending.difference_update(level)
+            ready = list()
+            for node in level:
+                for dependent in dependents.get(node, ()):
+                    missing[dependent] -= 1
+                    if not missing[dependent]:
+                        ready.append(dependent)
+            level = sorted(ready, key=str)
+
+        if pending:
+            raise SchedulerError(f'Reference cycle between: {", ".join(f"{entity} {id}" for entity, id in sorted(pending, key=str))}')
+
+        return levels
+
+
+    def remap(self, node: tuple) -> dict:
+        """
+        Returns the entity to create, its imported references replaced by the created ids
+
+        Args:
+            node (tuple): the entity type and local id
+
+        Returns:
+            dict: the entity data
+        """
+        data = {field: value for field, value in self.nodes.get(node).items() if field != 'id'}
+        for field, entity in REFERENCES.items():
+            value = data.get(field)
+            if value is None:
+                continue
+            remapped = [self.ids.get((entity, item), item) for item in self._values(value)]
+            data[field] = remapped if isinstance(value, list) else remapped[0]
+
+        return self.creator.resolve(data)
+
+
+    def _create(self, node: tuple):
+        entity = node[0]
+        if any(dependency not in self.created for dependency in self.edges.get(node)):
+            self.logger.error('Skipped %s %s, a reference failed to import', entity, node[1])
+            with self.lock:
+                self.skipped.append(node)
+            return
+
+        try:
+            created = self.client.entities[entity].create(self.remap(node))
+        except Exception as ex:  # pylint: disable=broad-except
+            self.logger.error('Failed to import %s %s', entity, node[1])
+            self.logger.debug(ex)
+            with self.lock:
+                self.failed.append((node, ex))
+            return
+
+        self.creator.register(entity, created)
+        with self.lock:
+            self.created[node] = created
+            self.ids[node] = _value(created, 'id')
+            data = self.nodes.get(node)
+            if data.get('name') is not None:
+                self.ids.setdefault((entity, data.get('name')), _value(created, 'id'))
+
+
+    def run(self) -> dict:
+        """
+        Creates every level concurrently, one level after the other
+
+        Raises:
+            SchedulerError: the entities reference each other in a cycle
+
+        Returns:
+            dict: the server id of each imported entity, keyed by (entity type, local id)
+        """
+        levels = self.levels()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for depth, level in enumerate(levels):
+                list(executor.map(self._create, level))
+                self.logger.debug('Imported level %s of %s: %s entities', depth + 1, len(levels), len(level))
+
+        return {node: id for node, id in self.ids.items() if node in self.nodes}
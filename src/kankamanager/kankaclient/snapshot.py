@@ -0,0 +1,112 @@
+"""
+Kanka Snapshot
+
+Compact binary (msgpack) snapshot of every manager's cached entities. The file
+holds a header (format version, campaign and, per entity type, the dataclass
+field order) followed by the entities as rows of values in that order.
+
+"""
+from __future__ import absolute_import
+
+import time
+from dataclasses import asdict, fields
+
+import msgpack
+from dacite import from_dict
+
+from kankamanager.kankaclient.constants import SNAPSHOT_FORMAT, SNAPSHOT_VERSION
+
+
+def write_snapshot(client, path: str) -> dict:
+    """
+    Writes the entities of every manager of the client to a snapshot
+
+    Args:
+        client (KankaClient): the client to snapshot
+        path (str): the snapshot file path
+
+    Raises:
+        KankaException: Kanka Api Interface Exception
+
+    Returns:
+        dict: the number of entities written per entity type
+    """
+    schema = dict()
+    rows = dict()
+    for entity, manager in client.entities.items():
+        if entity == 'campaign':
+            continue
+        data_class = manager.DATA_CLASS
+        entities = manager.get_all()
+        if data_class is None:
+            schema[entity] = None
+            rows[entity] = list(entities)
+        else:
+            names = [field.name for field in fields(data_class)]
+            schema[entity] = names
+            rows[entity] = [[getattr(_entity, name) for name in names] for _entity in entities]
+
+    header = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'created_at': time.time(),
+        'campaign': asdict(client.campaigns.campaign),
+        'schema': schema,
+    }
+    with open(path, 'wb') as snapshot:
+        packer = msgpack.Packer()
+        snapshot.write(packer.pack(header))
+        snapshot.write(packer.pack(rows))
+
+    return {entity: len(_rows) for entity, _rows in rows.items()}
+
+
+def read_snapshot(path: str) -> tuple:
+    """
+    Reads a snapshot written by write_snapshot
+
+    Args:
+        path (str): the snapshot file path
+
+    Raises:
+        ValueError: the file is not a supported snapshot
+
+    Returns:
+        tuple: the snapshot header and the raw entity dicts per entity type
+    """
+    with open(path, 'rb') as snapshot:
+        unpacker = msgpack.Unpacker(snapshot, raw=False, strict_map_key=False)
+        header = unpacker.unpack()
+        if not isinstance(header, dict) or header.get('format') != SNAPSHOT_FORMAT:
+            raise ValueError(f'Not a Kanka snapshot: {path}')
+        if header.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f'Unsupported snapshot version {header.get("version")}: {path}')
+        rows = unpacker.unpack()
+
+    entities = dict()
+    for entity, names in header.get('schema').items():
+        if names is None:
+            entities[entity] = rows.get(entity)
+        else:
+            entities[entity] = [dict(zip(names, row)) for row in rows.get(entity)]
+
+    return header, entities
+
+
+def load_snapshot(client, entities: dict):
+    """
+    Seeds the managers' caches with the entities of a snapshot
+
+    Args:
+        client (KankaClient): the client to seed
+        entities (dict): the raw entity dicts per entity type
+    """
+    for entity, data in entities.items():
+        manager = client.entities.get(entity)
+        if manager is None:
+            continue
+        if manager.DATA_CLASS is not None:
+            data = [from_dict(data_class=manager.DATA_CLASS, data=_entity) for _entity in data]
+        setattr(manager, manager.CACHE, data)
+        if entity == 'tags':
+            manager.tag_map = {tag.id: tag.name for tag in data}
@@ -10,8 +10,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from dacite import from_dict
-
 from kankamanager.kankaclient.constants import BASE_URL, GET, POST, DELETE, PUT
 from kankamanager.kankaclient.base import BaseManager, Entity
 
@@ -36,6 +34,9 @@ class TagAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'tags'
+    CACHE = 'tags'
+    DATA_CLASS = Tag
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -45,15 +46,19 @@ class TagAPI(BaseManager):
         self.tags = list()
         self.tag_map = dict()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/tags'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/tags/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/tags'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/tags/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
 
 
+    def clear_cache(self):
+        """Drops the cached tags and their id to name map"""
+        super().clear_cache()
+        self.tag_map = dict()
+
+
     def get_all(self) -> list:
         """
         Retrieves the available tags from Kanka
@@ -67,7 +72,7 @@ class TagAPI(BaseManager):
         if self.tags:
             return self.tags
 
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -81,7 +86,7 @@ class TagAPI(BaseManager):
         self.logger.debug(response.json())
         if response.text:
             self.tags = [
-                from_dict(data_class=Tag, data=tag) for tag in json.loads(response.text).get("data")
+                self._decode(tag) for tag in json.loads(response.text).get("data")
             ]
             for tag in self.tags:
                 self.tag_map.update({tag.id: tag.name})
@@ -135,7 +140,7 @@ class TagAPI(BaseManager):
         Returns:
             tag: the requested tag
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error(
@@ -150,7 +155,7 @@ class TagAPI(BaseManager):
         tag = json.loads(response.text).get("data")
         self.logger.debug(response.json())
 
-        return from_dict(data_class=Tag, data=tag)
+        return self._decode(tag)
 
 
     def create(self, tag: dict) -> dict:
@@ -166,7 +171,7 @@ class TagAPI(BaseManager):
         Returns:
             tag: the created tag
         """
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(tag))
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(tag))
 
         if not response.ok:
             self.logger.error('Failed to create tag %s in campaign %s', tag.get('name', 'None'), self.campaign.get('name'))
@@ -191,7 +196,7 @@ class TagAPI(BaseManager):
         Returns:
             tag: the updated tag
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % tag.get('id'), request=PUT, data=json.dumps(tag))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % tag.get('id'), request=PUT, data=json.dumps(tag))
 
         if not response.ok:
             self.logger.error('Failed to update tag %s in campaign %s', tag.get('name', 'None'), self.campaign.get('name'))
@@ -216,7 +221,7 @@ class TagAPI(BaseManager):
         Returns:
             bool: whether the tag is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete tag %s in campaign %s', id, self.campaign.get('name'))
@@ -16,6 +16,9 @@ class TimelineAPI(BaseManager):
 
     GET_ALL_CREATE_SINGLE: str
     GET_UPDATE_DELETE_SINGLE: str
+    ENDPOINT = 'timelines'
+    CACHE = 'timelines'
+    DATA_CLASS = None
 
     def __init__(self, token, campaign, verbose=False, throttle=False):
         super().__init__(token=token, verbose=verbose, throttle=throttle)
@@ -24,10 +27,8 @@ class TimelineAPI(BaseManager):
         self.campaign_id = campaign.id
         self.timelines = list()
 
-        global GET_ALL_CREATE_SINGLE
-        global GET_UPDATE_DELETE_SINGLE
-        GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/timelines'
-        GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/timelines/%s'
+        self.GET_ALL_CREATE_SINGLE = BASE_URL + f'/{self.campaign_id}/timelines'
+        self.GET_UPDATE_DELETE_SINGLE = BASE_URL + f'/{self.campaign_id}/timelines/%s'
 
         if verbose:
             self.logger.setLevel(logging.DEBUG)
@@ -46,17 +47,16 @@ class TimelineAPI(BaseManager):
         if self.timelines:
             return self.timelines
 
-        timelines = list()
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=GET)
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve timelines from campaign %s', self.campaign.get('name'))
             raise self.KankaException(response.text, response.status_code, message=response.reason)
 
-        timelines = json.loads(response.text).get('data')
+        self.timelines = json.loads(response.text).get('data')
         self.logger.debug(response.json())
 
-        return timelines
+        return self.timelines
 
 
     def get(self, name_or_id: str or int) -> dict:
@@ -101,7 +101,7 @@ class TimelineAPI(BaseManager):
         Returns:
             timeline: the requested timeline
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=GET)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=GET)
 
         if not response.ok:
             self.logger.error('Failed to retrieve timeline %s from campaign %s', id, self.campaign.get('name'))
@@ -126,7 +126,7 @@ class TimelineAPI(BaseManager):
         Returns:
             timeline: the created timeline
         """
-        response = self._request(url=GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(timeline))
+        response = self._request(url=self.GET_ALL_CREATE_SINGLE, request=POST, data=json.dumps(timeline))
 
         if not response.ok:
             self.logger.error('Failed to create timeline %s in campaign %s', timeline.get('name', 'None'), self.campaign.get('name'))
@@ -151,7 +151,7 @@ class TimelineAPI(BaseManager):
         Returns:
             timeline: the updated timeline
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % timeline.get('id'), request=PUT, data=json.dumps(timeline))
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % timeline.get('id'), request=PUT, data=json.dumps(timeline))
 
         if not response.ok:
             self.logger.error('Failed to update timeline %s in campaign %s', timeline.get('name', 'None'), self.campaign.get('name'))
@@ -176,7 +176,7 @@ class TimelineAPI(BaseManager):
         Returns:
             bool: whether the timeline is successfully deleted
         """
-        response = self._request(url=GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
+        response = self._request(url=self.GET_UPDATE_DELETE_SINGLE % id, request=DELETE)
 
         if not response.ok:
             self.logger.error('Failed to delete timeline %s in campaign %s', id, self.campaign.get('name'))
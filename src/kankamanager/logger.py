@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Program logger, kept free of heavy imports for fast CLI startup"""
+# ---------------------------------------------------------------------------
+import os
+import logging
+from kankaclient.constants import (
+    LOG_FORMAT,
+    LOG_DATE_FORMAT
+)
+# ---------------------------------------------------------------------------
+
+LOGLEVEL = os.environ.get('LOGLEVEL', 'WARNING').upper()
+LOGGER = logging.getLogger("KankaManager")
+
+
+def get_logger():
+    """ Initialize Logger """
+    global LOGGER  # pylint: disable=global-statement
+    if not LOGGER:
+        log_formatter = logging.Formatter(
+            fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT
+        )
+        handler = logging.StreamHandler()
+        handler.setFormatter(log_formatter)
+        LOGGER.addHandler(handler)
+
+    return LOGGER
+
+__all__ = [
+    'get_logger'
+]
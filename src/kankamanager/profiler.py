@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Profiles a command: phase wall times, cProfile stats and folded stacks"""
+# ---------------------------------------------------------------------------
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import contextlib
+from collections import Counter
+
+from kankamanager.kankaclient.metrics import METRICS
+from kankamanager.kankaclient.constants import PROFILE_INTERVAL
+# ---------------------------------------------------------------------------
+
+# Functions listed in the profile report
+TOP_FUNCTIONS = 20
+
+
+class Sampler(threading.Thread):
+    """
+    Samples the stacks of every other thread at a fixed interval
+
+    Each sample is folded as root;...;leaf, prefixed with the phases open in
+    the sampled thread, the format of flamegraph.pl and speedscope. Unlike
+    cProfile, the samples also cover the worker threads of pull and push.
+    """
+
+    def __init__(self, interval: float=PROFILE_INTERVAL):
+        super().__init__(name='profiler', daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+
+    def run(self):
+        ident = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            for thread, frame in sys._current_frames().items():  # pylint: disable=protected-access
+                if thread != ident:
+                    self.stacks[self.fold(thread, frame)] += 1
+
+
+    @staticmethod
+    def fold(thread: int, frame) -> str:
+        """
+        Folds a thread's stack into one line
+
+        Args:
+            thread (int): the thread identifier
+            frame (frame): the innermost frame of the thread
+
+        Returns:
+            str: the phases then the functions of the stack, outermost first
+        """
+        functions = list()
+        while frame is not None:
+            code = frame.f_code
+            functions.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{code.co_firstlineno})')
+            frame = frame.f_back
+
+        phases = [f'[{phase}]' for phase in METRICS.current(thread)]
+        return ';'.join(phases + functions[::-1])
+
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+    def write(self, path: str):
+        """
+        Writes the folded stacks, one "stack count" per line
+
+        Args:
+            path (str): the output file
+        """
+        with open(path, 'w') as folded:
+            for stack, count in sorted(self.stacks.items()):
+                folded.write(f'{stack} {count}\n')
+
+
+def phases() -> str:
+    """
+    Renders the wall time of every phase, without the time of its nested phases
+
+    Returns:
+        str: the phase table
+    """
+    rows = [
+        (label, values.get('phase_seconds'))
+        for label, values in METRICS.summary().items() if 'phase_seconds' in values
+    ]
+    lines = [f'{"phase":<10} {"count":>7} {"seconds":>9}']
+    for label, histogram in sorted(rows, key=lambda row: -row[1].get('sum')):
+        lines.append(f'{label:<10} {histogram.get("count"):>7} {histogram.get("sum"):>9.3f}')
+
+    return '\n'.join(lines) + '\n'
+
+
+@contextlib.contextmanager
+def profile(prefix: str, interval: float=PROFILE_INTERVAL, stream=None):
+    """
+    Profiles the enclosed code, writing <prefix>.prof (pstats) and <prefix>.folded
+    (collapsed stacks) then printing the phase times and the costliest functions
+
+    Args:
+        prefix (str): the output files prefix
+        interval (float, optional): seconds between stack samples. Defaults to PROFILE_INTERVAL.
+        stream (file, optional): where the report is printed. Defaults to stderr.
+    """
+    stream = stream or sys.stderr
+    profiler = cProfile.Profile()
+    sampler = Sampler(interval)
+    sampler.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+
+        profiler.dump_stats(f'{prefix}.prof')
+        sampler.write(f'{prefix}.folded')
+
+        stream.write(f'\nProfiled {elapsed:.3f}s, {sum(sampler.stacks.values())} samples\n\n')
+        stream.write(phases())
+        stream.write('\n')
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        stream.write(f'Written {prefix}.prof and {prefix}.folded\n')
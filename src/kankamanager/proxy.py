@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Local read-through caching proxy in front of the Kanka API"""
+# ---------------------------------------------------------------------------
+import re
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.kankamanager.logger import get_logger
+from kankamanager.kankaclient.base import SESSION, RateLimiter, SingleFlight, retry_after
+from kankamanager.kankaclient.constants import (
+    UPSTREAM_URL, MAX_ATTEMPTS, PROXY_HOST, PROXY_PORT, PROXY_TTL, GET
+)
+# ---------------------------------------------------------------------------
+
+LOGGER = get_logger()
+
+PREFIX = '/campaigns'
+
+# Response headers worth relaying to the tools behind the proxy
+HEADERS = ['Content-Type', 'Retry-After', 'X-RateLimit-Limit', 'X-RateLimit-Remaining']
+
+# A Host header naming a host name or IP address, with an optional port
+HOST = re.compile(r'(?P<name>[A-Za-z0-9.-]+|\[[0-9A-Fa-f:.]+\])(?::(?P<port>\d+))?')
+
+# Addresses listening on every interface, whose links name the interface the caller reached
+ANY_ADDRESS = ('', '0.0.0.0', '::')
+
+
+class ProxyCache(object):
+    """
+    Read-through cache of upstream Kanka responses
+
+    GET responses are kept for `ttl` seconds, keyed by the caller's
+    Authorization header and the request path, so tokens never see each
+    other's data. Concurrent misses on the same key share one upstream
+    request, and every upstream request goes through one rate limiter.
+    Writes are relayed as is and drop the cached pages of their endpoint; a
+    GET still in flight when its endpoint is invalidated is not cached.
+    """
+
+    def __init__(self, upstream: str=UPSTREAM_URL, ttl: float=PROXY_TTL, limiter: RateLimiter=None):
+        self.upstream = upstream
+        self.ttl = ttl
+        self.limiter = limiter or RateLimiter()
+        self.lock = threading.Lock()
+        self.entries = dict()
+        # Invalidations of each endpoint, misses only fill the cache if none happened meanwhile
+        self.generations = dict()
+        self.flight = SingleFlight()
+
+
+    @staticmethod
+    def _endpoint(path: str) -> str:
+        return '/'.join(path.split('?')[0].split('/')[:3])
+
+
+    def _fetch(self, method: str, path: str, headers: dict, body: bytes=None) -> tuple:
+        """
+        Sends the request upstream, retrying while Kanka rate limits it
+
+        Args:
+            method (str): the request method
+            path (str): the request path, below /campaigns
+            headers (dict): the relayed request headers
+            body (bytes, optional): the request body
+
+        Returns:
+            tuple: the status code, relayed headers and body
+        """
+        response = None
+        for attempt in range(MAX_ATTEMPTS):
+            self.limiter.wait()
+            response = SESSION.request(method, self.upstream + path, headers=headers, data=body)
+            # The last 429 goes back to the caller with its Retry-After
+            if response.status_code != 429 or attempt == MAX_ATTEMPTS - 1:
+                break
+            LOGGER.debug('%s: Too many requests, trying again', path)
+            time.sleep(retry_after(response.headers))
+
+        relayed = {name: response.headers[name] for name in HEADERS if name in response.headers}
+        return response.status_code, relayed, response.content
+
+
+    def get(self, path: str, headers: dict) -> tuple:
+        """
+        Serves a GET from the cache, fetching it once on a miss
+
+        Args:
+            path (str): the request path, below /campaigns
+            headers (dict): the relayed request headers
+
+        Returns:
+            tuple: the status code, relayed headers and body
+        """
+        key = (headers.get('Authorization'), path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+
+        return self.flight.do(key, self._miss, key, path, headers)
+
+
+    def _miss(self, key: tuple, path: str, headers: dict) -> tuple:
+        """Fetches a missed GET and caches it when successful and not invalidated meanwhile"""
+        endpoint = self._endpoint(path)
+        with self.lock:
+            generation = self.generations.get(endpoint, 0)
+        result = self._fetch(GET, path, headers)
+        with self.lock:
+            if result[0] == 200 and self.generations.get(endpoint, 0) == generation:
+                self.entries[key] = (time.monotonic() + self.ttl, result)
+
+        return result
+
+
+    def write(self, method: str, path: str, headers: dict, body: bytes) -> tuple:
+        """
+        Relays a write upstream and invalidates the cached pages of its endpoint
+
+        Args:
+            method (str): the request method
+            path (str): the request path, below /campaigns
+            headers (dict): the relayed request headers
+            body (bytes): the request body
+
+        Returns:
+            tuple: the status code, relayed headers and body
+        """
+        result = self._fetch(method, path, headers, body)
+        self.invalidate(path)
+
+        return result
+
+
+    def invalidate(self, path: str):
+        """
+        Drops the cached responses of the endpoint of the provided path
+
+        Args:
+            path (str): a request path, e.g. /1234/characters/5
+        """
+        endpoint = self._endpoint(path)
+        with self.lock:
+            self.generations[endpoint] = self.generations.get(endpoint, 0) + 1
+            for key in [key for key in self.entries if self._endpoint(key[1]) == endpoint]:
+                del self.entries[key]
+
+
+def make_handler(cache: ProxyCache):
+    """
+    Builds the request handler serving the /campaigns routes from the cache
+
+    Args:
+        cache (ProxyCache): the shared cache
+
+    Returns:
+        type: the request handler class
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def _base(self) -> str:
+            """The proxy's own url, which the links to upstream pages are rewritten to"""
+            host, port = self.server.server_address[:2]
+            if host in ANY_ADDRESS:
+                # Only trust a Host header that names this proxy's port
+                match = HOST.fullmatch(self.headers.get('Host') or '')
+                host = match.group('name') if match and int(match.group('port') or 80) == port else 'localhost'
+            elif ':' in host:
+                host = f'[{host}]'
+
+            return f'http://{host}:{port}{PREFIX}'
+
+        def _relay(self, method: str):
+            if self.path != PREFIX and not self.path.startswith((PREFIX + '/', PREFIX + '?')):
+                self.send_error(404, 'Not Found')
+                return
+
+            path = self.path[len(PREFIX):]
+            headers = {name: self.headers[name] for name in ('Authorization', 'Content-type', 'Content-Encoding', 'Accept') if self.headers[name]}
+            try:
+                if method == GET:
+                    status, relayed, body = cache.get(path, headers)
+                else:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    status, relayed, body = cache.write(method, path, headers, self.rfile.read(length))
+            except Exception as ex:
+                LOGGER.error('Upstream request failed: %s %s', method, path)
+                LOGGER.debug(ex)
+                self.send_error(502, 'Bad Gateway')
+                return
+
+            # Keep paginated clients on the proxy when following links.next
+            base = self._base()
+            for upstream, local in ((cache.upstream, base), (cache.upstream.replace('/', '\\/'), base.replace('/', '\\/'))):
+                body = body.replace(upstream.encode('utf-8'), local.encode('utf-8'))
+
+            self.send_response(status)
+            for name, value in relayed.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._relay('GET')
+
+        def do_POST(self):
+            self._relay('POST')
+
+        def do_PUT(self):
+            self._relay('PUT')
+
+        def do_PATCH(self):
+            self._relay('PATCH')
+
+        def do_DELETE(self):
+            self._relay('DELETE')
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            LOGGER.debug('%s - %s', self.address_string(), format % args)
+
+    return Handler
+
+
+def make_server(host: str=PROXY_HOST, port: int=PROXY_PORT, cache: ProxyCache=None) -> ThreadingHTTPServer:
+    """
+    Creates the proxy server
+
+    Args:
+        host (str, optional): the listening address. Defaults to PROXY_HOST.
+        port (int, optional): the listening port. Defaults to PROXY_PORT.
+        cache (ProxyCache, optional): the shared cache. Defaults to a new cache.
+
+    Returns:
+        ThreadingHTTPServer: the proxy server
+    """
+    return ThreadingHTTPServer((host, port), make_handler(cache or ProxyCache()))
+
+
+def serve(host: str=PROXY_HOST, port: int=PROXY_PORT, ttl: float=PROXY_TTL):
+    """
+    Runs the proxy until interrupted
+
+    Args:
+        host (str, optional): the listening address. Defaults to PROXY_HOST.
+        port (int, optional): the listening port. Defaults to PROXY_PORT.
+        ttl (float, optional): seconds a response stays cached. Defaults to PROXY_TTL.
+    """
+    with make_server(host, port, ProxyCache(ttl=ttl)) as server:
+        print(f'Proxying Kanka on: http://{host}:{port}{PREFIX}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+""" Sharded (one file per entity) campaign_dir storage"""
+# ---------------------------------------------------------------------------
+import os
+import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import yaml
+from src.kankamanager.utilities import (
+    get_logger,
+    dump_data,
+    read_data,
+    Dumper
+)
+from kankaclient.constants import MANIFEST, MAX_WORKERS
+# ---------------------------------------------------------------------------
+
+LOGGER = get_logger()
+
+
+def slugify(name: str) -> str:
+    """
+    Converts an entity name to a file name friendly slug
+
+    Args:
+        name (str): the entity name
+
+    Returns:
+        str: the slug
+    """
+    return re.sub(r'[^a-z0-9]+', '-', str(name or '').lower()).strip('-') or 'entity'
+
+
+def digest(text: str) -> str:
+    """
+    Returns the content hash of a serialized entity
+
+    Args:
+        text (str): the serialized entity
+
+    Returns:
+        str: the content hash
+    """
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class ShardedStore(object):
+    """
+    Stores the entities of one type as one YAML file per entity
+
+    The layout is <campaign_dir>/<entity>/<id>-<slug>.yaml, with a manifest
+    mapping each entity id to its shard and the hash of the content last
+    written or pushed. Writes only touch shards whose content changed, and
+    locally edited shards are detected by comparing against the manifest.
+    """
+
+    def __init__(self, campaign_dir: str, entity: str):
+        self.directory = os.path.join(campaign_dir, entity)
+        self.manifest_path = os.path.join(self.directory, MANIFEST)
+        self.manifest = read_data(self.manifest_path) or dict()
+
+
+    @staticmethod
+    def exists(campaign_dir: str, entity: str) -> bool:
+        """
+        Checks whether the entity type is stored with the sharded layout
+
+        Args:
+            campaign_dir (str): the campaign directory
+            entity (str): the entity type
+
+        Returns:
+            bool: whether a sharded manifest exists
+        """
+        return os.path.isfile(os.path.join(campaign_dir, entity, MANIFEST))
+
+
+    def _save_manifest(self):
+        with open(self.manifest_path, 'w') as manifest:
+            manifest.write(yaml.dump(self.manifest, Dumper=Dumper, sort_keys=True))
+
+
+    def write(self, entities: list) -> list:
+        """
+        Writes the provided entities, only touching shards whose content changed
+
+        Args:
+            entities (list): the entities (dicts with an id) to write
+
+        Returns:
+            list: the ids of the written entities
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        written = list()
+        seen = set()
+        for entity in entities:
+            seen.add(entity.get('id'))
+            if self._write_shard(entity):
+                written.append(entity.get('id'))
+
+        for id in set(self.manifest) - seen:
+            self._remove_shard(self.manifest.pop(id).get('file'))
+            written.append(id)
+
+        if written:
+            self._save_manifest()
+        LOGGER.debug('%s: %s of %s shards written', self.directory, len(written), len(seen))
+
+        return written
+
+
+    def _write_shard(self, entity: dict) -> bool:
+        id = entity.get('id')
+        text = dump_data(entity)
+        file = f'{id}-{slugify(entity.get("name"))}.yaml'
+        entry = self.manifest.get(id)
+        if entry and entry.get('hash') == digest(text) and entry.get('file') == file:
+            return False
+
+        if entry and entry.get('file') != file:
+            self._remove_shard(entry.get('file'))
+        with open(os.path.join(self.directory, file), 'w') as shard:
+            shard.write(text)
+        self.manifest[id] = {'file': file, 'hash': digest(text)}
+
+        return True
+
+
+    def _remove_shard(self, file: str):
+        try:
+            os.remove(os.path.join(self.directory, file))
+        except FileNotFoundError:
+            pass
+
+
+    def _read_shard(self, file: str):
+        return read_data(os.path.join(self.directory, file))
+
+
+    def read(self, ids: list=None) -> list:
+        """
+        Reads the stored entities, loading the shards in parallel
+
+        Args:
+            ids (list, optional): only read these entity ids. Defaults to all.
+
+        Returns:
+            list: the stored entities
+        """
+        if ids is not None:
+            ids = set(ids)
+        files = [entry.get('file') for id, entry in self.manifest.items() if ids is None or id in ids]
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            return [entity for entity in executor.map(self._read_shard, files) if entity is not None]
+
+
+    def changed(self) -> list:
+        """
+        Retrieves the ids of the shards edited since they were last written
+
+        Returns:
+            list: the ids of the locally changed entities
+        """
+        changed = list()
+        for id, entry in self.manifest.items():
+            path = os.path.join(self.directory, entry.get('file'))
+            if not os.path.isfile(path):
+                continue
+            with open(path, 'r') as shard:
+                if digest(shard.read()) != entry.get('hash'):
+                    changed.append(id)
+
+        return changed
+
+
+    def untracked(self) -> list:
+        """
+        Retrieves the shards added locally that are not in the manifest yet
+
+        Returns:
+            list: the untracked shard file names
+        """
+        tracked = {entry.get('file') for entry in self.manifest.values()}
+        return sorted(
+            file for file in os.listdir(self.directory)
+            if file.endswith('.yaml') and file != MANIFEST and file not in tracked
+        )
+
+
+    def mark(self, ids: list):
+        """
+        Records the current content of the provided shards as in sync with Kanka
+
+        Args:
+            ids (list): the synced entity ids
+        """
+        for id in ids:
+            entry = self.manifest.get(id)
+            with open(os.path.join(self.directory, entry.get('file')), 'r') as shard:
+                entry['hash'] = digest(shard.read())
+
+        if ids:
+            self._save_manifest()
+
+
+    def track(self, file: str, entity: dict):
+        """
+        Replaces an untracked shard with the entity created from it in Kanka
+
+        Args:
+            file (str): the untracked shard file name
+            entity (dict): the created entity, including its id
+        """
+        self._remove_shard(file)
+        self._write_shard(entity)
+        self._save_manifest()
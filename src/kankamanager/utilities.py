@@ -4,19 +4,42 @@
 """ Contains program utility functions"""
 # ---------------------------------------------------------------------------
 import os
+import sys
+import csv
 import json
+import itertools
 import yaml
-import logging
-from prettytable import PrettyTable
+from src.kankamanager.logger import get_logger
 from kankaclient.constants import (
-    LOG_FORMAT,
-    LOG_DATE_FORMAT,
-    DEFAULT_FIELDS
+    DEFAULT_FIELDS,
+    DEFAULT_REMOVE,
+    SEPARATOR,
+    TABLE_SAMPLE,
+    MIN_TRUNCATED_WIDTH
 )
 # ---------------------------------------------------------------------------
 
-LOGLEVEL = os.environ.get('LOGLEVEL', 'WARNING').upper()
-LOGGER = logging.getLogger("KankaManager")
+# Prefer the LibYAML bindings, fall back to the pure-Python implementation
+try:
+    from yaml import CSafeLoader as Loader, CSafeDumper as Dumper
+    from yaml.cyaml import CParser
+    from yaml.composer import Composer
+    from yaml.constructor import SafeConstructor
+    from yaml.resolver import Resolver
+
+    class EventLoader(CParser, Composer, SafeConstructor, Resolver):
+        """LibYAML events composed item by item (CSafeLoader only composes whole documents)"""
+
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+except ImportError:
+    from yaml import SafeLoader as Loader, SafeDumper as Dumper
+    from yaml import SafeLoader as EventLoader
+
+LOGGER = get_logger()
 
 class SpaceDumper(yaml.SafeDumper):
     # HACK: insert blank lines between top-level objects
@@ -25,57 +48,302 @@ class SpaceDumper(yaml.SafeDumper):
         super().write_line_break(data)
 
         if len(self.indents) == 1:
-            super().write_line_break('# ============================================================================================\n')
-
+            super().write_line_break(SEPARATOR)
 
-def get_logger():
-    """ Initialize Logger """
-    global LOGGER  # pylint: disable=global-statement
-    if not LOGGER:
-        log_formatter = logging.Formatter(
-            fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT
-        )
-        handler = logging.StreamHandler()
-        handler.setFormatter(log_formatter)
-        LOGGER.addHandler(handler)
-
-    return LOGGER
 
 __all__ = [
     'get_logger'
 ]
 
 
+def clean(entity) -> dict:
+    """
+    Returns the provided entity (dataclass or dict) as a dict with all
+    empty/blank attributes removed
+
+    Args:
+        entity (Entity or dict): the entity
+
+    Returns:
+        dict: the cleaned entity
+    """
+    if hasattr(entity, '_clean'):
+        return entity._clean()
+
+    return {
+        field: value for field, value in entity.items()
+        if value is not None and value != [] and value != '' and field not in DEFAULT_REMOVE
+    }
+
+
 def read_data(file):
     data = None
     if os.path.isfile(file):
         try:
             with open(file, 'r') as input_yaml:
-                data = yaml.safe_load(input_yaml.read())
+                data = yaml.load(input_yaml, Loader=Loader)
         except FileNotFoundError:
             pass
             #LOG ERROR
     return data
 
 
-def stamp(entities, args):
-    #TODO Re-optimize
+def iter_data(file):
+    """
+    Streams the entities of a YAML file one at a time
+
+    Multi-document files (as written by write_stream) are read document by
+    document with the fast loader. Single-list files (as written by write_data)
+    are walked item by item over the LibYAML parser events, so only one entity
+    is held in memory at a time either way.
+
+    Args:
+        file (str): the file path
+
+    Yields:
+        dict: the next entity in the file
+    """
+    if not os.path.isfile(file):
+        return
+
+    with open(file, 'r') as input_yaml:
+        loader = EventLoader(input_yaml)
+        try:
+            loader.get_event()
+            if loader.check_event(yaml.DocumentStartEvent):
+                loader.get_event()
+                if loader.check_event(yaml.SequenceStartEvent):
+                    loader.get_event()
+                    while not loader.check_event(yaml.SequenceEndEvent):
+                        loader.anchors = {}
+                        yield loader.construct_document(loader.compose_node(None, None))
+                    return
+        finally:
+            loader.dispose()
+
+        input_yaml.seek(0)
+        for entity in yaml.load_all(input_yaml, Loader=Loader):
+            if entity is not None:
+                yield entity
+
+
+def write_stream(file, entities) -> bool:
+    """
+    Writes the provided entities to a multi-document YAML file as they arrive
+
+    Args:
+        file (str): the file path
+        entities (iterable): the entities to write
+
+    Returns:
+        bool: whether the file was successfully written
+    """
+    try:
+        with open(file, 'w') as output_yaml:
+            for count, entity in enumerate(entities):
+                if count:
+                    output_yaml.write(SEPARATOR)
+                output_yaml.write(yaml.dump(entity, Dumper=Dumper, explicit_start=True, sort_keys=False))
+    except OSError as ex:
+        LOGGER.error('Failed to write data: %s', file)
+        LOGGER.debug(ex)
+        return False
+
+    return True
+
+
+def dump_data(data) -> str:
+    """
+    Serializes the provided entities to YAML, separating top-level entities
+
+    The C emitter cannot be hooked like SpaceDumper, so each top-level entity is
+    emitted on its own and the separator is inserted between them instead. The
+    output is identical to dumping with SpaceDumper.
+
+    Args:
+        data (list or dict): the data to serialize
+
+    Returns:
+        str: the serialized YAML
+    """
+    if not isinstance(data, list):
+        return yaml.dump(data, Dumper=Dumper, sort_keys=False)
+
+    return SEPARATOR.join(yaml.dump([entity], Dumper=Dumper, sort_keys=False) for entity in data)
+
+
+def write_data(file, data) -> bool:
+    """
+    Writes the provided entities to a YAML file
+
+    Args:
+        file (str): the file path
+        data (list or dict): the data to write
+
+    Returns:
+        bool: whether the file was successfully written
+    """
+    try:
+        with open(file, 'w') as output_yaml:
+            output_yaml.write(dump_data(data))
+    except OSError as ex:
+        LOGGER.error('Failed to write data: %s', file)
+        LOGGER.debug(ex)
+        return False
+
+    return True
+
+
+class TableWriter(object):
+    """
+    Renders a table progressively
+
+    Column widths are computed from the header and the first rows, after which
+    every row is written as it arrives, so large listings start printing
+    immediately and only the sample is held in memory. A later value longer
+    than its column widens it from that row on, under a new border. Values are
+    only truncated past max_width, when given.
+    """
+
+    def __init__(self, columns: list, stream, sample: int=TABLE_SAMPLE, max_width: int=None):
+        self.columns = columns
+        self.stream = stream
+        self.sample = sample
+        # The ellipsis needs room, narrower limits would cut values to nothing
+        self.max_width = max(max_width, MIN_TRUNCATED_WIDTH) if max_width else None
+        self.rows = list()
+        self.widths = None
+
+
+    def _border(self) -> str:
+        return '+' + '+'.join('-' * (width + 2) for width in self.widths) + '+\n'
+
+
+    def _line(self, values: list) -> str:
+        cells = list()
+        for value, width in zip(values, self.widths):
+            value = str(value)
+            if len(value) > width:
+                value = value[:width - 3] + '...'
+            cells.append(f' {value.center(width)} ')
+        return '|' + '|'.join(cells) + '|\n'
+
+
+    def _widen(self, row: list) -> bool:
+        """Widens the columns to the row's values (up to max_width), returns whether any changed"""
+        widths = list()
+        for width, value in zip(self.widths, row):
+            length = len(str(value))
+            if self.max_width is not None:
+                length = min(length, max(self.max_width, width))
+            widths.append(max(width, length))
+        changed = widths != self.widths
+        self.widths = widths
+        return changed
+
+
+    def _start(self):
+        self.widths = [len(str(column)) for column in self.columns]
+        for row in self.rows:
+            self._widen(row)
+
+        self.stream.write(self._border())
+        self.stream.write(self._line(self.columns))
+        self.stream.write(self._border())
+        for row in self.rows:
+            self.stream.write(self._line(row))
+        self.rows = list()
+
+
+    def add_row(self, row: list):
+        """
+        Adds a row to the table
+
+        Args:
+            row (list): the row values
+        """
+        if self.widths is None:
+            self.rows.append(row)
+            if len(self.rows) >= self.sample:
+                self._start()
+        else:
+            if self._widen(row):
+                self.stream.write(self._border())
+            self.stream.write(self._line(row))
+
+
+    def close(self):
+        """Writes any pending rows and the closing border"""
+        if self.widths is None:
+            self._start()
+        self.stream.write(self._border())
+
+
+def _field(entity, field: str):
+    if isinstance(entity, dict):
+        return entity.get(field)
+    return getattr(entity, field)
+
+
+def _asdict(entity) -> dict:
+    if isinstance(entity, dict):
+        return entity
+    return entity._asdict()
+
+
+def _project(entity, fields: list) -> dict:
+    if fields:
+        return {field: _field(entity, field) for field in fields}
+    return _asdict(entity)
+
+
+def _cell(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, separators=(',', ':'))
+    return value
+
+
+def stamp(entities, args, stream=None):
+    """
+    Writes the provided entities to stdout as they arrive
+
+    Args:
+        entities (iterable): the entities to write
+        args (Namespace): the command arguments (output format and fields)
+        stream (file, optional): the output stream. Defaults to stdout.
+    """
+    stream = stream or sys.stdout
     if args.output == 'yaml':
         for entity in entities:
-            yml = yaml.safe_dump(entity._asdict())
-            print(yml)
+            stream.write(yaml.dump(_asdict(entity), Dumper=Dumper))
+            stream.write('\n')
     elif args.output == 'json':
         for entity in entities:
-            js = json.dumps(entity._asdict(), indent = 4)
-            print(js)
+            stream.write(json.dumps(_asdict(entity), indent = 4))
+            stream.write('\n')
+    elif args.output == 'ndjson':
+        encode = json.JSONEncoder(separators=(',', ':')).encode
+        for entity in entities:
+            stream.write(encode(_project(entity, args.fields)))
+            stream.write('\n')
+    elif args.output == 'csv':
+        entities = iter(entities)
+        first = next(entities, None)
+        if first is not None:
+            columns = args.fields or list(_asdict(first))
+            writer = csv.writer(stream)
+            writer.writerow(columns)
+            for entity in itertools.chain([first], entities):
+                writer.writerow([_cell(_field(entity, column)) for column in columns])
     elif args.output == 'table':
         columns = ['Name', 'ID', 'Type', 'Tags']
         if args.fields:
             columns.extend(args.fields)
-        table = PrettyTable(columns)
+        table = TableWriter(columns, stream, max_width=getattr(args, 'max_width', None))
         for entity in entities:
-            row = [entity.name, entity.id, entity.type, entity.tags]
+            row = [_field(entity, 'name'), _field(entity, 'id'), _field(entity, 'type'), _field(entity, 'tags')]
             for arg in args.fields:
-                row.append(getattr(entity, arg))
+                row.append(_field(entity, arg))
             table.add_row(row)
-        print(table)
+        table.close()
+    stream.flush()
@@ -0,0 +1,30 @@
+from kankamanager.kankaclient.base import BaseManager
+from types import SimpleNamespace
+import itertools, threading
+
+class FakeManager(object):
+    KankaException = BaseManager.KankaException
+
+    def __init__(self, ids, log, existing=(), failing=()):
+        self.ids = ids
+        self.log = log
+        self.existing = list(existing)
+        self.failing = set(failing)
+        self.created = []
+        self.lock = threading.Lock()
+
+    def create(self, data):
+        if data.get('name') in self.failing:
+            raise self.KankaException('invalid', 422, 'Unprocessable')
+        with self.lock:
+            entity = dict(data, id=next(self.ids))
+            self.created.append(entity)
+            self.log.append(entity)
+        return entity
+
+def fake_client(types, existing=None, failing=()):
+    """A client whose managers create in memory, ids shared across types and creations logged in order"""
+    ids, log, existing = itertools.count(100), [], existing or {}
+    entities = {entity: FakeManager(ids, log, existing.get(entity, []), failing) for entity in types}
+    iter_all = lambda entity, fields=None: iter(entities[entity].existing)
+    return SimpleNamespace(entities=entities, iter_all=iter_all, log=log)
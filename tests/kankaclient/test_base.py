@@ -0,0 +1,107 @@
+from src.kankamanager.kankaclient.families import FamilyAPI
+from src.kankamanager.kankaclient.base import retry_after
+from src.kankamanager.kankaclient.constants import RETRY_DELAY
+from email.utils import formatdate
+from types import SimpleNamespace
+from unittest import mock, TestCase
+from concurrent.futures import ThreadPoolExecutor
+import gzip, json, time
+
+def page(data, next=None):
+    return SimpleNamespace(ok=True, status_code=200, reason='OK', text=json.dumps({'data': data, 'links': {'next': next}}))
+
+class TestBaseManager(TestCase):
+    def setUp(self):
+        self.manager = FamilyAPI(token='', campaign=SimpleNamespace(id=1, name='Test_Campaign'))
+
+    def test_iter_all_follows_pages(self):
+        responses = [page([{'id': 1}, {'id': 2}], next='page2'), page([{'id': 3}])]
+        with mock.patch.object(self.manager, '_request', side_effect=responses) as request:
+            self.assertEqual([family['id'] for family in self.manager.iter_all()], [1, 2, 3])
+        self.assertEqual(request.call_args_list[1].kwargs['url'], 'page2')
+
+    def test_iter_all_uses_cache(self):
+        self.manager.families = [{'id': 4}]
+        with mock.patch.object(self.manager, '_request') as request:
+            self.assertEqual(list(self.manager.iter_all()), [{'id': 4}])
+        request.assert_not_called()
+
+    def test_iter_all_projection(self):
+        responses = [page([{'id': 1, 'name': 'test_family', 'entry': '<p>long</p>'}])]
+        with mock.patch.object(self.manager, '_request', side_effect=responses):
+            self.assertEqual(list(self.manager.iter_all(fields=['id', 'name'])), [{'id': 1, 'name': 'test_family'}])
+
+    def test_request_single_flight(self):
+        calls = []
+
+        def get(**kwargs):
+            calls.append(kwargs['url'])
+            time.sleep(0.1)
+            return page([{'id': 1}])
+
+        with mock.patch.object(self.manager, '_throttle', side_effect=lambda request, **kwargs: get(**kwargs)):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                responses = list(executor.map(lambda _: self.manager._request(url='families', request='GET'), range(4)))
+            self.manager._request(url='families', request='GET')
+        self.assertEqual(calls, ['families', 'families'])
+        self.assertEqual(len({id(response) for response in responses}), 1)
+
+    def test_compressed_body_falls_back_to_plain(self):
+        self.manager.compress = True
+        data = json.dumps({'name': 'test_family', 'entry': '<p>long</p>' * 200})
+        sent = []
+
+        def post(url, headers, data):
+            sent.append(headers.get('Content-Encoding'))
+            status = 422 if headers.get('Content-Encoding') else 201
+            return SimpleNamespace(ok=status < 400, status_code=status, content=b'{}', headers={})
+
+        with mock.patch.dict('kankamanager.kankaclient.base._requests', {'POST': post}), \
+                mock.patch('kankamanager.kankaclient.base.PLAIN_BODY_HOSTS', set()) as hosts, \
+                mock.patch('kankamanager.kankaclient.base.GZIP_BODY_HOSTS', set()):
+            self.assertEqual(self.manager._request(url='http://kanka.test/1/families', request='POST', data=data).status_code, 201)
+            self.manager._request(url='http://kanka.test/1/families', request='POST', data=data)
+            self.assertEqual(hosts, {'kanka.test'})
+        self.assertEqual(sent, ['gzip', None, None])
+
+    def test_validation_errors_not_resent_plain(self):
+        self.manager.compress = True
+        sent = []
+
+        def post(url, headers, data):
+            sent.append(headers.get('Content-Encoding'))
+            status = 422 if b'invalid' in gzip.decompress(data) else 201
+            return SimpleNamespace(ok=status < 400, status_code=status, content=b'{}', headers={})
+
+        with mock.patch.dict('kankamanager.kankaclient.base._requests', {'POST': post}), \
+                mock.patch('kankamanager.kankaclient.base.PLAIN_BODY_HOSTS', set()), \
+                mock.patch('kankamanager.kankaclient.base.GZIP_BODY_HOSTS', set()):
+            for name in ('valid', 'invalid'):
+                data = json.dumps({'name': name, 'entry': '<p>long</p>' * 200})
+                self.manager._request(url='http://kanka.test/1/families', request='POST', data=data)
+        self.assertEqual(sent, ['gzip', 'gzip'])
+
+    def test_gzip_probed_once(self):
+        self.manager.compress = True
+        sent = []
+
+        def post(url, headers, data):
+            sent.append(headers.get('Content-Encoding'))
+            time.sleep(0.05)
+            return SimpleNamespace(ok=False, status_code=422, content=b'{}', headers={})
+
+        data = json.dumps({'name': 'invalid', 'entry': '<p>long</p>' * 200})
+        with mock.patch.dict('kankamanager.kankaclient.base._requests', {'POST': post}), \
+                mock.patch('kankamanager.kankaclient.base.PLAIN_BODY_HOSTS', set()), \
+                mock.patch('kankamanager.kankaclient.base.GZIP_BODY_HOSTS', set()) as hosts:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: self.manager._request(url='http://kanka.test/1/families', request='POST', data=data), range(4)))
+            self.assertEqual(hosts, {'kanka.test'})
+        self.assertEqual(sent, ['gzip', None, 'gzip', 'gzip', 'gzip'])
+
+    def test_retry_after(self):
+        self.assertEqual(retry_after({'Retry-After': '3'}), 3.0)
+        self.assertAlmostEqual(retry_after({'Retry-After': formatdate(time.time() + 30, usegmt=True)}), 30, delta=2)
+        self.assertEqual(retry_after({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}), 0.0)
+        for value in (None, 'soon', 'nan', 'inf'):
+            self.assertEqual(retry_after({'Retry-After': value}), RETRY_DELAY)
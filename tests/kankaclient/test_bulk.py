@@ -0,0 +1,43 @@
+from src.kankamanager.kankaclient.bulk import BulkCreator, dependencies
+from tests.kankaclient.fakes import fake_client
+from unittest import TestCase
+
+def client(existing):
+    return fake_client(('races', 'locations', 'characters'), existing)
+
+class TestBulkCreator(TestCase):
+    def test_references_resolved_across_types(self):
+        kanka = client({'races': [{'id': 1, 'name': 'Elf'}]})
+        creator = BulkCreator(kanka, chunk_size=2, max_workers=4)
+        batches = {
+            'characters': [{'name': f'Character {index}', 'races': ['Elf', 'Dwarf'], 'location_id': 'Keep'} for index in range(5)],
+            'locations': [{'name': 'Keep'}],
+            'races': [{'name': 'Dwarf'}],
+        }
+        self.assertEqual(dependencies('characters', batches['characters']), {'races', 'locations'})
+
+        created = creator.run(batches)
+
+        self.assertEqual(list(created), ['locations', 'races', 'characters'])
+        keep, dwarf = created['locations'][0]['id'], created['races'][0]['id']
+        self.assertEqual(len(created['characters']), 5)
+        for character in created['characters']:
+            self.assertEqual(character['races'], [1, dwarf])
+            self.assertEqual(character['location_id'], keep)
+
+    def test_unknown_reference_fails_only_its_entity(self):
+        creator = BulkCreator(client({}))
+        created = creator.create('characters', [{'name': 'Ok', 'races': [3]}, {'name': 'Lost', 'races': ['Orc']}])
+        self.assertEqual([character['name'] for character in created], ['Ok'])
+        self.assertEqual([data['name'] for _, data, _ in creator.failed], ['Lost'])
+
+    def test_same_type_references_created_first(self):
+        creator = BulkCreator(client({}), chunk_size=1, max_workers=4)
+        locations = [{'name': 'Tower', 'parent_location_id': 'Keep'}, {'name': 'Keep', 'parent_location_id': 'World'}, {'name': 'World'}]
+        self.assertEqual([[location['name'] for location in wave] for wave in creator.waves('locations', locations)],
+                         [['World'], ['Keep'], ['Tower']])
+
+        created = {location['name']: location for location in creator.create('locations', locations)}
+        self.assertEqual(creator.failed, [])
+        self.assertEqual(created['Tower']['parent_location_id'], created['Keep']['id'])
+        self.assertEqual(created['Keep']['parent_location_id'], created['World']['id'])
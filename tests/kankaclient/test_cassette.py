@@ -0,0 +1,64 @@
+from src.kankamanager.kankaclient.families import FamilyAPI
+from src.kankamanager.kankaclient.cassette import Cassette, CassetteError, _response
+from types import SimpleNamespace
+from unittest import mock, TestCase
+import gzip, json, os, tempfile
+
+FAMILIES = {'data': [{'id': 1, 'name': 'test_family'}], 'links': {'next': None}}
+
+class TestCassette(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'families.cassette')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def manager(self, cassette):
+        manager = FamilyAPI(token='secret', campaign=SimpleNamespace(id=1, name='Test_Campaign'))
+        manager.transport = cassette
+        return manager
+
+    def test_record_and_replay(self):
+        send = mock.Mock(return_value=_response('', 200, 'OK', {'Content-Type': 'application/json'}, json.dumps(FAMILIES)))
+        with mock.patch.dict('kankamanager.kankaclient.base._requests', {'GET': send}):
+            recorder = Cassette(self.path, record=True)
+            self.assertEqual(self.manager(recorder).get_all(), FAMILIES['data'])
+            recorder.save()
+        with open(self.path, 'rb') as cassette:
+            self.assertNotIn(b'secret', cassette.read())
+
+        self.assertEqual(self.manager(Cassette(self.path)).get_all(), FAMILIES['data'])
+        with self.assertRaises(CassetteError):
+            self.manager(Cassette(self.path)).get_family_by_id(2)
+        send.assert_called_once()
+
+    def test_replay_rate_limit(self):
+        recorder = Cassette(self.path, record=True)
+        recorder.interactions.append({
+            'request': {'method': 'GET', 'url': 'families', 'data': None},
+            'response': {'status_code': 200, 'reason': 'OK', 'headers': {}, 'body': '{}'},
+        })
+        recorder.save()
+
+        call = Cassette(self.path, rate_limit=1).wrap('GET', None)
+        self.assertEqual(call(url='families').status_code, 200)
+        throttled = call(url='families')
+        self.assertEqual(throttled.status_code, 429)
+        self.assertGreater(float(throttled.headers['Retry-After']), 59)
+
+    def test_replay_ignoring_body_fields(self):
+        recorder = Cassette(self.path, record=True)
+        recorder.interactions.append({
+            'request': {'method': 'POST', 'url': 'characters', 'data': '{"name": "test_character_1", "age": "30"}'},
+            'response': {'status_code': 201, 'reason': 'Created', 'headers': {}, 'body': '{"data": {"id": 7}}'},
+        })
+        recorder.save()
+
+        with self.assertRaises(CassetteError):
+            Cassette(self.path).wrap('POST', None)(url='characters', data='{"name": "test_character_2", "age": "30"}')
+        call = Cassette(self.path, ignore=['name']).wrap('POST', None)
+        self.assertEqual(call(url='characters', data=gzip.compress(b'{"age": "30", "name": "test_character_2"}')).status_code, 201)
+        with self.assertRaises(CassetteError):
+            call(url='characters', data='{"name": "test_character_2", "age": "31"}')
+        self.assertEqual(Cassette(self.path, ignore=['*']).wrap('POST', None)(url='characters', data='{}').status_code, 201)
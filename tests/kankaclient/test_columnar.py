@@ -0,0 +1,44 @@
+import pytest
+# pyarrow is an optional extra, the columnar module needs it
+pa = pytest.importorskip('pyarrow')
+from src.kankamanager.kankaclient.characters import Character
+from src.kankamanager.kankaclient.columnar import to_table, write_parquet, read_parquet, summary
+from dacite import from_dict
+from unittest import TestCase
+import tempfile
+
+CHARACTER = {
+    'id': 10, 'name': 'test_character', 'type': 'Player Character', 'tags': [1, 2], 'is_private': False,
+    'tooltip': None, 'header_image': None, 'image_uuid': None, 'created_at': '2022-08-01', 'created_by': 1,
+    'updated_at': None, 'updated_by': None, 'entry': '<p>entry</p>', 'image': None, 'image_full': None,
+    'image_thumb': None, 'has_custom_image': False, 'is_template': False, 'entity_id': 100, 'location_id': None,
+    'title': None, 'age': '30', 'sex': None, 'pronouns': None, 'races': [], 'families': [], 'is_dead': False,
+    'traits': [{'name': 'Brave', 'entry': 'Very'}]
+}
+
+class TestColumnar(TestCase):
+    def setUp(self):
+        self.characters = [
+            from_dict(data_class=Character, data={**CHARACTER, 'id': i, 'is_dead': i % 2 == 0, 'tags': [i % 3]})
+            for i in range(6)
+        ]
+
+    def test_typed_columns(self):
+        table = to_table(self.characters, Character)
+        self.assertEqual(table.num_rows, 6)
+        self.assertEqual(table.schema.field('id').type, pa.int64())
+        self.assertEqual(table.schema.field('is_dead').type, pa.bool_())
+        self.assertEqual(table.schema.field('created_by').type, pa.string())
+        self.assertTrue(pa.types.is_list(table.schema.field('tags').type))
+
+    def test_summary_and_parquet(self):
+        tables = {'characters': to_table(self.characters, Character), 'families': to_table([{'id': 1, 'name': 'f'}])}
+        with tempfile.TemporaryDirectory() as directory:
+            write_parquet(tables, directory)
+            tables = read_parquet(directory)
+
+        report = summary(tables)
+        self.assertEqual(report['entities'], {'characters': 6, 'families': 1})
+        self.assertEqual(report['types']['characters'], {'Player Character': 6})
+        self.assertEqual(report['tags']['characters'], {0: 2, 1: 2, 2: 2})
+        self.assertEqual(report['dead'], {'dead': 3, 'alive': 3})
@@ -0,0 +1,42 @@
+from src.kankamanager.kankaclient.characters import CharacterAPI
+from types import SimpleNamespace
+from unittest import mock, TestCase
+import json
+
+CHARACTER = {
+    'id': 10, 'name': 'test_character', 'type': None, 'tags': [], 'is_private': False, 'tooltip': None,
+    'header_image': None, 'image_uuid': None, 'created_at': '2022-08-01', 'created_by': 1, 'updated_at': None,
+    'updated_by': None, 'entry': '<p>entry</p>', 'image': None, 'image_full': None, 'image_thumb': None,
+    'has_custom_image': False, 'is_template': False, 'entity_id': 100, 'location_id': None, 'title': None,
+    'age': '30', 'sex': None, 'pronouns': None, 'races': [], 'families': [], 'is_dead': False, 'traits': []
+}
+
+def response(data):
+    return SimpleNamespace(ok=True, status_code=200, reason='OK', text=json.dumps({'data': data}))
+
+class TestLazyEntry(TestCase):
+    def setUp(self):
+        self.manager = CharacterAPI(token='', campaign=SimpleNamespace(id=1, name='Test_Campaign'))
+        self.manager.lazy = True
+
+    def test_entry_loaded_on_access(self):
+        character = self.manager._decode(dict(CHARACTER, entry='<p>list entry</p>'))
+        self.assertEqual(character.name, 'test_character')
+        with mock.patch.object(self.manager, '_request', return_value=response(CHARACTER)) as request:
+            self.assertEqual(character.entry, '<p>entry</p>')
+            self.assertEqual(character.entry, '<p>entry</p>')
+        request.assert_called_once()
+        self.assertTrue(request.call_args.kwargs['url'].endswith('/1/characters/10'))
+
+    def test_not_lazy_by_default(self):
+        self.manager.lazy = False
+        with mock.patch.object(self.manager, '_request') as request:
+            self.assertEqual(self.manager._decode(CHARACTER).entry, '<p>entry</p>')
+        request.assert_not_called()
+
+    def test_plain_attribute_access_is_not_hooked(self):
+        character = self.manager._decode(CHARACTER)
+        self.assertIs(type(character).__getattribute__, object.__getattribute__)
+        self.assertEqual(character.name, 'test_character')
+        with self.assertRaises(AttributeError):
+            character.missing
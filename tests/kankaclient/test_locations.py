@@ -0,0 +1,60 @@
+from src.kankamanager.kankaclient.locations import LocationIndex, LocationCycleError
+from unittest import TestCase
+
+class TestLocationIndex(TestCase):
+    def setUp(self):
+        self.index = LocationIndex([
+            {'id': 1, 'parent_location_id': None},
+            {'id': 2, 'parent_location_id': 1},
+            {'id': 3, 'parent_location_id': 2},
+            {'id': 4, 'parent_location_id': 1},
+            {'id': 5, 'parent_location_id': None},
+        ])
+
+    def test_is_inside(self):
+        self.assertTrue(self.index.is_inside(3, 1))
+        self.assertTrue(self.index.is_inside(3, 2))
+        self.assertFalse(self.index.is_inside(1, 3))
+        self.assertFalse(self.index.is_inside(4, 2))
+        self.assertFalse(self.index.is_inside(3, 5))
+
+    def test_descendants(self):
+        self.assertEqual(self.index.descendants(1), [2, 3, 4])
+        self.assertEqual(self.index.descendants(3), [])
+        self.assertEqual(self.index.ancestors(3), [2, 1])
+
+    def test_incremental_updates(self):
+        self.index.add({'id': 6, 'parent_location_id': 3})
+        self.assertTrue(self.index.is_inside(6, 1))
+        self.index.move(2, 5)
+        self.assertEqual(self.index.descendants(5), [2, 3, 6])
+        self.assertEqual(self.index.descendants(1), [4])
+        self.index.remove(2)
+        self.assertFalse(self.index.is_inside(3, 5))
+        self.assertEqual(self.index.descendants(3), [6])
+
+    def test_deep_hierarchy(self):
+        index = LocationIndex([{'id': i, 'parent_location_id': i - 1 if i else None} for i in range(5000)])
+        self.assertTrue(index.is_inside(4999, 0))
+        self.assertEqual(len(index.descendants(0)), 4999)
+
+    def test_cyclic_moves_are_rejected(self):
+        with self.assertRaises(LocationCycleError):
+            self.index.move(1, 3)
+        with self.assertRaises(LocationCycleError):
+            self.index.move(2, 2)
+        self.assertEqual(self.index.descendants(1), [2, 3, 4])
+
+    def test_moves_only_relabel_the_subtree(self):
+        labels = dict(self.index.enter)
+        self.index.move(2, 5)
+        self.assertEqual({id: self.index.enter[id] for id in (1, 4, 5)}, {id: labels[id] for id in (1, 4, 5)})
+        self.assertTrue(self.index.is_inside(3, 5))
+
+    def test_exhausted_gaps_renumber(self):
+        index = LocationIndex([{'id': 0, 'parent_location_id': None}])
+        for i in range(1, 100):
+            index.add({'id': i, 'parent_location_id': i - 1})
+        self.assertTrue(index.is_inside(99, 0))
+        self.assertEqual(index.descendants(97), [98, 99])
+        self.assertEqual(index.ancestors(2), [1, 0])
@@ -0,0 +1,58 @@
+from src.kankamanager.kankaclient.families import FamilyAPI
+from src.kankamanager.kankaclient.metrics import Metrics, endpoint
+from src.kankamanager.kankaclient.constants import BASE_URL
+from types import SimpleNamespace
+from unittest import mock, TestCase
+import threading
+
+def response(status_code):
+    return SimpleNamespace(ok=status_code < 400, status_code=status_code, content=b'{"data": []}', headers={})
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+        self.manager = FamilyAPI(token='', campaign=SimpleNamespace(id=1, name='Test_Campaign'))
+        self.manager.metrics = self.metrics
+
+    def test_endpoint(self):
+        self.assertEqual(endpoint(BASE_URL), 'campaigns')
+        self.assertEqual(endpoint(BASE_URL + '/1'), 'campaign')
+        self.assertEqual(endpoint(BASE_URL + '/1/characters?page=2'), 'characters')
+        self.assertEqual(endpoint(BASE_URL + '/1/characters/42'), 'characters/{id}')
+
+    def test_throttle_records(self):
+        events = []
+        self.metrics.add_hook(lambda name, label, value: events.append(name))
+        request = mock.Mock(side_effect=[response(429), response(200)])
+        with mock.patch('time.sleep'):
+            self.manager._throttle(request, url=BASE_URL + '/1/families')
+
+        summary = self.metrics.summary()['families']
+        self.assertEqual(summary['requests'], 2)
+        self.assertEqual(summary['retries'], 1)
+        self.assertEqual(summary['throttled'], 1)
+        self.assertEqual(summary['response_bytes'], 24)
+        self.assertEqual(summary['request_seconds']['count'], 2)
+        self.assertNotIn('errors', summary)
+        self.assertIn('throttle_seconds', events)
+
+    def test_exporters(self):
+        self.metrics.count('requests', 'characters', 3)
+        self.metrics.observe('request_seconds', 'characters', 0.2)
+        self.assertIn('characters  3', self.metrics.render())
+
+        text = self.metrics.prometheus()
+        self.assertIn('kanka_requests_total{endpoint="characters"} 3', text)
+        self.assertIn('kanka_request_seconds_bucket{endpoint="characters",le="0.1"} 0', text)
+        self.assertIn('kanka_request_seconds_bucket{endpoint="characters",le="0.25"} 1', text)
+        self.assertIn('kanka_request_seconds_count{endpoint="characters"} 1', text)
+
+    def test_span_records_exclusive_time(self):
+        with mock.patch('time.perf_counter', side_effect=[0.0, 1.0, 3.0, 4.0]):
+            with self.metrics.span('init'):
+                with self.metrics.span('fetch'):
+                    self.assertEqual(self.metrics.current(threading.get_ident()), ['init', 'fetch'])
+
+        summary = self.metrics.summary()
+        self.assertEqual(summary['fetch']['phase_seconds']['sum'], 2.0)
+        self.assertEqual(summary['init']['phase_seconds']['sum'], 2.0)
@@ -0,0 +1,68 @@
+from src.kankamanager.kankaclient.client import MultiCampaignClient, merge
+from src.kankamanager.kankaclient.cassette import _response
+from src.kankamanager.kankaclient.constants import BASE_URL
+from src.kankamanager.generator import CampaignGenerator
+from kankamanager.kankaclient.base import BaseManager
+from src.kankamanager.kankaclient.client import KankaClient
+from src.kankamanager.cli.config import read_config
+from unittest import mock, TestCase
+import json, os, tempfile
+
+def campaign(id, name):
+    return CampaignGenerator({}, campaign_id=id, name=name).campaign()
+
+CAMPAIGNS = {'data': [campaign(1, 'First'), campaign(2, 'Second'), campaign(3, 'Third')]}
+
+def send(url, headers=None, **kwargs):
+    if url == BASE_URL:
+        body = CAMPAIGNS
+    else:
+        campaign_id = int(url[len(BASE_URL):].split('/')[1])
+        body = {'data': [{'id': campaign_id, 'name': f'family of {campaign_id}'}], 'links': {'next': None}}
+    return _response(url, 200, 'OK', {'Content-Type': 'application/json'}, json.dumps(body))
+
+class TestMultiCampaignClient(TestCase):
+    def test_campaigns_resolved_once_and_run_concurrently(self):
+        get = mock.Mock(side_effect=send)
+        with mock.patch.dict('kankamanager.kankaclient.base._requests', {'GET': get}):
+            client = MultiCampaignClient({'token': '', 'campaign_dir': '/tmp/campaigns'}, campaigns=['First', 3])
+            self.assertEqual(list(client.clients), ['First', 'Third'])
+            self.assertEqual(client.clients['Third'].campaign_dir, '/tmp/campaigns/Third')
+
+            families = client.get_all('families')
+
+        self.assertEqual(families, {
+            'First': [{'id': 1, 'name': 'family of 1'}],
+            'Third': [{'id': 3, 'name': 'family of 3'}],
+        })
+        self.assertEqual(len(merge(families)), 2)
+        self.assertEqual([call.kwargs['url'] for call in get.call_args_list].count(BASE_URL), 1)
+
+    def test_unknown_campaign(self):
+        with mock.patch.dict('kankamanager.kankaclient.base._requests', {'GET': mock.Mock(side_effect=send)}):
+            with self.assertRaises(BaseManager.KankaException):
+                MultiCampaignClient({'token': ''}, campaigns=['Missing'])
+
+    def test_duplicate_names_rejected(self):
+        listing = {'data': CAMPAIGNS['data'] + [campaign(4, 'First')]}
+        get = mock.Mock(side_effect=lambda url, **kwargs: _response(url, 200, 'OK', {'Content-Type': 'application/json'}, json.dumps(listing)))
+        with mock.patch.dict('kankamanager.kankaclient.base._requests', {'GET': get}):
+            with self.assertRaises(BaseManager.KankaException):
+                MultiCampaignClient({'token': ''})
+            self.assertEqual(list(MultiCampaignClient({'token': ''}, campaigns=['Second', 2, '2']).clients), ['Second'])
+
+    def test_compress_from_config(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'kanka.conf')
+            with open(path, 'w') as config:
+                config.write('campaign: First\ncampaign_dir: campaigns\ntoken: secret\nthrottle: false\ncompress: true\n')
+            config = read_config(path)
+        self.assertTrue(config.get('compress'))
+
+        post = mock.Mock(return_value=_response('', 201, 'Created', {}, json.dumps({'data': {'id': 4, 'name': 'Ibier'}})))
+        with mock.patch.dict('kankamanager.kankaclient.base._requests', {'GET': mock.Mock(side_effect=send), 'POST': post}), \
+                mock.patch('kankamanager.kankaclient.base.TRANSPORT', None), \
+                mock.patch('kankamanager.kankaclient.base.PLAIN_BODY_HOSTS', set()), \
+                mock.patch('kankamanager.kankaclient.base.GZIP_BODY_HOSTS', set()):
+            KankaClient(config).create('families', {'name': 'Ibier', 'entry': '<p>long</p>' * 200})
+        self.assertEqual(post.call_args.kwargs['headers'].get('Content-Encoding'), 'gzip')
@@ -0,0 +1,45 @@
+from src.kankamanager.kankaclient.scheduler import ImportScheduler, SchedulerError
+from tests.kankaclient.fakes import fake_client
+from unittest import TestCase
+
+def client():
+    return fake_client(('tags', 'races', 'locations', 'characters', 'dice'), failing=['Broken'])
+
+BATCHES = {
+    'dice': [{'id': 1, 'name': 'Roll', 'character_id': 10}],
+    'characters': [{'id': 10, 'name': 'Hero', 'races': [20], 'tags': [30, 77], 'location_id': 42}],
+    'locations': [{'id': 41, 'name': 'World'}, {'id': 42, 'name': 'Keep', 'parent_location_id': 41}],
+    'races': [{'id': 20, 'name': 'Elf'}],
+    'tags': [{'id': 30, 'name': 'Hero tag'}],
+}
+
+class TestImportScheduler(TestCase):
+    def test_levels_and_remap(self):
+        kanka = client()
+        scheduler = ImportScheduler(kanka, BATCHES, max_workers=4)
+        levels = [sorted(node[0] for node in level) for level in scheduler.levels()]
+        self.assertEqual(levels, [['locations', 'races', 'tags'], ['locations'], ['characters'], ['dice']])
+
+        ids = scheduler.run()
+
+        self.assertEqual(len(ids), 6)
+        hero = scheduler.created[('characters', 10)]
+        self.assertEqual(hero['races'], [ids[('races', 20)]])
+        # References outside the import are kept as they are
+        self.assertEqual(hero['tags'], [ids[('tags', 30)], 77])
+        self.assertEqual(hero['location_id'], ids[('locations', 42)])
+        self.assertEqual(scheduler.created[('locations', 42)]['parent_location_id'], ids[('locations', 41)])
+        self.assertEqual(scheduler.created[('dice', 1)]['character_id'], ids[('characters', 10)])
+        self.assertNotIn(10, [entity['id'] for entity in kanka.log])
+
+    def test_failure_skips_dependents(self):
+        batches = {'races': [{'id': 1, 'name': 'Broken'}], 'characters': [{'id': 2, 'name': 'Orphan', 'races': ['Broken']}]}
+        scheduler = ImportScheduler(client(), batches)
+        self.assertEqual(scheduler.run(), {})
+        self.assertEqual([node for node, _ in scheduler.failed], [('races', 1)])
+        self.assertEqual(scheduler.skipped, [('characters', 2)])
+
+    def test_cycle(self):
+        batches = {'locations': [{'id': 1, 'parent_location_id': 2}, {'id': 2, 'parent_location_id': 1}]}
+        with self.assertRaises(SchedulerError):
+            ImportScheduler(client(), batches).levels()
@@ -0,0 +1,55 @@
+from src.kankamanager.kankaclient.campaigns import Campaign
+from src.kankamanager.kankaclient.characters import CharacterAPI, Character
+from src.kankamanager.kankaclient.families import FamilyAPI
+from src.kankamanager.kankaclient.snapshot import write_snapshot, read_snapshot, load_snapshot
+from dacite import from_dict
+from types import SimpleNamespace
+from unittest import TestCase
+import os, tempfile
+
+CAMPAIGN = {
+    'id': 1, 'name': 'Test_Campaign', 'locale': None, 'entry_parsed': '', 'image': None, 'image_full': None,
+    'visibility': 'private', 'visibility_id': 1, 'created_at': None, 'updated_at': None, 'settings': None,
+    'ui_settings': None, 'default_images': None, 'follower': 0, 'boosted': False, 'superboosted': False,
+    'members': None
+}
+
+CHARACTER = {
+    'id': 10, 'name': 'test_character', 'type': None, 'tags': [1, 2], 'is_private': False, 'tooltip': None,
+    'header_image': None, 'image_uuid': None, 'created_at': '2022-08-01', 'created_by': 1, 'updated_at': None,
+    'updated_by': None, 'entry': '<p>entry</p>', 'image': None, 'image_full': None, 'image_thumb': None,
+    'has_custom_image': False, 'is_template': False, 'entity_id': 100, 'location_id': None, 'title': None,
+    'age': '30', 'sex': None, 'pronouns': None, 'races': [], 'families': [], 'is_dead': False, 'traits': []
+}
+
+def make_client():
+    campaign = from_dict(data_class=Campaign, data=CAMPAIGN)
+    entities = {
+        'characters': CharacterAPI(token='', campaign=campaign),
+        'families': FamilyAPI(token='', campaign=campaign),
+    }
+    return SimpleNamespace(campaigns=SimpleNamespace(campaign=campaign), entities=entities)
+
+class TestSnapshot(TestCase):
+    def test_snapshot_round_trip(self):
+        client = make_client()
+        client.entities['characters'].characters = [from_dict(data_class=Character, data=CHARACTER)]
+        client.entities['families'].families = [{'id': 5, 'name': 'test_family'}]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'campaign.snapshot')
+            self.assertEqual(write_snapshot(client, path), {'characters': 1, 'families': 1})
+            header, entities = read_snapshot(path)
+
+        self.assertEqual(header['campaign']['name'], 'Test_Campaign')
+        restored = make_client()
+        load_snapshot(restored, entities)
+        self.assertEqual(restored.entities['characters'].get_all(), client.entities['characters'].characters)
+        self.assertEqual(restored.entities['families'].get_all(), [{'id': 5, 'name': 'test_family'}])
+
+    def test_read_invalid_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'campaign.snapshot')
+            with open(path, 'wb') as snapshot:
+                snapshot.write(b'\x81\xa3foo\xa3bar')
+            self.assertRaises(ValueError, read_snapshot, path)
@@ -0,0 +1,97 @@
+from src.kankamanager.assets import AssetStore, asset_urls
+from src.kankamanager.cli.pull import pull
+from types import SimpleNamespace
+from unittest import mock, TestCase
+import os, tempfile
+
+ASSETS = 'https://kanka-user-assets.s3.eu-central-1.amazonaws.com'
+IMAGES = {
+    f'{ASSETS}/characters/000000000001.png': b'veitanda',
+    f'{ASSETS}/characters/000000000001_thumb.png': b'veitanda',
+    f'{ASSETS}/characters/000000000002.png': b'umari',
+}
+
+def get(url, headers=None, stream=False, timeout=None):
+    if url not in IMAGES:
+        response = mock.MagicMock(status_code=404, raise_for_status=mock.Mock(side_effect=Exception('404 Not Found')))
+    elif (headers or {}).get('If-None-Match') == f'"{hash(IMAGES[url])}"':
+        response = mock.MagicMock(status_code=304)
+    else:
+        response = mock.MagicMock(status_code=200, headers={'ETag': f'"{hash(IMAGES[url])}"'}, iter_content=lambda size: [IMAGES[url]])
+    response.__enter__.return_value = response
+    return response
+
+class TestAssets(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.campaign_dir = self.directory.name
+        self.session = mock.patch('src.kankamanager.assets.SESSION').start()
+        self.session.get.side_effect = get
+
+    def tearDown(self):
+        mock.patch.stopall()
+        self.directory.cleanup()
+
+    def test_asset_urls(self):
+        entities = [
+            {'image_full': f'{ASSETS}/characters/000000000001.png', 'image_thumb': f'{ASSETS}/characters/000000000001_thumb.png'},
+            {'image_full': f'{ASSETS}/characters/000000000001.png', 'header_image': None, 'image': 'characters/1.png'},
+        ]
+        self.assertEqual(asset_urls(entities), list(IMAGES)[:2])
+
+    def test_identical_images_are_stored_once(self):
+        store = AssetStore(self.campaign_dir)
+        downloaded, failed = store.sync(list(IMAGES))
+        self.assertEqual((len(downloaded), failed), (3, []))
+        self.assertEqual(store.path(list(IMAGES)[0]), store.path(list(IMAGES)[1]))
+        with open(store.path(list(IMAGES)[2]), 'rb') as image:
+            self.assertEqual(image.read(), b'umari')
+        files = [file for _, _, files in os.walk(store.directory) for file in files]
+        self.assertEqual(len(files), 3)
+
+    def test_unchanged_images_are_skipped(self):
+        AssetStore(self.campaign_dir).sync(list(IMAGES))
+        self.session.get.reset_mock()
+
+        store = AssetStore(self.campaign_dir)
+        self.assertEqual(store.sync(list(IMAGES)), ([], []))
+        self.assertEqual([call.kwargs['headers'] for call in self.session.get.call_args_list],
+                         [{'If-None-Match': f'"{hash(image)}"'} for image in IMAGES.values()])
+
+        # A damaged file is downloaded again, even with the same size
+        path = store.path(list(IMAGES)[2])
+        stat = os.stat(path)
+        with open(path, 'wb') as image:
+            image.write(b'imari')
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertEqual(store.sync(list(IMAGES)), ([list(IMAGES)[2]], []))
+        with open(path, 'rb') as image:
+            self.assertEqual(image.read(), b'umari')
+
+    def test_replaced_images_are_downloaded(self):
+        url = list(IMAGES)[2]
+        store = AssetStore(self.campaign_dir)
+        store.sync([url])
+        with mock.patch.dict(IMAGES, {url: b'ibier'}):
+            self.assertEqual(store.sync([url]), ([url], []))
+            with open(store.path(url), 'rb') as image:
+                self.assertEqual(image.read(), b'ibier')
+
+    def test_responses_closed(self):
+        responses = []
+        self.session.get.side_effect = lambda *args, **kwargs: responses.append(get(*args, **kwargs)) or responses[-1]
+        AssetStore(self.campaign_dir).sync([*IMAGES, f'{ASSETS}/characters/missing.png'])
+        self.assertEqual([response.__exit__.call_count for response in responses], [1] * 4)
+
+    def test_pull_retries_failed_images_on_resume(self):
+        missing = f'{ASSETS}/characters/000000000003.png'
+        manager = mock.Mock(iter_pages=lambda url=None: iter([([{'id': 3, 'name': 'Ibier', 'image_full': missing}], None)]))
+        client = SimpleNamespace(campaign_dir=self.campaign_dir, entities={'characters': manager})
+        args = SimpleNamespace(types=['characters'], sharded=False, resume=False, assets=True)
+        self.assertFalse(pull(client, args))
+
+        IMAGES[missing] = b'ibier'
+        self.addCleanup(IMAGES.pop, missing)
+        args.resume = True
+        self.assertTrue(pull(client, args))
+        self.assertIsNotNone(AssetStore(self.campaign_dir).path(missing))
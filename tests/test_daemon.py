@@ -0,0 +1,76 @@
+from src.kankamanager.daemon import forward, serve, stop
+from types import SimpleNamespace
+from unittest import TestCase, mock
+import io, logging, os, tempfile, threading, time
+
+class TestDaemon(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'kankamanager.sock')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def start(self, client, execute, accepts=None):
+        thread = threading.Thread(target=serve, args=(client, self.path, execute, accepts))
+        thread.start()
+        while not os.path.exists(self.path):
+            time.sleep(0.01)
+        return thread
+
+    def forward(self, argv):
+        output = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        errors = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        with mock.patch('sys.stdout', output), mock.patch('sys.stderr', errors):
+            status = forward(argv, self.path)
+        output.seek(0)
+        errors.seek(0)
+        return status, output.read(), errors.read()
+
+    def test_forward_without_daemon(self):
+        self.assertIsNone(forward(['get', 'characters'], self.path))
+        self.assertFalse(stop(self.path))
+
+    def test_forward_to_daemon(self):
+        client = SimpleNamespace(clear_caches=mock.Mock())
+        calls = []
+
+        def execute(_client, args):
+            calls.append(_client)
+            print(f'{args.command} {args.entity}')
+
+        thread = self.start(client, execute)
+        self.assertEqual(self.forward(['get', 'characters']), (0, 'get characters\n', ''))
+        self.assertEqual(self.forward(['get', 'locations']), (0, 'get locations\n', ''))
+
+        self.assertTrue(stop(self.path))
+        thread.join(timeout=5)
+        self.assertEqual(calls, [client, client])
+        client.clear_caches.assert_not_called()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_failures_and_writes(self):
+        client = SimpleNamespace(clear_caches=mock.Mock())
+
+        def execute(_client, args):
+            if args.command == 'delete':
+                logging.getLogger('CharacterAPI').error('Failed to delete character')
+                return False
+            raise Exception('Too Many Attempts')
+
+        thread = self.start(client, execute, accepts=lambda args, cwd: args.config is None)
+        status, _, errors = self.forward(['delete', 'characters', '-n', 'Umari'])
+        self.assertEqual(status, 1)
+        self.assertIn('Failed to delete character', errors)
+        client.clear_caches.assert_called_once()
+
+        status, _, errors = self.forward(['get', 'characters'])
+        self.assertEqual(status, 1)
+        self.assertIn('Daemon command failed', errors)
+
+        status, _, errors = self.forward(['-c', 'other.conf', 'get', 'characters'])
+        self.assertEqual(status, 2)
+        self.assertIn('another configuration', errors)
+
+        self.assertTrue(stop(self.path))
+        thread.join(timeout=5)
@@ -0,0 +1,45 @@
+from src.kankamanager.generator import CampaignGenerator, scaled, uniform
+from src.kankamanager.utilities import read_data
+from dacite import from_dict
+from unittest import TestCase
+import os, tempfile
+
+class TestCampaignGenerator(TestCase):
+    def setUp(self):
+        self.generator = CampaignGenerator(scaled(500), seed=7)
+        self.entities = self.generator.generate()
+
+    def test_counts_and_seed(self):
+        self.assertEqual(len(self.entities['characters']), 500)
+        self.assertEqual(len(self.entities['locations']), 250)
+        self.assertEqual(CampaignGenerator(scaled(500), seed=7).generate(), self.entities)
+        self.assertEqual(set(uniform(3)), set(self.entities))
+
+    def test_matches_dataclasses(self):
+        for entity, (_, data_class) in self.generator.classes.items():
+            if data_class is not None:
+                for data in self.entities[entity]:
+                    from_dict(data_class=data_class, data=data)
+
+    def test_references(self):
+        ids = {entity: {data['id'] for data in generated} for entity, generated in self.entities.items()}
+        for character in self.entities['characters']:
+            self.assertTrue(set(character['races']) <= ids['races'])
+            self.assertTrue(set(character['families']) <= ids['families'])
+            self.assertTrue(set(character['tags']) <= ids['tags'])
+            self.assertIn(character['location_id'], ids['locations'])
+        for location in self.entities['locations']:
+            self.assertIn(location['parent_location_id'], ids['locations'] | {None})
+        for dice in self.entities['dice']:
+            self.assertIn(dice['character_id'], ids['characters'])
+
+    def test_fixture_and_campaign_dir(self):
+        fixture = self.generator.fixture()
+        self.assertEqual(fixture['campaign']['id'], 1)
+        self.assertEqual(len(fixture['entities']['dice_rolls']), len(self.entities['dice']))
+
+        with tempfile.TemporaryDirectory() as campaign_dir:
+            self.generator.write(campaign_dir)
+            characters = read_data(os.path.join(campaign_dir, 'characters.yaml'))
+            self.assertEqual([character['id'] for character in characters], [c['id'] for c in self.entities['characters']])
+            self.assertNotIn('created_at', characters[0])
@@ -0,0 +1,101 @@
+from src.kankamanager.cli.pull import pull
+from src.kankamanager.cli.push import push
+from src.kankamanager.journal import Journal
+from src.kankamanager.utilities import read_data, write_data
+from types import SimpleNamespace
+from unittest import mock, TestCase
+import os, tempfile
+
+PAGES = {
+    None: ([{'id': 1, 'name': 'Veitanda'}], 'page-2'),
+    'page-2': ([{'id': 2, 'name': 'Umari'}], 'page-3'),
+    'page-3': ([{'id': 3, 'name': 'Ibier'}], None),
+}
+
+class FakeManager(object):
+    def __init__(self, fail=None):
+        self.fail = fail
+        self.requested = []
+
+    def iter_pages(self, url=None):
+        while True:
+            self.requested.append(url)
+            if url == self.fail:
+                raise Exception('Too Many Attempts')
+            data, url = PAGES[url]
+            yield data, url
+            if url is None:
+                return
+
+class TestJournal(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.campaign_dir = self.directory.name
+        self.journal = os.path.join(self.campaign_dir, '.journal')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def client(self, manager):
+        return SimpleNamespace(campaign_dir=self.campaign_dir, entities={'characters': manager})
+
+    def test_pull_resumes_from_last_page(self):
+        args = SimpleNamespace(types=['characters'], sharded=False, resume=False, assets=False)
+        self.assertFalse(pull(self.client(FakeManager(fail='page-3')), args))
+        self.assertTrue(os.path.isfile(os.path.join(self.journal, 'pull.ndjson')))
+
+        manager = FakeManager()
+        args.resume = True
+        self.assertTrue(pull(self.client(manager), args))
+        self.assertEqual(manager.requested, ['page-3'])
+        self.assertEqual([c['name'] for c in read_data(os.path.join(self.campaign_dir, 'characters.yaml'))], ['Veitanda', 'Umari', 'Ibier'])
+        self.assertFalse(os.path.isfile(os.path.join(self.journal, 'pull.ndjson')))
+
+    def test_push_skips_sent_entities(self):
+        write_data(os.path.join(self.campaign_dir, 'characters.yaml'), [{'id': 1, 'name': 'Veitanda'}, {'name': 'Umari'}])
+        client = self.client(None)
+        client.update = mock.Mock()
+        client.create = mock.Mock(side_effect=Exception('Too Many Attempts'))
+        args = SimpleNamespace(types=['characters'], resume=False)
+        self.assertFalse(push(client, args))
+
+        client.update.reset_mock()
+        client.create = mock.Mock(return_value={'id': 2, 'name': 'Umari'})
+        args.resume = True
+        self.assertTrue(push(client, args))
+        client.update.assert_not_called()
+        client.create.assert_called_once_with('characters', {'name': 'Umari'})
+
+    def test_truncated_record_ignored(self):
+        journal = Journal(self.campaign_dir, 'pull')
+        journal.page('characters', [{'id': 1}], 'page-2')
+        journal.file.write('{"record": "pa')
+        journal.close(False)
+        self.assertEqual(Journal(self.campaign_dir, 'pull', resume=True).pages('characters'), ([{'id': 1}], 'page-2', True))
+
+    def test_resume_after_truncated_record(self):
+        journal = Journal(self.campaign_dir, 'push')
+        journal.pushed('characters', 1)
+        journal.file.write('{"record":"push","ent')
+        journal.close(False)
+
+        journal = Journal(self.campaign_dir, 'push', resume=True)
+        journal.pushed('characters', 2)
+        journal.finish('characters')
+        journal.close(False)
+
+        journal = Journal(self.campaign_dir, 'push', resume=True)
+        self.assertEqual(journal.sent('characters'), {1, 2})
+        self.assertTrue(journal.finished('characters'))
+        journal.close(True)
+
+    def test_failed_write_not_finished(self):
+        args = SimpleNamespace(types=['characters'], sharded=False, resume=False, assets=False)
+        with mock.patch('src.kankamanager.cli.pull.write_data', return_value=False):
+            self.assertFalse(pull(self.client(FakeManager(fail='never')), args))
+
+        manager = FakeManager(fail='never')
+        args.resume = True
+        self.assertTrue(pull(self.client(manager), args))
+        self.assertEqual(manager.requested, [])
+        self.assertEqual(len(read_data(os.path.join(self.campaign_dir, 'characters.yaml'))), 3)
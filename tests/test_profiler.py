@@ -0,0 +1,22 @@
+from src.kankamanager.profiler import profile
+from kankamanager.kankaclient.metrics import METRICS
+from unittest import TestCase
+import io, os, pstats, tempfile, time
+
+class TestProfiler(TestCase):
+    def test_profile_writes_stats_and_folded_stacks(self):
+        stream = io.StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            prefix = os.path.join(directory, 'profile')
+            with profile(prefix, interval=0.001, stream=stream):
+                with METRICS.span('fetch'):
+                    time.sleep(0.05)
+
+            self.assertTrue(pstats.Stats(prefix + '.prof').total_calls)
+            with open(prefix + '.folded') as folded:
+                lines = folded.read().splitlines()
+
+        self.assertTrue(any(line.startswith('[fetch];') for line in lines))
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        self.assertIn('fetch', stream.getvalue())
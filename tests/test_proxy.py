@@ -0,0 +1,98 @@
+from src.kankamanager.proxy import ProxyCache, make_server
+from kankamanager.kankaclient.base import RateLimiter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase, mock
+import json, threading, time, requests
+
+class Upstream(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        self.hits.append(self.path)
+        if self.path.endswith('/limited'):
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        time.sleep(0.1)
+        host = self.server.server_address
+        body = json.dumps({'data': [{'id': 1}], 'links': {'next': f'http://{host[0]}:{host[1]}{self.path}?page=2'}})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body.encode('utf-8'))
+
+    def do_PUT(self):
+        self.hits.append(self.path)
+        self.rfile.read(int(self.headers.get('Content-Length')))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, format, *args):
+        pass
+
+class TestProxy(TestCase):
+    def setUp(self):
+        Upstream.hits = []
+        self.upstream = ThreadingHTTPServer(('127.0.0.1', 0), Upstream)
+        host, port = self.upstream.server_address
+        cache = ProxyCache(upstream=f'http://{host}:{port}/campaigns', ttl=60, limiter=RateLimiter(0))
+        self.proxy = make_server('127.0.0.1', 0, cache)
+        self.url = 'http://127.0.0.1:%s/campaigns' % self.proxy.server_address[1]
+        for server in (self.upstream, self.proxy):
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        for server in (self.upstream, self.proxy):
+            server.shutdown()
+            server.server_close()
+
+    def test_coalesce_and_cache(self):
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(executor.map(lambda _: requests.get(self.url + '/1/characters'), range(5)))
+        self.assertEqual([response.status_code for response in responses], [200] * 5)
+        self.assertEqual(requests.get(self.url + '/1/characters').json()['links']['next'], self.url + '/1/characters?page=2')
+        self.assertEqual(Upstream.hits, ['/campaigns/1/characters'])
+
+    def test_write_invalidates(self):
+        requests.get(self.url + '/1/characters')
+        requests.get(self.url + '/1/tags')
+        requests.put(self.url + '/1/characters/1', data='{"name": "Ibier"}')
+        requests.get(self.url + '/1/characters')
+        requests.get(self.url + '/1/tags')
+        self.assertEqual(Upstream.hits, [
+            '/campaigns/1/characters', '/campaigns/1/tags', '/campaigns/1/characters/1', '/campaigns/1/characters'
+        ])
+        self.assertEqual(requests.get(self.url.replace('/campaigns', '/other')).status_code, 404)
+
+    def test_write_keeps_sibling_endpoints(self):
+        requests.get(self.url + '/1/notes')
+        requests.put(self.url + '/1/note/1', data='{"name": "Ibier"}')
+        requests.get(self.url + '/1/notes')
+        self.assertEqual(Upstream.hits, ['/campaigns/1/notes', '/campaigns/1/note/1'])
+
+    def test_links_ignore_host_header(self):
+        response = requests.get(self.url + '/1/characters', headers={'Host': 'attacker.test'})
+        self.assertEqual(response.json()['links']['next'], self.url + '/1/characters?page=2')
+
+    def test_retry_after_relayed(self):
+        response = requests.get(self.url + '/1/limited')
+        self.assertEqual((response.status_code, response.headers.get('Retry-After')), (429, '0'))
+        self.assertEqual(len(Upstream.hits), 5)
+
+    def test_invalidated_miss_not_cached(self):
+        cache = ProxyCache(upstream='http://127.0.0.1:1/campaigns', limiter=RateLimiter(0))
+
+        def fetch(method, path, headers, body=None):
+            # A write lands while the GET is upstream
+            cache.invalidate('/1/characters/1')
+            return 200, {}, b'old'
+
+        with mock.patch.object(cache, '_fetch', side_effect=fetch) as _fetch:
+            self.assertEqual(cache.get('/1/characters', {}), (200, {}, b'old'))
+            cache.get('/1/characters', {})
+        self.assertEqual(_fetch.call_count, 2)
@@ -0,0 +1,44 @@
+from unittest import TestCase
+import os, subprocess, sys, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'src', 'kankamanager', '__main__.py')
+HEAVY = ['requests', 'yaml', 'dacite', 'prettytable', 'msgpack', 'pyarrow', 'kankamanager.kankaclient.base']
+# Import time budget (microseconds) of everything the CLI imports after interpreter startup
+BUDGET = 100000
+
+class TestStartup(TestCase):
+    def import_times(self, *args):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, 'src')]))
+        result = subprocess.run([sys.executable, '-X', 'importtime', MAIN, *args],
+                                capture_output=True, text=True, env=env, cwd=ROOT)
+        times = dict()
+        for line in result.stderr.splitlines():
+            if line.startswith('import time:') and '|' in line and 'self [us]' not in line:
+                _, cumulative, module = line[len('import time:'):].split('|')
+                times[module.strip()] = (int(cumulative), not module.startswith('  '))
+        return result, times
+
+    def test_config_show_imports_nothing_heavy(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'kanka.conf')
+            with open(path, 'w') as config:
+                config.write('campaign: Test_Campaign\n')
+            result, times = self.import_times('config', '--show', '--file', path)
+
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertIn('campaign: Test_Campaign', result.stdout)
+        for module in HEAVY:
+            self.assertNotIn(module, times)
+
+    def test_cold_start_budget(self):
+        _, times = self.import_times('--help')
+        modules = list(times)
+        startup = modules.index('site') + 1 if 'site' in modules else 0
+        total = sum(times[module][0] for module in modules[startup:] if times[module][1])
+        self.assertLess(total, BUDGET)
+
+    def test_rejected_multi_campaign_command_fails(self):
+        result, _ = self.import_times('--campaign', 'First', 'snapshot')
+        self.assertEqual(result.returncode, 1)
+        self.assertIn('only run pull, push', result.stderr)
@@ -0,0 +1,43 @@
+from src.kankamanager.store import ShardedStore
+from unittest import TestCase
+import os, tempfile
+
+class TestShardedStore(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.campaign_dir = self.directory.name
+        self.characters = [
+            {'id': 1, 'name': 'Veitanda Carminescale', 'is_dead': False},
+            {'id': 2, 'name': 'Umari Wavespeaker', 'is_dead': False},
+        ]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_only_changed(self):
+        store = ShardedStore(self.campaign_dir, 'characters')
+        self.assertEqual(store.write(self.characters), [1, 2])
+        self.assertTrue(ShardedStore.exists(self.campaign_dir, 'characters'))
+        self.assertTrue(os.path.isfile(os.path.join(self.campaign_dir, 'characters', '1-veitanda-carminescale.yaml')))
+
+        self.characters[1]['is_dead'] = True
+        store = ShardedStore(self.campaign_dir, 'characters')
+        self.assertEqual(store.write(self.characters), [2])
+        self.assertEqual(sorted(store.read(), key=lambda c: c['id']), self.characters)
+        self.assertEqual(store.write(self.characters[:1]), [2])
+
+    def test_changed_and_untracked(self):
+        store = ShardedStore(self.campaign_dir, 'characters')
+        store.write(self.characters)
+        with open(os.path.join(store.directory, '2-umari-wavespeaker.yaml'), 'a') as shard:
+            shard.write('title: Bard\n')
+        with open(os.path.join(store.directory, 'new.yaml'), 'w') as shard:
+            shard.write('name: Ibier\n')
+
+        self.assertEqual(store.changed(), [2])
+        self.assertEqual(store.untracked(), ['new.yaml'])
+        store.mark([2])
+        store.track('new.yaml', {'id': 3, 'name': 'Ibier'})
+        self.assertEqual(store.changed(), [])
+        self.assertEqual(store.untracked(), [])
+        self.assertEqual(store.read([3]), [{'id': 3, 'name': 'Ibier'}])
@@ -0,0 +1,71 @@
+from src.kankamanager.utilities import SpaceDumper, TableWriter, dump_data, iter_data, read_data, write_data, write_stream, stamp
+from prettytable import PrettyTable
+from types import SimpleNamespace
+from unittest import TestCase
+import io, os, tempfile, yaml
+
+class TestUtilities(TestCase):
+    def setUp(self):
+        self.entities = [
+            {'name': 'Veitanda Carminescale', 'races': [238821], 'is_dead': False},
+            {'name': 'Umari: Wavespeaker', 'entry': '<p>first\nsecond</p>', 'location_id': None},
+        ]
+
+    def test_dump_matches_space_dumper(self):
+        self.assertEqual(dump_data(self.entities), yaml.dump(self.entities, Dumper=SpaceDumper, sort_keys=False))
+
+    def test_write_and_read_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, 'characters.yaml')
+            self.assertTrue(write_data(file, self.entities))
+            self.assertEqual(read_data(file), self.entities)
+
+    def test_iter_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, 'characters.yaml')
+            write_data(file, self.entities)
+            self.assertEqual(list(iter_data(file)), self.entities)
+            self.assertTrue(write_stream(file, iter(self.entities)))
+            self.assertEqual(list(iter_data(file)), self.entities)
+
+    def test_stamp_table(self):
+        entities = [{'name': 'Vincent Von Hess', 'id': 677748, 'type': None, 'tags': [1, 2], 'age': '40'},
+                    {'name': 'a', 'id': 1, 'type': 'NPC', 'tags': [], 'age': None}]
+        table = PrettyTable(['Name', 'ID', 'Type', 'Tags', 'age'])
+        for entity in entities:
+            table.add_row(list(entity.values()))
+
+        stream = io.StringIO()
+        stamp(iter(entities), SimpleNamespace(output='table', fields=['age']), stream=stream)
+        self.assertEqual(stream.getvalue(), str(table) + '\n')
+
+    def test_table_keeps_full_values(self):
+        stream = io.StringIO()
+        table = TableWriter(['Name', 'ID'], stream, sample=1)
+        table.add_row(['a', 1])
+        table.add_row(['b', 677748])
+        table.close()
+        self.assertIn('|  b   | 677748 |', stream.getvalue().splitlines())
+        self.assertEqual(len({len(line) for line in stream.getvalue().splitlines()[4:]}), 1)
+
+        stream = io.StringIO()
+        table = TableWriter(['Name', 'ID'], stream, max_width=6)
+        table.add_row(['Vincent Von Hess', 677748])
+        table.close()
+        self.assertIn('| Vin... | 677748 |', stream.getvalue().splitlines())
+
+    def test_stamp_yaml(self):
+        stream = io.StringIO()
+        stamp(iter(self.entities), SimpleNamespace(output='yaml', fields=[]), stream=stream)
+        self.assertEqual(stream.getvalue(), ''.join(yaml.safe_dump(entity) + '\n' for entity in self.entities))
+
+    def test_stamp_ndjson_and_csv(self):
+        stream = io.StringIO()
+        stamp(iter(self.entities), SimpleNamespace(output='ndjson', fields=['name', 'races']), stream=stream)
+        self.assertEqual(stream.getvalue().splitlines()[0], '{"name":"Veitanda Carminescale","races":[238821]}')
+        self.assertEqual(stream.getvalue().splitlines()[1], '{"name":"Umari: Wavespeaker","races":null}')
+
+        stream = io.StringIO()
+        stamp(iter(self.entities), SimpleNamespace(output='csv', fields=[]), stream=stream)
+        self.assertEqual(stream.getvalue().splitlines(), ['name,races,is_dead', 'Veitanda Carminescale,[238821],False',
+                                                          'Umari: Wavespeaker,,'])